@@ -17,21 +17,104 @@ v3.8 原有功能：
 
 """
 
+import atexit
 import ccxt
+import copy
 import time
+import logging
+import logging.handlers
+import numpy as np
+import os
+import queue
 import sqlite3
+import sys
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, List, Tuple
 from core.position_manager import PositionManager
+from core.okx_ws_client import OKXWebSocketClient, CCXT_PRO_AVAILABLE
 
 # 🔥 尝试导入持仓AI审核器
 try:
-    from core.position_reviewer import PositionReviewer, PositionAction
+    from core.position_reviewer import PositionReviewer, PositionAction, PositionSnapshot
     POSITION_REVIEWER_AVAILABLE = True
 except ImportError:
     POSITION_REVIEWER_AVAILABLE = False
     print("[AUTOTRADER] ⚠️ PositionReviewer不可用")
 
+# 🔥 反向单止损止盈倍数：side -> (止损倍数, 止盈倍数)，固定2%止损、4%止盈
+_SL_TP_MULT = {'long': (0.98, 1.04), 'short': (1.02, 0.96)}
+# 🔥 AI审核移动到成本价的倍数（0.1%缓冲）
+_BE_MULT = {'long': 1.001, 'short': 0.999}
+# 🔥 限价平仓：side -> (相对标记价的倍数（0.15%让价保证成交）, 平仓方向)
+_CLOSE_MULT = {'long': (0.9985, 'sell'), 'short': (1.0015, 'buy')}
+# 🔥 限价平仓下单参数（只读，每次平仓复用；ccxt内部omit/extend会复制，不会修改）
+_CLOSE_PARAMS = {
+    'long': MappingProxyType({'tdMode': 'cross', 'posSide': 'long', 'reduceOnly': True}),
+    'short': MappingProxyType({'tdMode': 'cross', 'posSide': 'short', 'reduceOnly': True}),
+}
+# 🔥 批量撤销algo单时可重试的单项错误码（服务不可用/超时/限频/系统繁忙）
+_CANCEL_RETRY_SCODES = frozenset({'50001', '50004', '50011', '50013', '50026'})
+
+
+@dataclass(frozen=True)
+class PendingSLTP:
+    """高波动限价单成交后待设置的止损止盈参数（不可变 + __slots__）"""
+    __slots__ = (
+        "symbol", "original_symbol", "side", "amount", "entry_price",
+        "sl_price", "tp_price", "created_at", "sl_tp_attached",
+    )
+    symbol: str
+    original_symbol: str
+    side: str
+    amount: float
+    entry_price: float
+    sl_price: Optional[float]
+    tp_price: Optional[float]
+    created_at: str
+    sl_tp_attached: bool  # 止损止盈已随入场单附带（attachAlgoOrds），成交后无需再下
+
+
+def _get_logger() -> logging.Logger:
+    """
+    🔥 下单热路径日志：QueueHandler入队（常数时间），后台QueueListener输出到stdout
+
+    格式与print一致（只输出消息本身），%-格式化参数在级别被过滤时不会执行。
+    进程退出时停止监听线程，把队列中剩余的日志全部输出。
+    """
+    logger = logging.getLogger("autotrader")
+    if not logger.handlers:
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+        listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        listener.start()
+        atexit.register(listener.stop)
+    return logger
+
+
+log = _get_logger()
+
+
+def _side_sign(sides: List[str]) -> np.ndarray:
+    """持仓方向 -> 符号数组（long=+1, short=-1）"""
+    return np.fromiter((1.0 if s == 'long' else -1.0 for s in sides), dtype=np.float64, count=len(sides))
+
+
+def _pnl_pct_batch(entry_px: np.ndarray, cur_px: np.ndarray, side_sign: np.ndarray) -> np.ndarray:
+    """批量计算盈亏比例（入场价<=0的记为0）"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pnl = side_sign * (cur_px - entry_px) / entry_px
+    return np.where(entry_px > 0, pnl, 0.0)
+
 
 class AutoTrader:
     """OKX自动交易器 v3.8 - 原子止损版"""
@@ -67,6 +150,19 @@ class AutoTrader:
             }
         })
 
+        # 🔥 WebSocket交易通道：普通订单下单/撤单走长连接，失败回退REST
+        self.ws_client: Optional[OKXWebSocketClient] = None
+        self.use_ws_trading = okx_config.get("use_ws_trading", True)
+        if self.enabled and self.use_ws_trading and CCXT_PRO_AVAILABLE:
+            try:
+                self.ws_client = OKXWebSocketClient(okx_config)
+                self.ws_client.start()
+                self.ws_client.start_positions_feed()
+                self.ws_client.start_balance_feed()
+            except Exception as e:
+                print(f"[AUTOTRADER] ⚠️ WebSocket客户端初始化失败，使用REST: {e}")
+                self.ws_client = None
+
         # 资金管理
         capital_cfg = config.get("capital", {})
         self.total_capital = capital_cfg.get("total_usdt", 50)
@@ -111,15 +207,40 @@ class AutoTrader:
         # 🔥 止损单ID缓存（用于更新止损单）
         self.sl_order_cache: Dict[str, str] = {}  # symbol -> order_id
         self.tp_order_cache: Dict[str, str] = {}  # symbol -> order_id
+        # 🔥 止损单最近一次确认存在的时间（monotonic秒），用于跳过REST验证
+        self._sl_confirmed_at: Dict[str, float] = {}
+        
+        # 🔥 预热symbol转换缓存
+        for symbol in config.get("symbols", []) or []:
+            self._convert_symbol_to_okx(symbol)
+        
+        # 🔥 杠杆缓存：OKX按symbol+保证金模式持久化杠杆，已设置过的跳过
+        self._leverage_cache: Dict[Tuple[str, str], int] = {}  # (symbol, mgnMode) -> leverage
         
-        # 🔥 高波动轨道：待设置止损止盈的订单缓存
-        self._pending_sl_tp: Dict[str, Dict] = {}
+        # 🔥 高波动轨道：待设置止损止盈的订单缓存（order_id -> PendingSLTP）
+        # 所有写入经过 _apply_pending（加锁），读取方先做快照
+        self._pending_sl_tp: Dict[str, PendingSLTP] = {}
+        self._pending_lock = threading.Lock()
+        # 🔥 orders频道推送的订单状态（order_id -> ccxt status），及REST兜底查询时间
+        self._order_status: Dict[str, str] = {}
+        self._order_rest_checked_at: Dict[str, float] = {}
         
-        # 🔥 持仓入场时间缓存（用于AI审核）
-        self.position_entry_time: Dict[str, datetime] = {}
+        # 🔥 持仓快照（REST回退路径）：200ms内的多次查询共用一次fetch_positions
+        self._positions_snapshot: Dict[str, Dict] = {}
+        self._positions_snapshot_ts = 0.0  # monotonic秒
+        self._positions_snapshot_lock = threading.Lock()
+        self.order_status_fallback_sec = 30
+        # 🔥 订单状态微缓存：order_id -> (monotonic秒, 状态)，合并同一tick内的重复查询
+        self._order_status_cache: Dict[str, Tuple[float, str]] = {}
         
-        # 🔥 上次AI审核时间
-        self.last_ai_review_time: Dict[str, datetime] = {}
+        # 🔥 持仓入场时间缓存（monotonic秒，用于AI审核持仓时长）
+        self.position_entry_time: Dict[str, float] = {}
+        # monotonic -> 墙钟时间的换算基准（只在需要展示时换算）
+        self._start_wall = time.time()
+        self._start_mono = time.monotonic()
+        
+        # 🔥 上次AI审核时间（monotonic秒）
+        self.last_ai_review_time: Dict[str, float] = {}
         self.ai_review_interval_sec = full_config.get("position_review", {}).get("review_interval_sec", 300) if full_config else 300
 
         # 🔥🔥🔥 v3.7 新增：强制止损配置
@@ -130,17 +251,52 @@ class AutoTrader:
         self.default_sl_pct = config.get("default_sl_pct", 0.012)  # 默认止损1.2%
         self.default_tp_pct = config.get("default_tp_pct", 0.036)  # 默认止盈3.6% (3倍止损)
         
-        # 🔥🔥🔥 v3.7 新增：止损验证时间缓存
-        self.last_sl_verify_time: Dict[str, datetime] = {}
+        # 🔥🔥🔥 v3.7 新增：止损验证时间缓存（monotonic秒）
+        self.last_sl_verify_time: Dict[str, float] = {}
+
+        # 🔥 v3.3: 持仓调整动作防重复执行时间（monotonic秒）
+        self._last_action_time: Dict[str, float] = {}
         
         # 🔥🔥🔥 v3.7 新增：上次持仓检查时间
         self.last_position_check_time: Optional[datetime] = None
 
+        # 🔥 告警异步队列：Telegram发送放到后台线程，不阻塞持仓监控
+        # Telegram配置在config.yaml顶层；token和chat_id都配置了才启动发送线程
+        self._tg_config = self.full_config.get("telegram") or config.get("telegram") or {}
+        tg_token = os.getenv("TELEGRAM_BOT_TOKEN") or self._tg_config.get("bot_token")
+        self._notify_chats: List = list(self._tg_config.get("chat_id") or []) if tg_token else []
+        self._notify_queue: "queue.Queue[Tuple[str, List[str]]]" = queue.Queue(maxsize=1024)
+        self._notify_thread: Optional[threading.Thread] = None
+        if self._notify_chats:
+            self._notify_thread = threading.Thread(
+                target=self._notify_worker,
+                daemon=True,
+                name="AutoTrader-Notifier"
+            )
+            self._notify_thread.start()
+
+        # 🔥 撤单异步队列（Cancel Fairy）：过期止损止盈algo单在后台批量撤销，不占平仓路径
+        self._cancel_queue: "queue.Queue[Tuple[str, str, int]]" = queue.Queue()
+        self._cancel_thread = threading.Thread(
+            target=self._cancel_worker,
+            daemon=True,
+            name="AutoTrader-CancelFairy"
+        )
+        self._cancel_thread.start()
+
+        # 🔥 后台任务线程池：数据库记录等不在关键路径上的操作
+        self._bg_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="AutoTrader-BG")
+
+        # 🔥 订单推送：高波动限价单的成交/撤单由orders频道驱动，不再逐单轮询REST
+        if self.ws_client:
+            self.ws_client.start_orders_feed(self._on_ws_orders)
+
         # 持仓管理器（高级止损止盈）
         self.position_manager = None
         if self.enabled:
             try:
                 self.position_manager = PositionManager(self.exchange, exit_cfg)
+                self.position_manager.start_indicator_refresher()
             except Exception as e:
                 print(f"[AUTOTRADER] ⚠️ 持仓管理器初始化失败: {e}")
         
@@ -363,10 +519,10 @@ class AutoTrader:
                 print(f"[AUTOTRADER] ⚠️ 获取市场信息失败: {e}")
                 # 继续尝试下单，让交易所返回具体错误
 
-            # 7. 设置杠杆
+            # 7. 设置杠杆（已设置过则跳过）
             try:
-                self.exchange.set_leverage(self.default_leverage, okx_symbol)
-                print(f"[AUTOTRADER] 设置杠杆: {self.default_leverage}x")
+                if self._ensure_leverage(okx_symbol):
+                    print(f"[AUTOTRADER] 设置杠杆: {self.default_leverage}x")
             except Exception as e:
                 print(f"[AUTOTRADER] ⚠️ 设置杠杆失败: {e}")
 
@@ -478,7 +634,7 @@ class AutoTrader:
             self.daily_trades += 1
             
             # 🔥 v3.0: 记录入场时间（用于AI审核）
-            self.position_entry_time[okx_symbol] = datetime.now()
+            self.position_entry_time[okx_symbol] = time.monotonic()
 
             # 🔥🔥🔥 v3.1: 更新信号为已成交状态（报告系统需要）
             actual_fill_price = order.get('average') or order.get('price') or entry_price
@@ -587,26 +743,46 @@ class AutoTrader:
                     if order.get('slTriggerPx'):
                         algo_id = order.get('algoId')
                         sl_price = float(order.get('slTriggerPx', 0))
-                        print(f"[SL_VERIFY] ✅ {symbol} 止损单存在: {algo_id} @ ${sl_price:.6f}")
+                        log.info("[SL_VERIFY] ✅ %s 止损单存在: %s @ $%.6f", symbol, algo_id, sl_price)
                         
                         # 🔥 v3.9: 同步缓存（防止重启后丢失）
                         if algo_id and symbol not in self.sl_order_cache:
                             self.sl_order_cache[symbol] = algo_id
-                            print(f"[SL_VERIFY] 🔄 已同步止损单ID到缓存")
+                            log.info("[SL_VERIFY] 🔄 已同步止损单ID到缓存")
+                        self._sl_confirmed_at[symbol] = time.monotonic()
                         
                         return True
                 
-                print(f"[SL_VERIFY] ⚠️ {symbol} 未找到止损单!")
+                log.warning("[SL_VERIFY] ⚠️ %s 未找到止损单!", symbol)
                 # 🔥 v3.9: 清除可能过期的缓存
                 self.sl_order_cache.pop(symbol, None)
+                self._sl_confirmed_at.pop(symbol, None)
                 return False
             else:
-                print(f"[SL_VERIFY] ⚠️ 查询失败: {response.get('msg', 'Unknown')}")
+                log.warning("[SL_VERIFY] ⚠️ 查询失败: %s", response.get('msg', 'Unknown'))
                 return True  # 查询失败时假设存在，避免误触发
                 
         except Exception as e:
-            print(f"[SL_VERIFY] ⚠️ 验证异常: {e}")
+            log.warning("[SL_VERIFY] ⚠️ 验证异常: %s", e)
             return True  # 异常时假设存在
+
+    def _mono_to_datetime(self, mono: Optional[float]) -> Optional[datetime]:
+        """monotonic秒换算为墙钟时间（展示用）"""
+        if mono is None:
+            return None
+        return datetime.fromtimestamp(self._start_wall + (mono - self._start_mono))
+
+    def _has_active_sl_order(self, symbol: str, max_age_sec: float = 2.0) -> bool:
+        """
+        🔥 本地判断止损单是否存在（不走REST）
+        
+        止损单ID在缓存中，且最近max_age_sec秒内被创建或验证过，才认为有效；
+        否则返回False，由调用方回退到 _verify_stop_loss_exists 查询OKX。
+        """
+        if symbol not in self.sl_order_cache:
+            return False
+        confirmed_at = self._sl_confirmed_at.get(symbol)
+        return confirmed_at is not None and time.monotonic() - confirmed_at <= max_age_sec
     
     def _get_current_sl_order_from_okx(self, symbol: str) -> Optional[Dict]:
         """
@@ -798,6 +974,33 @@ class AutoTrader:
             traceback.print_exc()
             return None, None, None
 
+    def _build_attached_sl_tp(self, side: str, sl_price: Optional[float], tp_price: Optional[float]) -> Dict:
+        """
+        🔥 构建OKX附带止损止盈参数（attachAlgoOrds元素）
+        
+        随入场单一起提交，成交后由OKX自动挂出止损止盈，
+        止损触发价同样加滑点缓冲（与_create_stop_loss_order一致）。
+        只传入一边时只附带该边。
+        """
+        attached = {}
+        if sl_price and sl_price > 0:
+            if side == 'long':
+                sl_trigger = sl_price * (1 - self.sl_slippage_buffer)
+            else:
+                sl_trigger = sl_price * (1 + self.sl_slippage_buffer)
+            attached.update({
+                'slTriggerPx': str(sl_trigger),
+                'slOrdPx': '-1',  # 市价执行
+                'slTriggerPxType': 'last',
+            })
+        if tp_price and tp_price > 0:
+            attached.update({
+                'tpTriggerPx': str(tp_price),
+                'tpOrdPx': '-1',  # 市价执行
+                'tpTriggerPxType': 'last',
+            })
+        return attached
+
     def _cancel_all_sl_tp_orders(self, symbol: str):
         """🔥 取消该symbol的所有止损止盈单"""
         try:
@@ -816,8 +1019,14 @@ class AutoTrader:
                 try:
                     self.exchange.privatePostTradeCancelAlgos(orders_to_cancel)
                     print(f"[ORDER_CANCEL] ✅ 已取消{len(orders_to_cancel)}个algo订单")
-                except:
-                    pass
+                except ccxt.NetworkError as e:
+                    # 网络超时：交给后台撤单线程重试，不阻塞平仓
+                    print(f"[ORDER_CANCEL] ⚠️ 撤单网络异常，转后台重试: {e}")
+                    for item in orders_to_cancel:
+                        self._enqueue_algo_cancel(symbol, item['algoId'])
+                except ccxt.ExchangeError as e:
+                    # 订单已触发或已撤销
+                    print(f"[ORDER_CANCEL] ⚠️ 撤单被拒绝: {e}")
             
             self.sl_order_cache.pop(symbol, None)
             self.tp_order_cache.pop(symbol, None)
@@ -839,9 +1048,9 @@ class AutoTrader:
             订单ID或None
         """
         try:
-            print(f"[SL_CREATE] 🔧 准备创建止损单...")
-            print(f"[SL_CREATE]   交易对: {symbol} | 方向: {side} | 数量: {amount}")
-            print(f"[SL_CREATE]   原始止损价: {sl_price:.6f}")
+            log.info("[SL_CREATE] 🔧 准备创建止损单...")
+            log.info("[SL_CREATE]   交易对: %s | 方向: %s | 数量: %s", symbol, side, amount)
+            log.info("[SL_CREATE]   原始止损价: %.6f", sl_price)
             
             # 添加滑点缓冲
             if side == 'long':
@@ -849,7 +1058,7 @@ class AutoTrader:
             else:
                 trigger_price = sl_price * (1 + self.sl_slippage_buffer)
             
-            print(f"[SL_CREATE]   触发价(含滑点): {trigger_price:.6f}")
+            log.info("[SL_CREATE]   触发价(含滑点): %.6f", trigger_price)
 
             # 转换symbol格式: BTC/USDT:USDT -> BTC-USDT-SWAP
             inst_id = symbol.replace('/', '-').replace(':USDT', '-SWAP')
@@ -867,24 +1076,23 @@ class AutoTrader:
                 'slTriggerPxType': 'last',
             }
             
-            print(f"[SL_CREATE]   调用OKX API...")
+            log.info("[SL_CREATE]   调用OKX API...")
             response = self.exchange.privatePostTradeOrderAlgo(algo_params)
             
             if response and response.get('code') == '0':
                 data = response.get('data', [{}])[0]
                 order_id = data.get('algoId', '')
-                print(f"[SL_CREATE] ✅ 止损单创建成功: {trigger_price:.6f} (AlgoID: {order_id})")
+                log.info("[SL_CREATE] ✅ 止损单创建成功: %.6f (AlgoID: %s)", trigger_price, order_id)
+                self._sl_confirmed_at[symbol] = time.monotonic()
                 return order_id
             else:
                 error_msg = response.get('msg', 'Unknown error')
                 error_code = response.get('code', '')
-                print(f"[SL_CREATE] ❌ OKX返回错误: code={error_code}, msg={error_msg}")
+                log.error("[SL_CREATE] ❌ OKX返回错误: code=%s, msg=%s", error_code, error_msg)
                 return None
 
         except Exception as e:
-            print(f"[SL_CREATE] ❌ 止损设置异常: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("[SL_CREATE] ❌ 止损设置异常: %s", e)
             return None
 
     def _create_take_profit_order(
@@ -901,9 +1109,9 @@ class AutoTrader:
             订单ID或None
         """
         try:
-            print(f"[TP_CREATE] 🔧 准备创建止盈单...")
-            print(f"[TP_CREATE]   交易对: {symbol} | 方向: {side} | 数量: {amount}")
-            print(f"[TP_CREATE]   止盈价: {tp_price:.6f}")
+            log.info("[TP_CREATE] 🔧 准备创建止盈单...")
+            log.info("[TP_CREATE]   交易对: %s | 方向: %s | 数量: %s", symbol, side, amount)
+            log.info("[TP_CREATE]   止盈价: %.6f", tp_price)
 
             # 转换symbol格式
             inst_id = symbol.replace('/', '-').replace(':USDT', '-SWAP')
@@ -920,24 +1128,22 @@ class AutoTrader:
                 'tpTriggerPxType': 'last',
             }
             
-            print(f"[TP_CREATE]   调用OKX API...")
+            log.info("[TP_CREATE]   调用OKX API...")
             response = self.exchange.privatePostTradeOrderAlgo(algo_params)
             
             if response and response.get('code') == '0':
                 data = response.get('data', [{}])[0]
                 order_id = data.get('algoId', '')
-                print(f"[TP_CREATE] ✅ 止盈单创建成功: {tp_price:.6f} (AlgoID: {order_id})")
+                log.info("[TP_CREATE] ✅ 止盈单创建成功: %.6f (AlgoID: %s)", tp_price, order_id)
                 return order_id
             else:
                 error_msg = response.get('msg', 'Unknown error')
                 error_code = response.get('code', '')
-                print(f"[TP_CREATE] ❌ OKX返回错误: code={error_code}, msg={error_msg}")
+                log.error("[TP_CREATE] ❌ OKX返回错误: code=%s, msg=%s", error_code, error_msg)
                 return None
 
         except Exception as e:
-            print(f"[TP_CREATE] ❌ 止盈设置异常: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("[TP_CREATE] ❌ 止盈设置异常: %s", e)
             return None
 
     def _create_sl_tp_with_position(
@@ -955,9 +1161,9 @@ class AutoTrader:
             (sl_order_id, tp_order_id)
         """
         try:
-            print(f"[SL_TP] 🔧 同时创建止损止盈...")
-            print(f"[SL_TP]   交易对: {symbol} | 方向: {side}")
-            print(f"[SL_TP]   止损: {sl_price:.6f} | 止盈: {tp_price:.6f}")
+            log.info("[SL_TP] 🔧 同时创建止损止盈...")
+            log.info("[SL_TP]   交易对: %s | 方向: %s", symbol, side)
+            log.info("[SL_TP]   止损: %.6f | 止盈: %.6f", sl_price, tp_price)
             
             inst_id = symbol.replace('/', '-').replace(':USDT', '-SWAP')
             
@@ -982,24 +1188,25 @@ class AutoTrader:
                 'tpTriggerPxType': 'last',
             }
             
-            print(f"[SL_TP]   调用OKX API...")
+            log.info("[SL_TP]   调用OKX API...")
             response = self.exchange.privatePostTradeOrderAlgo(algo_params)
             
             if response and response.get('code') == '0':
                 data = response.get('data', [{}])[0]
                 order_id = data.get('algoId', '')
-                print(f"[SL_TP] ✅ OCO订单创建成功 (AlgoID: {order_id})")
-                print(f"[SL_TP]   止损触发: {sl_trigger:.6f} | 止盈触发: {tp_price:.6f}")
+                log.info("[SL_TP] ✅ OCO订单创建成功 (AlgoID: %s)", order_id)
+                self._sl_confirmed_at[symbol] = time.monotonic()
+                log.info("[SL_TP]   止损触发: %.6f | 止盈触发: %.6f", sl_trigger, tp_price)
                 return order_id, order_id
             else:
                 error_msg = response.get('msg', 'Unknown error')
-                print(f"[SL_TP] ⚠️ OCO失败: {error_msg}，尝试分别创建...")
+                log.warning("[SL_TP] ⚠️ OCO失败: %s，尝试分别创建...", error_msg)
                 sl_id = self._create_stop_loss_order(symbol, side, amount, sl_price)
                 tp_id = self._create_take_profit_order(symbol, side, amount, tp_price)
                 return sl_id, tp_id
                 
         except Exception as e:
-            print(f"[SL_TP] ❌ 创建异常: {e}，尝试分别创建...")
+            log.error("[SL_TP] ❌ 创建异常: %s，尝试分别创建...", e)
             sl_id = self._create_stop_loss_order(symbol, side, amount, sl_price)
             tp_id = self._create_take_profit_order(symbol, side, amount, tp_price)
             return sl_id, tp_id
@@ -1290,7 +1497,7 @@ class AutoTrader:
                 try:
                     fill_time = datetime.fromisoformat(row[0])
                     holding_minutes = int((datetime.now() - fill_time).total_seconds() / 60)
-                except:
+                except (TypeError, ValueError):
                     pass
             
             cursor.execute("""
@@ -1502,38 +1709,29 @@ class AutoTrader:
 
             print(f"\n[POSITION_MONITOR] 检查 {len(positions)} 个持仓...")
 
-            for pos in positions:
-                symbol = pos['symbol']
-                unrealized_pnl = float(pos.get('unrealizedPnl', 0))
-                contracts = float(pos.get('contracts', 0))
+            # 🔥 每轮只取一次时间，向下传递
+            tick_mono = time.monotonic()
 
-                if contracts == 0:
-                    continue
+            # 🔥 批量获取价格，一次性计算所有持仓的盈亏
+            open_positions = [pos for pos in positions if float(pos.get('contracts', 0)) != 0]
+            prices = self._fetch_last_prices([pos['symbol'] for pos in open_positions])
+            priced = [pos for pos in open_positions if pos['symbol'] in prices]
 
-                # 获取当前价格
-                try:
-                    ticker = self.exchange.fetch_ticker(symbol)
-                    current_price = ticker['last']
-                except Exception as e:
-                    print(f"[POSITION_MONITOR] ⚠️ 获取{symbol}价格失败: {e}")
-                    continue
+            n = len(priced)
+            entry_arr = np.fromiter((float(pos.get('entryPrice') or 0) for pos in priced), dtype=np.float64, count=n)
+            price_arr = np.fromiter((prices[pos['symbol']] for pos in priced), dtype=np.float64, count=n)
+            sign_arr = _side_sign([pos.get('side', 'long') for pos in priced])
+            pnl_arr = _pnl_pct_batch(entry_arr, price_arr, sign_arr)
 
-                # 获取持仓信息
-                entry_price = float(pos.get('entryPrice', 0))
+            for pos, entry_price, current_price, pnl_pct in zip(
+                    priced, entry_arr.tolist(), price_arr.tolist(), pnl_arr.tolist()):
+                symbol = pos['symbol']
+                contracts = float(pos.get('contracts', 0))
                 side = pos.get('side', 'long')
-                
-                # 计算盈亏百分比
-                if entry_price > 0:
-                    if side == 'long':
-                        pnl_pct = (current_price - entry_price) / entry_price
-                    else:
-                        pnl_pct = (entry_price - current_price) / entry_price
-                else:
-                    pnl_pct = 0
 
                 # 获取持仓时间
                 entry_time = self.position_entry_time.get(symbol)
-                holding_minutes = (datetime.now() - entry_time).total_seconds() / 60 if entry_time else 0
+                holding_minutes = (tick_mono - entry_time) / 60 if entry_time else 0
 
                 # 🔥🔥🔥 v3.9: 检查position_manager是否有该持仓，没有则自动同步
                 if self.position_manager:
@@ -1561,7 +1759,7 @@ class AutoTrader:
                         
                         # 记录入场时间（估算）
                         if symbol not in self.position_entry_time:
-                            self.position_entry_time[symbol] = datetime.now()
+                            self.position_entry_time[symbol] = tick_mono
 
                 # 🔥🔥🔥 v3.7: 首先检查紧急止损（亏损超过2%强制平仓）
                 if self._check_emergency_stop_loss(symbol, side, entry_price, current_price, contracts):
@@ -1569,8 +1767,8 @@ class AutoTrader:
 
                 # 🔥🔥🔥 v3.9: 定期验证止损单是否存在（增强版）
                 last_verify = self.last_sl_verify_time.get(symbol)
-                if not last_verify or (datetime.now() - last_verify).total_seconds() > self.sl_verify_interval_sec:
-                    self.last_sl_verify_time[symbol] = datetime.now()
+                if last_verify is None or tick_mono - last_verify > self.sl_verify_interval_sec:
+                    self.last_sl_verify_time[symbol] = tick_mono
                     
                     if not self._verify_stop_loss_exists(symbol, side, contracts):
                         print(f"[POSITION_MONITOR] ⚠️ {symbol} 止损单丢失，重新创建...")
@@ -1631,7 +1829,8 @@ class AutoTrader:
                     if actions:
                         print(f"[POSITION_MONITOR] 🎯 {symbol} 有 {len(actions)} 个调整动作")
                         for action in actions:
-                            self._execute_position_action(symbol, action, current_price, contracts)
+                            self._execute_position_action(symbol, action, current_price, contracts,
+                                                          tick_mono=tick_mono)
                 
                 # 🔥 v3.0: AI审核逻辑
                 if self.position_reviewer:
@@ -1642,7 +1841,8 @@ class AutoTrader:
                         current_price=current_price,
                         pnl_pct=pnl_pct,
                         holding_minutes=holding_minutes,
-                        contracts=contracts
+                        contracts=contracts,
+                        tick_mono=tick_mono
                     )
 
             # 清理已平仓的持仓记录
@@ -1655,30 +1855,36 @@ class AutoTrader:
 
     def _ai_review_position(self, symbol: str, side: str, entry_price: float,
                            current_price: float, pnl_pct: float,
-                           holding_minutes: float, contracts: float):
-        """🔥 v3.0: AI审核持仓"""
+                           holding_minutes: float, contracts: float,
+                           tick_mono: Optional[float] = None):
+        """🔥 v3.0: AI审核持仓（tick_mono: 本轮监控的monotonic时间）"""
+        if tick_mono is None:
+            tick_mono = time.monotonic()
+
         # 检查是否需要审核
         last_review = self.last_ai_review_time.get(symbol)
-        if last_review and (datetime.now() - last_review).total_seconds() < self.ai_review_interval_sec:
+        if last_review is not None and tick_mono - last_review < self.ai_review_interval_sec:
             return
 
-        # 获取当前指标
-        indicators = self.position_reviewer.get_current_indicators(symbol)
-        
-        # 构建持仓信息
-        position_info = {
-            "symbol": symbol,
-            "side": side,
-            "entry_price": entry_price,
-            "current_price": current_price,
-            "sl_price": 0,
-            "tp_price": 0,
-            "pnl_pct": pnl_pct,
-            "holding_minutes": holding_minutes,
-            "rsi": indicators.get("rsi", 50),
-            "volume_ratio": indicators.get("volume_ratio", 1.0),
-            "entry_time": self.position_entry_time.get(symbol)
-        }
+        # 获取当前指标（优先读持仓管理器的近线缓存）
+        indicators = self.position_manager.get_cached_indicators(symbol) if self.position_manager else None
+        if not indicators:
+            indicators = self.position_reviewer.get_current_indicators(symbol)
+        
+        # 构建持仓快照
+        position_info = PositionSnapshot(
+            symbol=symbol,
+            side=side,
+            entry_price=entry_price,
+            current_price=current_price,
+            sl_price=0,
+            tp_price=0,
+            pnl_pct=pnl_pct,
+            holding_minutes=holding_minutes,
+            rsi=indicators.get("rsi", 50),
+            volume_ratio=indicators.get("volume_ratio", 1.0),
+            entry_time=self._mono_to_datetime(self.position_entry_time.get(symbol))
+        )
 
         # 检查是否应该审核
         should_review, reason = self.position_reviewer.should_review(position_info)
@@ -1691,7 +1897,7 @@ class AutoTrader:
         result = self.position_reviewer.review_position(position_info)
         
         # 更新审核时间
-        self.last_ai_review_time[symbol] = datetime.now()
+        self.last_ai_review_time[symbol] = tick_mono
         
         # 执行AI决策
         action = result.get("action", "hold")
@@ -1713,11 +1919,7 @@ class AutoTrader:
                 self._update_take_profit_order(symbol, side, contracts, new_tp)
                 
         elif action == PositionAction.BREAKEVEN.value:
-            buffer = 0.001
-            if side == "long":
-                be_price = entry_price * (1 + buffer)
-            else:
-                be_price = entry_price * (1 - buffer)
+            be_price = entry_price * _BE_MULT[side]
             print(f"[AI_REVIEW] 🛡 移动到成本价 → ${be_price:.6f} | {reasoning}")
             self._update_stop_loss_order(symbol, side, contracts, be_price)
             
@@ -1728,7 +1930,8 @@ class AutoTrader:
                 print(f"[AI_REVIEW] 🚨 准备平仓(紧止损) → ${new_sl:.6f} | {reasoning}")
                 self._update_stop_loss_order(symbol, side, contracts, new_sl)
 
-    def _execute_position_action(self, symbol: str, action: Dict, current_price: float, contracts: float):
+    def _execute_position_action(self, symbol: str, action: Dict, current_price: float, contracts: float,
+                                 tick_mono: Optional[float] = None):
         """
         🔥 v3.9: 执行持仓调整动作（增强版：检查返回值+失败告警）
 
@@ -1737,23 +1940,24 @@ class AutoTrader:
             action: 动作字典
             current_price: 当前价格
             contracts: 合约数量
+            tick_mono: 本轮监控的monotonic时间（None则现取）
         """
         action_type = action.get('type')
         reason = action.get('reason', '')
+        if tick_mono is None:
+            tick_mono = time.monotonic()
         
         # 🔥 v3.3: 防重复执行 - 检查最近是否刚执行过同类型操作
         last_action_key = f"{symbol}_{action_type}"
-        last_action_time = getattr(self, '_last_action_time', {}).get(last_action_key)
-        if last_action_time:
-            since_last = (datetime.now() - last_action_time).total_seconds()
+        last_action_time = self._last_action_time.get(last_action_key)
+        if last_action_time is not None:
+            since_last = tick_mono - last_action_time
             if since_last < 60:  # 60秒内不重复执行同类型操作
                 print(f"[POSITION_ADJUST] ⏳ {symbol} {action_type} 60秒内已执行，跳过")
                 return
         
         # 记录执行时间
-        if not hasattr(self, '_last_action_time'):
-            self._last_action_time = {}
-        self._last_action_time[last_action_key] = datetime.now()
+        self._last_action_time[last_action_key] = tick_mono
 
         try:
             if action_type in ['breakeven_stop', 'trailing_stop', 'tiered_trailing_stop']:
@@ -1788,19 +1992,17 @@ class AutoTrader:
                         print(f"[POSITION_ADJUST] ❌❌❌ {symbol} 止损更新失败!")
                         print(f"[POSITION_ADJUST] ⚠️ 警告：持仓可能没有有效止损保护!")
                         
-                        # 🔥 v3.9: 尝试验证当前止损状态
-                        self._verify_stop_loss_exists(symbol, side, contracts)
+                        # 🔥 v3.9: 尝试验证当前止损状态（本地缓存确认有效时跳过REST查询）
+                        if not self._has_active_sl_order(symbol):
+                            self._verify_stop_loss_exists(symbol, side, contracts)
                         
-                        # 发送告警（如果配置了Telegram）
-                        try:
-                            from core.notifier import tg_send
-                            tg_send(self.config, 
-                                   f"⚠️ 止损更新失败 | {symbol}", 
-                                   [f"❌ 阶梯止损更新失败",
-                                    f"目标止损: ${new_sl:.6f}",
-                                    f"请手动检查OKX持仓!"])
-                        except:
-                            pass
+                        # 发送告警（如果配置了Telegram，后台线程发送）
+                        self._notify_async(
+                            f"⚠️ 止损更新失败 | {symbol}",
+                            [f"❌ 阶梯止损更新失败",
+                             f"目标止损: ${new_sl:.6f}",
+                             f"请手动检查OKX持仓!"]
+                        )
                 else:
                     print(f"[POSITION_ADJUST] ⚠️ 未找到{symbol}的持仓信息")
 
@@ -1853,10 +2055,12 @@ class AutoTrader:
 
                     print(f"[POSITION_ADJUST] ✅ 平仓成功: {close_order['id']} | 盈亏: {pnl_pct*100:.2f}%")
 
-                    # 🔥🔥🔥 记录平仓结果到数据库（报告系统需要）
-                    self._record_position_closed(symbol, side, entry_price, current_price, "reversal_exit")
+                    # 🔥🔥🔥 记录平仓结果到数据库（报告系统需要，后台执行不阻塞反向开单）
+                    self._submit_background(
+                        self._record_position_closed, symbol, side, entry_price, current_price, "reversal_exit"
+                    )
 
-                    # 移除持仓记录
+                    # 移除持仓记录（必须同步完成，反向单会重新注册同一symbol）
                     self.position_manager.remove_position(symbol)
 
                     # 清除缓存
@@ -1869,6 +2073,140 @@ class AutoTrader:
         except Exception as e:
             print(f"[POSITION_ADJUST] ❌ 执行失败: {e}")
 
+    def _notify_async(self, title: str, lines: List[str]):
+        """🔥 告警入队（非阻塞，队列满时丢弃，保证交易循环不被卡住）；未配置Telegram时只打印"""
+        if self._notify_thread is None:
+            print(f"[NOTIFY:OFF] {title}\n" + "\n".join(lines))
+            return
+        try:
+            self._notify_queue.put_nowait((title, lines))
+        except queue.Full:
+            print(f"[NOTIFY] ⚠️ 告警队列已满，丢弃: {title}")
+
+    def _notify_worker(self, max_retries: int = 3):
+        """
+        🔥 后台告警线程：消费队列并发送Telegram，失败时指数退避重试
+        
+        按chat逐个发送和重试，已送达的chat不会因其他chat失败而收到重复告警。
+        """
+        try:
+            from core.notifier import tg_send
+        except ImportError as e:
+            print(f"[NOTIFY] ⚠️ 通知模块不可用: {e}")
+            return
+        
+        tg_cfg = {"telegram": self._tg_config}
+        while True:
+            title, lines = self._notify_queue.get()
+            pending_chats = self._notify_chats
+            for attempt in range(max_retries):
+                failed = []
+                for chat in pending_chats:
+                    try:
+                        if not tg_send(tg_cfg, title, lines, chats=[chat]):
+                            failed.append(chat)
+                    except Exception as e:
+                        print(f"[NOTIFY] ⚠️ 告警发送异常(chat={chat}, 尝试{attempt+1}/{max_retries}): {e}")
+                        failed.append(chat)
+                pending_chats = failed
+                if not pending_chats:
+                    break
+                if attempt < max_retries - 1:
+                    time.sleep(2 ** attempt)  # 1秒, 2秒...
+            if pending_chats:
+                print(f"[NOTIFY] ❌ 告警发送失败(chat={pending_chats}): {title}")
+            self._notify_queue.task_done()
+
+    def _enqueue_algo_cancel(self, symbol: str, algo_id: str, attempt: int = 0):
+        """🔥 撤销algo单（止损/止盈）放入后台队列，立即返回"""
+        if algo_id:
+            self._cancel_queue.put_nowait((symbol, algo_id, attempt))
+
+    def _cancel_worker(self, batch_window_sec: float = 0.05, max_batch: int = 10, max_retries: int = 3):
+        """
+        🔥 后台撤单线程：合并短时间内到达的撤单请求，调用OKX批量撤销algo单
+        
+        OKX cancel-algos 单次最多10个。网络异常时重新入队（最多max_retries次），
+        每个订单的结果按sCode单独处理（见 _cancel_algo_batch）。
+        """
+        while True:
+            batch = [self._cancel_queue.get()]
+            while len(batch) < max_batch:
+                try:
+                    batch.append(self._cancel_queue.get(timeout=batch_window_sec))
+                except queue.Empty:
+                    break
+            
+            items: Dict[str, Tuple[str, int]] = {}
+            for symbol, algo_id, attempt in batch:
+                items.setdefault(algo_id, (symbol, attempt))
+            
+            try:
+                self._cancel_algo_batch(items, max_retries)
+            except Exception as e:
+                print(f"[ORDER_CANCEL] ⚠️ 后台批量撤单失败: {e}")
+            finally:
+                for _ in batch:
+                    self._cancel_queue.task_done()
+
+    def _cancel_algo_batch(self, items: Dict[str, Tuple[str, int]], max_retries: int):
+        """
+        批量撤销algo单并逐个检查结果
+        
+        Args:
+            items: algoId -> (symbol, 已重试次数)
+        
+        单项sCode为可重试错误时重新入队，其他失败（多为订单已触发或已撤销）打印出来；
+        整批被拒时ccxt只报第一个失败项，此时逐个撤销以拿到每个订单的结果。
+        """
+        cancel_params = [
+            {'instId': symbol.replace('/', '-').replace(':USDT', '-SWAP'), 'algoId': algo_id}
+            for algo_id, (symbol, _) in items.items()
+        ]
+        try:
+            response = self.exchange.privatePostTradeCancelAlgos(cancel_params)
+        except ccxt.NetworkError as e:
+            print(f"[ORDER_CANCEL] ⚠️ 后台批量撤单网络异常: {e}")
+            for algo_id, (symbol, attempt) in items.items():
+                if attempt + 1 < max_retries:
+                    self._enqueue_algo_cancel(symbol, algo_id, attempt + 1)
+                else:
+                    print(f"[ORDER_CANCEL] ❌ {symbol} algo单撤销失败(已重试{max_retries}次): {algo_id}")
+            time.sleep(1)
+            return
+        except ccxt.ExchangeError as e:
+            if len(items) > 1:
+                for algo_id, item in items.items():
+                    self._cancel_algo_batch({algo_id: item}, max_retries)
+                return
+            response = {'data': [{'algoId': algo_id, 'sCode': '', 'sMsg': str(e)} for algo_id in items]}
+        
+        n_ok = 0
+        for result in (response or {}).get('data') or []:
+            algo_id = result.get('algoId')
+            s_code = str(result.get('sCode', '0'))
+            if s_code == '0':
+                n_ok += 1
+                continue
+            symbol, attempt = items.get(algo_id, ('', max_retries))
+            if s_code in _CANCEL_RETRY_SCODES and attempt + 1 < max_retries:
+                self._enqueue_algo_cancel(symbol, algo_id, attempt + 1)
+            else:
+                print(f"[ORDER_CANCEL] ⚠️ {symbol} algo单撤销失败: {algo_id} sCode={s_code} {result.get('sMsg', '')}")
+        if n_ok:
+            print(f"[ORDER_CANCEL] ✅ 后台批量撤销{n_ok}个algo订单")
+
+    def _submit_background(self, fn, *args):
+        """🔥 提交后台任务，异常打印日志（不会被静默吞掉）"""
+        def _log_error(future):
+            exc = future.exception()
+            if exc:
+                print(f"[AUTOTRADER] ⚠️ 后台任务{fn.__name__}失败: {exc}")
+        
+        future = self._bg_executor.submit(fn, *args)
+        future.add_done_callback(_log_error)
+        return future
+
     def _try_counter_trade(self, symbol: str, original_side: str, current_price: float, 
                            original_contracts: float, pnl_pct: float):
         """
@@ -1923,7 +2261,7 @@ class AutoTrader:
                 if available < position_margin * 1.1:  # 留10%余量
                     print(f"[COUNTER_TRADE] ⏭️ 跳过反向单：可用余额${available:.2f} < 需要${position_margin*1.1:.2f}")
                     return
-            except:
+            except Exception:
                 pass  # 获取余额失败，继续尝试
             
             print(f"[COUNTER_TRADE] 📊 仓位计算: 保证金${position_margin:.2f} x {self.default_leverage}x = {counter_contracts:.4f}个")
@@ -1949,52 +2287,62 @@ class AutoTrader:
             print(f"  价格: {entry_price:.6f}")
             
             # 5. 计算止损止盈（简单方案：固定2%止损，4%止盈）
-            if counter_side == 'short':
-                sl_price = entry_price * 1.02   # 做空止损+2%
-                tp_price = entry_price * 0.96   # 做空止盈-4%
-            else:
-                sl_price = entry_price * 0.98   # 做多止损-2%
-                tp_price = entry_price * 1.04   # 做多止盈+4%
+            sl_mult, tp_mult = _SL_TP_MULT[counter_side]
+            sl_price = entry_price * sl_mult
+            tp_price = entry_price * tp_mult
             
             print(f"  止损: {sl_price:.6f} (2%)")
             print(f"  止盈: {tp_price:.6f} (4%)")
             
-            # 6. 下单
+            # 6. 下单（🔥 止损止盈作为附带algo单随入场单一次提交，1次往返）
             order_params = {
                 'tdMode': 'cross',
                 'posSide': counter_side,
             }
+            order_price = entry_price if order_type == 'limit' else None
             
-            if order_type == 'limit':
+            sl_tp_attached = True
+            try:
                 order = self.exchange.create_order(
                     symbol=symbol,
-                    type='limit',
+                    type=order_type,
                     side=order_side,
                     amount=counter_contracts,
-                    price=entry_price,
-                    params=order_params
+                    price=order_price,
+                    params={
+                        **order_params,
+                        'attachAlgoOrds': [self._build_attached_sl_tp(counter_side, sl_price, tp_price)]
+                    }
                 )
-            else:
+            except (ccxt.BadRequest, ccxt.InvalidOrder) as e:
+                # 仅在交易所明确拒绝附带止损止盈时退回分步下单；
+                # 网络/超时等错误可能已下单成功，直接抛出避免重复开仓
+                print(f"[COUNTER_TRADE] ⚠️ 附带止损止盈被拒绝，改为分步设置: {e}")
+                sl_tp_attached = False
                 order = self.exchange.create_order(
                     symbol=symbol,
-                    type='market',
+                    type=order_type,
                     side=order_side,
                     amount=counter_contracts,
+                    price=order_price,
                     params=order_params
                 )
             
             print(f"[COUNTER_TRADE] ✅ 反向单创建成功: {order['id']}")
+            if sl_tp_attached:
+                print(f"[COUNTER_TRADE] ✅ 止损止盈已随入场单提交（成交后生效）")
             
             # 7. 设置止损止盈
             if order.get('status') == 'closed' or order_type == 'market':
-                # 市价单或已成交，立即设置止损止盈
-                sl_order_id = self._create_stop_loss_order(symbol, counter_side, counter_contracts, sl_price)
-                tp_order_id = self._create_take_profit_order(symbol, counter_side, counter_contracts, tp_price)
-                
-                if sl_order_id:
-                    self.sl_order_cache[symbol] = sl_order_id
-                if tp_order_id:
-                    self.tp_order_cache[symbol] = tp_order_id
+                # 市价单或已成交，附带失败时立即单独设置止损止盈
+                if not sl_tp_attached:
+                    sl_order_id = self._create_stop_loss_order(symbol, counter_side, counter_contracts, sl_price)
+                    tp_order_id = self._create_take_profit_order(symbol, counter_side, counter_contracts, tp_price)
+                    
+                    if sl_order_id:
+                        self.sl_order_cache[symbol] = sl_order_id
+                    if tp_order_id:
+                        self.tp_order_cache[symbol] = tp_order_id
                 
                 # 注册到持仓管理器
                 if self.position_manager:
@@ -2018,76 +2366,82 @@ class AutoTrader:
             import traceback
             traceback.print_exc()
 
-    def _cancel_all_sl_tp_orders(self, symbol: str):
-        """取消所有止损止盈单"""
-        try:
-            # 取消止损单
-            sl_order_id = self.sl_order_cache.get(symbol)
-            if sl_order_id:
-                try:
-                    self.exchange.cancel_order(sl_order_id, symbol)
-                    print(f"[ORDER_CANCEL] 已取消止损单: {sl_order_id}")
-                except:
-                    pass
-
-            # 取消止盈单
-            tp_order_id = self.tp_order_cache.get(symbol)
-            if tp_order_id:
-                try:
-                    self.exchange.cancel_order(tp_order_id, symbol)
-                    print(f"[ORDER_CANCEL] 已取消止盈单: {tp_order_id}")
-                except:
-                    pass
-
-        except Exception as e:
-            print(f"[ORDER_CANCEL] ⚠️ 取消订单失败: {e}")
-
     def _cleanup_closed_positions(self, current_positions: List[Dict]):
         """清理已平仓的持仓记录"""
         if not self.position_manager:
             return
 
         tracked_symbols = self.position_manager.get_all_positions()
+        if not tracked_symbols:
+            return
+
         active_symbols = {pos['symbol'] for pos in current_positions if float(pos.get('contracts', 0)) > 0}
+        removed = set(tracked_symbols) - active_symbols
+        if not removed:
+            return
 
-        for symbol in tracked_symbols:
-            if symbol not in active_symbols:
-                print(f"[POSITION_MONITOR] 检测到{symbol}已平仓，移除跟踪")
-                
-                # 🔥🔥🔥 获取持仓信息并记录平仓（报告系统需要）
-                pos_info = self.position_manager.get_position_info(symbol)
-                if pos_info:
-                    try:
-                        # 获取最后价格（可能是止盈/止损触发的价格）
-                        ticker = self.exchange.fetch_ticker(symbol)
-                        exit_price = ticker['last']
-                        
-                        entry_price = pos_info['entry_price']
-                        side = pos_info['side']
-                        sl_price = pos_info.get('sl_price', 0)
-                        tp_price = pos_info.get('tp_price', 0)
-                        
-                        # 判断平仓原因
-                        if tp_price > 0 and side == 'long' and exit_price >= tp_price * 0.995:
-                            exit_reason = "tp"
-                        elif tp_price > 0 and side == 'short' and exit_price <= tp_price * 1.005:
-                            exit_reason = "tp"
-                        elif sl_price > 0 and side == 'long' and exit_price <= sl_price * 1.005:
-                            exit_reason = "sl"
-                        elif sl_price > 0 and side == 'short' and exit_price >= sl_price * 0.995:
-                            exit_reason = "sl"
-                        else:
-                            exit_reason = "unknown"
-                        
-                        self._record_position_closed(symbol, side, entry_price, exit_price, exit_reason)
-                        
-                    except Exception as e:
-                        print(f"[POSITION_MONITOR] ⚠️ 记录平仓失败: {e}")
-                
-                self.position_manager.remove_position(symbol)
-                # 清除订单缓存
-                self.sl_order_cache.pop(symbol, None)
-                self.tp_order_cache.pop(symbol, None)
+        closed_symbols = [symbol for symbol in tracked_symbols if symbol in removed]
+        for symbol in closed_symbols:
+            print(f"[POSITION_MONITOR] 检测到{symbol}已平仓，移除跟踪")
+
+        # 🔥🔥🔥 获取持仓信息并记录平仓（报告系统需要）
+        # 一次批量获取最后价格（可能是止盈/止损触发的价格），再向量化判断平仓原因
+        infos = {symbol: self.position_manager.get_position_info(symbol) for symbol in closed_symbols}
+        prices = self._fetch_last_prices([symbol for symbol in closed_symbols if infos[symbol]])
+        records = [(symbol, infos[symbol]) for symbol in closed_symbols if symbol in prices]
+
+        if records:
+            n = len(records)
+            exit_px = np.fromiter((prices[symbol] for symbol, _ in records), dtype=np.float64, count=n)
+            tp_px = np.fromiter((info.get('tp_price', 0) or 0 for _, info in records), dtype=np.float64, count=n)
+            sl_px = np.fromiter((info.get('sl_price', 0) or 0 for _, info in records), dtype=np.float64, count=n)
+            sign = _side_sign([info['side'] for _, info in records])
+
+            # 多单: 价格>=止盈*0.995为tp, <=止损*1.005为sl；空单方向相反
+            tp_hit = (tp_px > 0) & (sign * (exit_px - tp_px * (1 - sign * 0.005)) >= 0)
+            sl_hit = (sl_px > 0) & (sign * (sl_px * (1 + sign * 0.005) - exit_px) >= 0)
+            exit_reasons = np.select([tp_hit, sl_hit], ["tp", "sl"], default="unknown")
+
+            for (symbol, info), exit_price, exit_reason in zip(records, exit_px.tolist(), exit_reasons.tolist()):
+                try:
+                    self._record_position_closed(symbol, info['side'], info['entry_price'], exit_price, exit_reason)
+                except Exception as e:
+                    print(f"[POSITION_MONITOR] ⚠️ 记录平仓失败: {e}")
+
+        for symbol in closed_symbols:
+            self.position_manager.remove_position(symbol)
+            # 清除订单缓存
+            self.sl_order_cache.pop(symbol, None)
+            self.tp_order_cache.pop(symbol, None)
+
+    def _fetch_last_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        🔥 批量获取最新价（一次fetch_tickers，缺失的逐个补拉）
+        
+        Returns:
+            {symbol: last_price}，获取失败的symbol不在结果中
+        """
+        if not symbols:
+            return {}
+        
+        try:
+            tickers = self.exchange.fetch_tickers(symbols)
+        except Exception as e:
+            print(f"[POSITION_MONITOR] ⚠️ 批量获取价格失败，逐个获取: {e}")
+            tickers = {}
+        
+        prices = {}
+        for symbol in symbols:
+            ticker = tickers.get(symbol)
+            if ticker is None:
+                try:
+                    ticker = self.exchange.fetch_ticker(symbol)
+                except Exception as e:
+                    print(f"[POSITION_MONITOR] ⚠️ 获取{symbol}价格失败: {e}")
+                    continue
+            if ticker.get('last') is not None:
+                prices[symbol] = float(ticker['last'])
+        return prices
 
     def run_once(self):
         """
@@ -2191,9 +2545,9 @@ class AutoTrader:
             except Exception as e:
                 print(f"[AUTOTRADER] ⚠️ 高波动持仓检查失败: {e}")
             
-            # 设置杠杆
+            # 设置杠杆（已设置过则跳过）
             try:
-                self.exchange.set_leverage(self.default_leverage, okx_symbol)
+                self._ensure_leverage(okx_symbol)
             except Exception as e:
                 print(f"[AUTOTRADER] 设置杠杆警告: {e}")
             
@@ -2242,14 +2596,36 @@ class AutoTrader:
                 clean_tag = re.sub(r'[^a-zA-Z0-9]', '', clean_tag)[:32]
                 params['clOrdId'] = clean_tag
             
-            order = self.exchange.create_order(
-                symbol=okx_symbol,
-                type='limit',
-                side=order_side,
-                amount=amount,
-                price=price,
-                params=params
-            )
+            # 🔥 止损止盈随入场单附带：成交瞬间即受保护，成交后不再单独下algo单
+            attached = self._build_attached_sl_tp(side, stop_loss, take_profit)
+            sl_tp_attached = bool(attached)
+            if sl_tp_attached:
+                params['attachAlgoOrds'] = [attached]
+            
+            try:
+                order = self.exchange.create_order(
+                    symbol=okx_symbol,
+                    type='limit',
+                    side=order_side,
+                    amount=amount,
+                    price=price,
+                    params=params
+                )
+            except (ccxt.BadRequest, ccxt.InvalidOrder) as e:
+                # 交易所明确拒绝（订单未创建）才回退：不带附带单重下，成交后再设置止损止盈
+                if not sl_tp_attached:
+                    raise
+                print(f"[AUTOTRADER] ⚠️ 附带止损止盈被拒绝，回退普通限价单: {e}")
+                params.pop('attachAlgoOrds', None)
+                sl_tp_attached = False
+                order = self.exchange.create_order(
+                    symbol=okx_symbol,
+                    type='limit',
+                    side=order_side,
+                    amount=amount,
+                    price=price,
+                    params=params
+                )
             
             order_id = order.get('id', '')
             
@@ -2257,16 +2633,17 @@ class AutoTrader:
             print(f"[AUTOTRADER]    数量: {amount} | 订单ID: {order_id}")
             
             # 缓存止损止盈参数（成交后设置）
-            self._pending_sl_tp[order_id] = {
-                'symbol': okx_symbol,
-                'original_symbol': symbol,
-                'side': side,
-                'amount': amount,
-                'entry_price': price,
-                'sl_price': stop_loss,
-                'tp_price': take_profit,
-                'created_at': datetime.now().isoformat()
-            }
+            self._apply_pending('set', order_id, PendingSLTP(
+                symbol=okx_symbol,
+                original_symbol=symbol,
+                side=side,
+                amount=amount,
+                entry_price=price,
+                sl_price=stop_loss,
+                tp_price=take_profit,
+                created_at=datetime.now().isoformat(),
+                sl_tp_attached=sl_tp_attached
+            ))
             
             return {
                 "success": True,
@@ -2286,7 +2663,7 @@ class AutoTrader:
 
     def check_order_status(self, order_id: str) -> str:
         """
-        🔥 检查订单状态
+        🔥 检查订单状态（100ms内的重复查询直接返回上次结果）
         
         Returns:
             "open" / "filled" / "canceled" / "unknown"
@@ -2294,23 +2671,52 @@ class AutoTrader:
         if not order_id:
             return "unknown"
         
+        now_mono = time.monotonic()
+        hit = self._order_status_cache.get(order_id)
+        if hit and now_mono - hit[0] < 0.1:
+            return hit[1]
+        
+        status = self._check_order_status_uncached(order_id)
+        # 写入时顺带清掉已过期的条目（撤销/未知订单不会再被查询，否则会一直留在缓存里）
+        for cached_id, (cached_at, _) in list(self._order_status_cache.items()):
+            if now_mono - cached_at >= 0.1:
+                self._order_status_cache.pop(cached_id, None)
+        self._order_status_cache[order_id] = (now_mono, status)
+        return status
+
+    def _check_order_status_uncached(self, order_id: str) -> str:
+        """查询订单状态：WS推送 → REST兜底"""
         try:
-            pending = self._pending_sl_tp.get(order_id, {})
-            symbol = pending.get('symbol', '')
-            
-            if not symbol:
+            # 🔥 WS推送过终态的直接返回（成交处理已在推送回调中完成）
+            pushed = self._order_status.get(order_id)
+            if pushed in ('closed', 'canceled'):
+                self._order_status.pop(order_id, None)
+                self._order_rest_checked_at.pop(order_id, None)
+                return "filled" if pushed == 'closed' else "canceled"
+            
+            pending = self._pending_sl_tp.get(order_id)
+            if not pending:
                 print(f"[AUTOTRADER] ⚠️ 未找到订单缓存: {order_id}")
                 return "unknown"
             
-            order = self.exchange.fetch_order(order_id, symbol)
+            # 🔥 orders频道在线时信任推送，REST只做低频兜底（防止断线期间漏推送）
+            if self.ws_client and self.ws_client.is_running:
+                now_mono = time.monotonic()
+                last_checked = self._order_rest_checked_at.setdefault(order_id, now_mono)
+                if now_mono - last_checked < self.order_status_fallback_sec:
+                    return "open"
+                self._order_rest_checked_at[order_id] = now_mono
+            
+            order = self.exchange.fetch_order(order_id, pending.symbol)
             status = order.get('status', 'unknown')
             
             if status == 'closed':
                 self._on_high_vol_order_filled(order_id, order)
+                self._order_rest_checked_at.pop(order_id, None)
                 return "filled"
             elif status == 'canceled':
-                if order_id in self._pending_sl_tp:
-                    del self._pending_sl_tp[order_id]
+                self._apply_pending('pop', order_id)
+                self._order_rest_checked_at.pop(order_id, None)
                 return "canceled"
             elif status == 'open':
                 return "open"
@@ -2321,20 +2727,45 @@ class AutoTrader:
             print(f"[AUTOTRADER] 检查订单状态异常: {e}")
             return "unknown"
 
+    def _on_ws_orders(self, orders: List[Dict]):
+        """
+        🔥 orders频道推送回调（运行在WS事件循环线程，必须快速返回）
+        
+        只处理仍在待成交缓存中的高波动限价单；成交后的止损止盈设置放到后台线程。
+        """
+        for order in orders:
+            order_id = order.get('id')
+            if order_id not in self._pending_sl_tp:
+                continue
+            status = order.get('status')
+            if status == 'closed':
+                self._order_status[order_id] = status
+                self._submit_background(self._on_high_vol_order_filled, order_id, order)
+            elif status == 'canceled':
+                self._order_status[order_id] = status
+                self._apply_pending('pop', order_id)
+
     def _on_high_vol_order_filled(self, order_id: str, order: dict):
         """🔥 v3.3: 高波动限价单成交后的处理 - 修复position_manager注册"""
-        pending = self._pending_sl_tp.get(order_id)
+        # 🔥 先原子地取出待处理参数，并发的成交/撤单回调只有一个能拿到
+        pending = self._apply_pending('pop', order_id)
+        self._order_status_cache.pop(order_id, None)
         if not pending:
             return
         
-        symbol = pending['symbol']
-        side = pending['side']
-        amount = pending['amount']
-        sl_price = pending['sl_price']
-        tp_price = pending['tp_price']
-        entry_price = order.get('average') or order.get('price') or pending['entry_price']
+        symbol = pending.symbol
+        side = pending.side
+        amount = pending.amount
+        sl_price = pending.sl_price
+        tp_price = pending.tp_price
+        entry_price = float(order.get('average') or order.get('price') or pending.entry_price)
+        
+        # 🔥 成交即订阅行情推送，平仓定价时直接读缓存
+        if self.ws_client:
+            self.ws_client.track_price(symbol)
         
-        print(f"[AUTOTRADER] ✅ 高波动订单成交: {symbol} {side.upper()} @ ${entry_price:.8f}")
+        if log.isEnabledFor(logging.INFO):
+            log.info("[AUTOTRADER] ✅ 高波动订单成交: %s %s @ $%.8f", symbol, side.upper(), entry_price)
         
         # 🔥 v3.3: 注册到position_manager（关键！否则breakeven不会触发）
         if self.position_manager:
@@ -2342,62 +2773,74 @@ class AutoTrader:
                 self.position_manager.register_position(
                     symbol=symbol,
                     side=side,
-                    entry_price=float(entry_price),
+                    entry_price=entry_price,
                     amount=amount,
                     sl_price=sl_price if sl_price else 0,
                     tp_price=tp_price if tp_price else 0,
                     strategy_type="high_volatility"  # 高波动策略
                 )
-                print(f"[AUTOTRADER] 📊 高波动持仓已注册到PositionManager")
+                log.info("[AUTOTRADER] 📊 高波动持仓已注册到PositionManager")
             except Exception as e:
-                print(f"[AUTOTRADER] ⚠️ 注册持仓到PositionManager失败: {e}")
+                log.warning("[AUTOTRADER] ⚠️ 注册持仓到PositionManager失败: %s", e)
         
-        if sl_price and sl_price > 0:
-            sl_id = self._create_stop_loss_order(symbol, side, amount, sl_price)
+        if pending.sl_tp_attached:
+            # 🔥 止损止盈已由OKX随成交挂出，同步algoId到缓存（供后续移动止损/撤单使用）
+            self._sync_attached_sl_tp(symbol, side, amount, has_tp=bool(tp_price and tp_price > 0))
+        else:
+            # 🔥 止损止盈都有时合并成一个OCO订单（1次请求），只有一边时单独创建
+            has_sl = bool(sl_price and sl_price > 0)
+            has_tp = bool(tp_price and tp_price > 0)
+            
+            if has_sl and has_tp:
+                sl_id, tp_id = self._create_sl_tp_with_position(symbol, side, amount, sl_price, tp_price)
+            else:
+                sl_id = self._create_stop_loss_order(symbol, side, amount, sl_price) if has_sl else None
+                tp_id = self._create_take_profit_order(symbol, side, amount, tp_price) if has_tp else None
+            
             if sl_id:
                 self.sl_order_cache[symbol] = sl_id
-        
-        if tp_price and tp_price > 0:
-            tp_id = self._create_take_profit_order(symbol, side, amount, tp_price)
             if tp_id:
                 self.tp_order_cache[symbol] = tp_id
         
-        if hasattr(self, 'position_entry_time'):
-            self.position_entry_time[symbol] = datetime.now()
+        self.position_entry_time[symbol] = time.monotonic()
+
+    def _sync_attached_sl_tp(self, symbol: str, side: str, amount: float, has_tp: bool):
+        """
+        🔥 附带止损止盈成交后由OKX生成新的algoId，查询一次写入缓存
         
-        if order_id in self._pending_sl_tp:
-            del self._pending_sl_tp[order_id]
+        止损止盈同时附带时OKX生成一个OCO订单，止盈缓存指向同一个algoId。
+        """
+        if self._verify_stop_loss_exists(symbol, side, amount) and has_tp:
+            sl_id = self.sl_order_cache.get(symbol)
+            if sl_id:
+                self.tp_order_cache.setdefault(symbol, sl_id)
 
     def cancel_order(self, order_id: str, symbol: str = None):
         """🔥 取消订单"""
         try:
             if not symbol:
-                pending = self._pending_sl_tp.get(order_id, {})
-                symbol = pending.get('symbol', '')
+                pending = self._pending_sl_tp.get(order_id)
+                symbol = pending.symbol if pending else ''
             
             if symbol:
                 okx_symbol = self._convert_symbol_to_okx(symbol)
-                self.exchange.cancel_order(order_id, okx_symbol)
-                print(f"[AUTOTRADER] 🚫 取消订单: {order_id}")
+                self._cancel_order_ws_first(order_id, okx_symbol)
+                log.info("[AUTOTRADER] 🚫 取消订单: %s", order_id)
             
-            if order_id in self._pending_sl_tp:
-                del self._pending_sl_tp[order_id]
+            self._apply_pending('pop', order_id)
+            self._order_status.pop(order_id, None)
+            self._order_rest_checked_at.pop(order_id, None)
+            self._order_status_cache.pop(order_id, None)
                     
         except Exception as e:
-            print(f"[AUTOTRADER] 取消订单异常: {e}")
+            log.error("[AUTOTRADER] 取消订单异常: %s", e)
 
     def update_stop_loss(self, symbol: str, new_sl_price: float) -> bool:
         """🔥 更新止损价"""
         try:
             okx_symbol = self._convert_symbol_to_okx(symbol)
             
-            positions = self.exchange.fetch_positions([okx_symbol])
-            position = None
-            for p in positions:
-                if p['symbol'] == okx_symbol and float(p.get('contracts', 0)) > 0:
-                    position = p
-                    break
-            
+            position = self._get_position(okx_symbol)
             if not position:
                 return False
             
@@ -2406,21 +2849,18 @@ class AutoTrader:
             
             old_sl_id = self.sl_order_cache.get(okx_symbol)
             if old_sl_id:
-                try:
-                    self.exchange.cancel_order(old_sl_id, okx_symbol)
-                except:
-                    pass
+                self._enqueue_algo_cancel(okx_symbol, old_sl_id)
             
             new_sl_id = self._create_stop_loss_order(okx_symbol, side, amount, new_sl_price)
             if new_sl_id:
                 self.sl_order_cache[okx_symbol] = new_sl_id
-                print(f"[AUTOTRADER] 📍 止损更新: {okx_symbol} → ${new_sl_price:.8f}")
+                log.info("[AUTOTRADER] 📍 止损更新: %s → $%.8f", okx_symbol, new_sl_price)
                 return True
             
             return False
                     
         except Exception as e:
-            print(f"[AUTOTRADER] 更新止损异常: {e}")
+            log.error("[AUTOTRADER] 更新止损异常: %s", e)
             return False
 
     def close_position_limit(self, symbol: str, side: str) -> Optional[dict]:
@@ -2428,93 +2868,195 @@ class AutoTrader:
         try:
             okx_symbol = self._convert_symbol_to_okx(symbol)
             
-            positions = self.exchange.fetch_positions([okx_symbol])
-            position = None
-            for p in positions:
-                if p['symbol'] == okx_symbol and float(p.get('contracts', 0)) > 0:
-                    position = p
-                    break
-            
+            position = self._get_position(okx_symbol)
             if not position:
                 return None
             
             amount = float(position.get('contracts', 0))
-            current_price = float(position.get('markPrice', 0))
-            
-            if side == 'long':
-                close_price = current_price * 0.9985
-                close_side = 'sell'
-            else:
-                close_price = current_price * 1.0015
-                close_side = 'buy'
-            
-            order = self.exchange.create_order(
+            # 🔥 优先用WS行情推送的价格（比持仓接口的markPrice更新），没有时回退持仓markPrice
+            current_price = None
+            if self.ws_client and self.ws_client.is_running:
+                current_price = self.ws_client.get_price(okx_symbol)
+                self.ws_client.track_price(okx_symbol)
+            if not current_price:
+                current_price = float(position.get('markPrice', 0))
+            
+            pos_side = 'long' if side == 'long' else 'short'
+            close_mult, close_side = _CLOSE_MULT[pos_side]
+            close_price = current_price * close_mult
+            
+            order = self._create_order_ws_first(
                 symbol=okx_symbol,
                 type='limit',
                 side=close_side,
                 amount=amount,
                 price=close_price,
-                params={
-                    'tdMode': 'cross',
-                    'posSide': 'long' if side == 'long' else 'short',
-                    'reduceOnly': True
-                }
+                params=_CLOSE_PARAMS[pos_side]
             )
             
-            print(f"[AUTOTRADER] 📤 限价平仓: {okx_symbol} @ ${close_price:.8f}")
+            log.info("[AUTOTRADER] 📤 限价平仓: %s @ $%.8f", okx_symbol, close_price)
             self._cancel_sl_tp_orders_hv(okx_symbol)
             return order
             
         except Exception as e:
-            print(f"[AUTOTRADER] 限价平仓异常: {e}")
+            log.error("[AUTOTRADER] 限价平仓异常: %s", e)
             return None
 
+    def _get_position(self, okx_symbol: str) -> Optional[Dict]:
+        """
+        🔥 获取单个持仓：优先读WS持仓缓存（推送维护），缓存不可用时走REST
+        
+        REST回退时一次拉取全部持仓，200ms内的其他查询复用同一份快照。
+        """
+        if self.ws_client and self.ws_client.is_running:
+            cache_ok, position = self.ws_client.get_position(okx_symbol)
+            if cache_ok:
+                return position
+        
+        with self._positions_snapshot_lock:
+            if time.monotonic() - self._positions_snapshot_ts > 0.2:
+                positions = self.exchange.fetch_positions()
+                self._positions_snapshot = {
+                    p['symbol']: p for p in positions if float(p.get('contracts', 0)) > 0
+                }
+                self._positions_snapshot_ts = time.monotonic()
+            return self._positions_snapshot.get(okx_symbol)
+
     def _cancel_sl_tp_orders_hv(self, symbol: str):
-        """🔥 取消止损止盈单"""
-        try:
-            sl_id = self.sl_order_cache.get(symbol)
-            if sl_id:
-                try:
-                    self.exchange.cancel_order(sl_id, symbol)
-                except:
-                    pass
-                del self.sl_order_cache[symbol]
-            
-            tp_id = self.tp_order_cache.get(symbol)
-            if tp_id:
-                try:
-                    self.exchange.cancel_order(tp_id, symbol)
-                except:
-                    pass
-                del self.tp_order_cache[symbol]
-        except:
-            pass
+        """🔥 取消止损止盈单（立即清缓存，实际撤单交给后台批量处理）"""
+        sl_id = self.sl_order_cache.pop(symbol, None)
+        tp_id = self.tp_order_cache.pop(symbol, None)
+        self._enqueue_algo_cancel(symbol, sl_id)
+        if tp_id != sl_id:
+            self._enqueue_algo_cancel(symbol, tp_id)
+
+    def _create_order_ws_first(self, symbol: str, type: str, side: str, amount: float,
+                               price: Optional[float] = None, params: Optional[Mapping] = None) -> Dict:
+        """
+        🔥 下单：优先走WebSocket交易通道，失败回退REST
+        
+        WS请求超时后订单可能已被交易所接受，盲目重发会重复开仓/重复平仓，
+        因此WS未连接时直接回退REST；只减仓订单（reduceOnly）先按clOrdId查询，
+        确认交易所没有该订单后才回退REST，其他订单直接抛出。
+        """
+        params = params or {}
+        if self.ws_client and self.ws_client.is_running:
+            reduce_only = bool(params.get('reduceOnly'))
+            if reduce_only and not params.get('clOrdId'):
+                params = {**params, 'clOrdId': f"rc{uuid.uuid4().hex[:24]}"}
+            try:
+                return self.ws_client.create_order(symbol, type, side, amount, price, params)
+            except Exception as e:
+                if not isinstance(e, ConnectionError):
+                    if not reduce_only:
+                        raise
+                    try:
+                        order = self.exchange.fetch_order(None, symbol, {'clOrdId': params['clOrdId']})
+                        log.warning("[OKX_WS] ⚠️ WS下单响应失败，但订单已在交易所: %s", params['clOrdId'])
+                        return order
+                    except ccxt.OrderNotFound:
+                        pass
+                log.warning("[OKX_WS] ⚠️ WS下单失败，回退REST: %s", e)
+        
+        return self.exchange.create_order(
+            symbol=symbol, type=type, side=side, amount=amount, price=price, params=params
+        )
+
+    def _cancel_order_ws_first(self, order_id: str, symbol: str) -> Dict:
+        """🔥 撤单（普通订单）：优先走WebSocket交易通道，失败回退REST"""
+        if self.ws_client and self.ws_client.is_running:
+            try:
+                return self.ws_client.cancel_order(order_id, symbol)
+            except Exception as e:
+                log.warning("[OKX_WS] ⚠️ WS撤单失败，回退REST: %s", e)
+        
+        return self.exchange.cancel_order(order_id, symbol)
+
+    def _ensure_leverage(self, okx_symbol: str, margin_mode: str = 'cross') -> bool:
+        """
+        🔥 设置杠杆（带缓存）
+        
+        Returns:
+            True表示本次调用了交易所接口，False表示缓存命中已跳过
+        """
+        key = (okx_symbol, margin_mode)
+        if self._leverage_cache.get(key) == self.default_leverage:
+            return False
+        
+        self.exchange.set_leverage(self.default_leverage, okx_symbol)
+        self._leverage_cache[key] = self.default_leverage
+        return True
 
     def get_available_balance(self) -> float:
-        """🔥 获取可用USDT余额"""
+        """🔥 获取可用USDT余额（优先读account频道推送的缓存，冷启动时走REST）"""
+        if self.ws_client and self.ws_client.is_running and self.ws_client.usdt_free is not None:
+            return self.ws_client.usdt_free
+        
         try:
             balance = self.exchange.fetch_balance()
             usdt = balance.get('USDT', {})
             return float(usdt.get('free', 0))
         except Exception as e:
-            print(f"[AUTOTRADER] 获取余额异常: {e}")
+            log.error("[AUTOTRADER] 获取余额异常: %s", e)
             return 0
 
-    def _convert_symbol_to_okx(self, symbol: str) -> str:
-        """🔥 转换symbol格式为OKX格式"""
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _convert_symbol_to_okx(symbol: str) -> str:
+        """🔥 转换symbol格式为OKX格式（结果按symbol缓存，下单路径上是一次dict命中）"""
         if ':' in symbol:
             return symbol
-        if '/' in symbol:
-            base, quote = symbol.split('/')
-            return f"{base}/{quote}:USDT"
+        parts = symbol.split('/', 1)
+        if len(parts) == 2:
+            return f"{parts[0]}/{parts[1]}:USDT"
         if symbol.endswith('USDT'):
-            base = symbol[:-4]
-            return f"{base}/USDT:USDT"
+            return f"{symbol[:-4]}/USDT:USDT"
         return f"{symbol}/USDT:USDT"
 
+    def _apply_pending(self, op: str, order_id: str, value: Optional[PendingSLTP] = None) -> Optional[PendingSLTP]:
+        """
+        🔥 待成交订单缓存的唯一写入口
+        
+        Args:
+            op: 'set' 写入 / 'pop' 取出并删除
+        
+        Returns:
+            'pop' 时返回被删除的条目（不存在返回None）
+        """
+        with self._pending_lock:
+            if op == 'set':
+                self._pending_sl_tp[order_id] = value
+                return value
+            if op == 'pop':
+                return self._pending_sl_tp.pop(order_id, None)
+        raise ValueError(f"unknown op: {op}")
+
     def get_pending_high_vol_orders(self) -> list:
         """🔥 获取所有待成交的高波动订单"""
-        return [{'order_id': k, **v} for k, v in self._pending_sl_tp.items()]
+        return [{'order_id': k, **asdict(v)} for k, v in list(self._pending_sl_tp.items())]
+
+
+# 🔥 配置解析缓存：(config_path, mtime) -> 解析后的配置，文件未修改时不重复解析
+_CFG_CACHE: Dict[Tuple[str, float], dict] = {}
+
+
+def _load_config_cached(config_path: str) -> dict:
+    """
+    读取YAML配置（按mtime缓存，优先使用libyaml的CSafeLoader）
+
+    返回深拷贝：调用方（AutoTrader等）可能修改配置，不能污染缓存里的那份。
+    """
+    import yaml
+
+    global _CFG_CACHE
+    key = (config_path, os.path.getmtime(config_path))
+    config = _CFG_CACHE.get(key)
+    if config is None:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+        _CFG_CACHE = {k: v for k, v in _CFG_CACHE.items() if k[0] != config_path}
+        _CFG_CACHE[key] = config
+    return copy.deepcopy(config)
 
 
 def create_auto_trader(config_path: str, db_path: str) -> Optional[AutoTrader]:
@@ -2529,15 +3071,12 @@ def create_auto_trader(config_path: str, db_path: str) -> Optional[AutoTrader]:
         AutoTrader实例或None
     """
     try:
-        import yaml
-
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = _load_config_cached(config_path)
 
         auto_config = config.get('auto_trading', {})
 
         if not auto_config.get('enabled', False):
-            print("[AUTOTRADER] 自动交易未启用")
+            log.info("[AUTOTRADER] 自动交易未启用")
             return None
 
         # 🔥 v3.7: 传递完整配置用于AI审核等功能
@@ -2545,7 +3084,5 @@ def create_auto_trader(config_path: str, db_path: str) -> Optional[AutoTrader]:
         return trader
 
     except Exception as e:
-        print(f"[AUTOTRADER_ERR] 创建自动交易器失败: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("[AUTOTRADER_ERR] 创建自动交易器失败: %s", e)
         return None
\ No newline at end of file
@@ -2,15 +2,31 @@
 # 用途：基于历史信号数据进行策略回测，计算绩效指标
 
 import sqlite3
-import json
+import logging
 import math
+import sys
+import threading
+import time
 import ccxt
-from typing import Dict, List, Optional, Tuple, Any
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any
 from datetime import datetime, timedelta, timezone
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 import numpy as np
 
+from core.bt_kernels import NUMBA_AVAILABLE, ISO_PARSE_FAIL, equity_curve as _equity_curve
+from core.utils import json_loads
+
+# 🔥 优先使用AOT预编译的内核（python tools/build_bt_kernels.py 生成），省去进程启动时的JIT编译
+try:
+    from core._bt_kernels import scan_exit_long, scan_exit_short, compute_metrics, parse_iso_us
+    AOT_KERNELS_AVAILABLE = True
+except ImportError:
+    from core.bt_kernels import scan_exit_long, scan_exit_short, compute_metrics, parse_iso_us
+    AOT_KERNELS_AVAILABLE = False
+
 
 @dataclass
 class Trade:
@@ -38,6 +54,61 @@ class Trade:
         return self.pnl_pct * self.leverage
 
 
+_SIDES = ("long", "short")
+
+
+@dataclass
+class TradesSoA:
+    """
+    交易记录的列式存储（每个字段一个NumPy数组，下标对齐）
+    
+    指标计算直接在数组上向量化；Trade对象只在访问 BacktestResult.trades 时才构造。
+    """
+    symbols: np.ndarray   # object
+    sides: np.ndarray     # int8，下标对应 _SIDES（0=long, 1=short）
+    entry: np.ndarray     # float64，含滑点的入场价
+    exit_: np.ndarray     # float64
+    tp: np.ndarray        # float64
+    sl: np.ndarray        # float64
+    pnl: np.ndarray       # float64，盈亏%（已扣手续费）
+    hold: np.ndarray      # int32，持仓分钟
+    entry_us: np.ndarray  # int64，入场UTC微秒时间戳
+    exit_ms: np.ndarray   # int64，出场K线UTC毫秒时间戳
+    reason: np.ndarray    # int8，下标对应 _EXIT_REASONS
+    lev: np.ndarray       # int16
+    
+    def select(self, mask: np.ndarray) -> "TradesSoA":
+        """按布尔掩码筛选（每列一次连续拷贝）"""
+        return TradesSoA(*(getattr(self, f.name)[mask] for f in fields(self)))
+    
+    def __len__(self) -> int:
+        return len(self.pnl)
+    
+    def to_trades(self) -> List[Trade]:
+        """物化为Trade对象列表（打印/展示用）"""
+        return [
+            Trade(
+                symbol=symbol,
+                side=_SIDES[side],
+                entry_price=entry,
+                entry_time=_us_to_datetime(entry_us),
+                exit_price=exit_price,
+                exit_time=_EPOCH + timedelta(milliseconds=exit_ms),
+                tp_price=tp,
+                sl_price=sl,
+                pnl_pct=pnl,
+                exit_reason=_EXIT_REASONS[reason],
+                holding_minutes=hold,
+                leverage=lev,
+            )
+            for symbol, side, entry, exit_price, tp, sl, pnl, hold, entry_us, exit_ms, reason, lev in zip(
+                self.symbols.tolist(), self.sides.tolist(), self.entry.tolist(), self.exit_.tolist(),
+                self.tp.tolist(), self.sl.tolist(), self.pnl.tolist(), self.hold.tolist(),
+                self.entry_us.tolist(), self.exit_ms.tolist(), self.reason.tolist(), self.lev.tolist(),
+            )
+        ]
+
+
 @dataclass
 class BacktestResult:
     """回测结果"""
@@ -63,10 +134,31 @@ class BacktestResult:
     avg_holding_minutes: float = 0.0
     total_days: int = 0
     
-    # 详细数据
-    trades: List[Trade] = field(default_factory=list)
-    equity_curve: List[float] = field(default_factory=list)
-    daily_returns: List[float] = field(default_factory=list)
+    # 详细数据（交易明细以列式存储；trades / equity_curve / daily_returns 按需生成）
+    soa: Optional[TradesSoA] = None
+    initial_capital: float = 0.0
+    
+    _trades: Optional[List[Trade]] = field(default=None, init=False, repr=False, compare=False)
+    _daily_returns: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def trades(self) -> List[Trade]:
+        """交易明细（首次访问时由列数组构造Trade对象）"""
+        if self._trades is None:
+            self._trades = self.soa.to_trades() if self.soa is not None else []
+        return self._trades
+    
+    @property
+    def equity_curve(self) -> List[float]:
+        """权益曲线（每次访问由逐笔盈亏重新计算）"""
+        if self.soa is None or not len(self.soa):
+            return []
+        return _equity_curve(self.soa.pnl, self.initial_capital).tolist()
+    
+    @property
+    def daily_returns(self) -> List[float]:
+        """按入场日期汇总的日收益率（日期升序）"""
+        return self._daily_returns.tolist() if self._daily_returns is not None else []
     
     def to_dict(self) -> Dict:
         return {
@@ -86,48 +178,166 @@ class BacktestResult:
             "total_days": self.total_days,
         }
     
-    def print_report(self):
-        """打印回测报告"""
-        print("\n" + "=" * 60)
-        print("📊 回测报告")
-        print("=" * 60)
-        
-        print(f"\n📈 交易统计:")
-        print(f"  总交易数: {self.total_trades}")
-        print(f"  盈利交易: {self.winning_trades}")
-        print(f"  亏损交易: {self.losing_trades}")
-        print(f"  胜率: {self.win_rate * 100:.1f}%")
-        
-        print(f"\n💰 收益指标:")
-        print(f"  总盈亏: {self.total_pnl_pct:+.2f}%")
-        print(f"  平均盈亏: {self.avg_pnl_pct:+.2f}%")
-        print(f"  平均盈利: {self.avg_win_pct:+.2f}%")
-        print(f"  平均亏损: {self.avg_loss_pct:+.2f}%")
-        print(f"  盈亏比: {self.profit_loss_ratio:.2f}")
-        
-        print(f"\n📉 风险指标:")
-        print(f"  Sharpe Ratio: {self.sharpe_ratio:.2f}")
-        print(f"  最大回撤: {self.max_drawdown_pct:.2f}%")
-        print(f"  最大连亏: {self.max_consecutive_losses}笔")
-        
-        print(f"\n⏱️ 时间指标:")
-        print(f"  平均持仓: {self.avg_holding_minutes:.0f}分钟")
-        print(f"  回测天数: {self.total_days}天")
-        
-        # 评级
-        print(f"\n🏆 策略评级:")
+    def format_report(self) -> str:
+        """生成回测报告文本（调用方决定打印还是写日志）"""
         if self.sharpe_ratio >= 2.0 and self.win_rate >= 0.5 and self.max_drawdown_pct <= 10:
-            print("  ⭐⭐⭐⭐⭐ 优秀")
+            rating = "⭐⭐⭐⭐⭐ 优秀"
         elif self.sharpe_ratio >= 1.5 and self.win_rate >= 0.45:
-            print("  ⭐⭐⭐⭐ 良好")
+            rating = "⭐⭐⭐⭐ 良好"
         elif self.sharpe_ratio >= 1.0 and self.win_rate >= 0.40:
-            print("  ⭐⭐⭐ 中等")
+            rating = "⭐⭐⭐ 中等"
         elif self.sharpe_ratio >= 0.5:
-            print("  ⭐⭐ 较差")
+            rating = "⭐⭐ 较差"
         else:
-            print("  ⭐ 需要优化")
-        
-        print("=" * 60)
+            rating = "⭐ 需要优化"
+        
+        return "\n".join([
+            "\n" + "=" * 60,
+            "📊 回测报告",
+            "=" * 60,
+            "\n📈 交易统计:",
+            f"  总交易数: {self.total_trades}",
+            f"  盈利交易: {self.winning_trades}",
+            f"  亏损交易: {self.losing_trades}",
+            f"  胜率: {self.win_rate * 100:.1f}%",
+            "\n💰 收益指标:",
+            f"  总盈亏: {self.total_pnl_pct:+.2f}%",
+            f"  平均盈亏: {self.avg_pnl_pct:+.2f}%",
+            f"  平均盈利: {self.avg_win_pct:+.2f}%",
+            f"  平均亏损: {self.avg_loss_pct:+.2f}%",
+            f"  盈亏比: {self.profit_loss_ratio:.2f}",
+            "\n📉 风险指标:",
+            f"  Sharpe Ratio: {self.sharpe_ratio:.2f}",
+            f"  最大回撤: {self.max_drawdown_pct:.2f}%",
+            f"  最大连亏: {self.max_consecutive_losses}笔",
+            "\n⏱️ 时间指标:",
+            f"  平均持仓: {self.avg_holding_minutes:.0f}分钟",
+            f"  回测天数: {self.total_days}天",
+            "\n🏆 策略评级:",
+            f"  {rating}",
+            "=" * 60,
+        ])
+    
+    def print_report(self):
+        """打印回测报告"""
+        print(self.format_report())
+
+
+def _get_logger() -> logging.Logger:
+    """回测日志：输出到stdout（格式与print一致）；参数扫描时调高级别即可静默"""
+    logger = logging.getLogger("backtester")
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+log = _get_logger()
+
+
+# 出场原因编码（出场扫描内核返回值 -> Trade.exit_reason）
+_EXIT_REASONS = ("", "stop_loss", "take_profit", "timeout_24h")
+
+# 币安U本位合约K线接口
+_BINANCE_FAPI_KLINES = "https://fapi.binance.com/fapi/v1/klines"
+
+# 信号库读优化（WAL与实盘写入并行读；mmap 256MB；页缓存64MB；临时表放内存）
+_SIGNALS_DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# pushed_signals的止盈止损为空/0时，从payload.calculated_stops中取（SQLite JSON1，查询内完成）
+_PAYLOAD_STOP_SQL = (
+    "COALESCE(NULLIF({col}, 0), CASE WHEN json_valid(payload) "
+    "THEN json_extract(payload, '$.calculated_stops.{col}') END)"
+)
+
+# 信号来源表 -> (payload列, 额外筛选条件)
+_SIGNAL_TABLES = {
+    "pushed_signals": ("payload", ""),
+    "watch_signals": ("NULL", " AND status IN ('executed', 'filled', 'completed')"),
+}
+
+
+class _Bars(NamedTuple):
+    """出场扫描用的K线：时间戳int64 + 高/低/收 float32（每行连续，带宽减半）"""
+    ts: np.ndarray   # (N,) int64，开盘时间毫秒
+    hlc: np.ndarray  # (3, N) float32：最高/最低/收盘
+
+
+def _to_bars(klines) -> _Bars:
+    """OHLCV行列表 [时间, 开, 高, 低, 收, 量] -> _Bars"""
+    arr = np.asarray(klines, dtype=np.float64).reshape(-1, 6)
+    return _Bars(arr[:, 0].astype(np.int64), np.ascontiguousarray(arr[:, 2:5].T, dtype=np.float32))
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAT_US = np.iinfo(np.int64).min  # datetime64的NaT对应的int64值
+
+
+def _signal_times_us(time_strs: List[str]) -> np.ndarray:
+    """
+    批量解析信号时间 -> UTC微秒时间戳（int64，无法解析的为_NAT_US）
+
+    有编译内核时按定长字节一次性解析（parse_iso_us）；否则UTC/无时区的字符串走numpy datetime64。
+    内核不认识的格式、含非UTC时区偏移或格式异常时逐个回退到 _parse_signal_time。
+    """
+    if NUMBA_AVAILABLE or AOT_KERNELS_AVAILABLE:
+        try:
+            buf = np.array(time_strs, dtype=bytes)
+        except (TypeError, UnicodeEncodeError):
+            buf = None
+        if buf is not None and buf.ndim == 1 and buf.itemsize:
+            out = np.empty(len(time_strs), dtype=np.int64)
+            parse_iso_us(buf.view(np.uint8).reshape(len(time_strs), buf.itemsize), out)
+            for i in np.flatnonzero(out == ISO_PARSE_FAIL).tolist():
+                signal_time = _parse_signal_time(time_strs[i])
+                out[i] = _NAT_US if signal_time is None else (signal_time - _EPOCH) // timedelta(microseconds=1)
+            return out
+
+    naive = []
+    for time_str in time_strs:
+        if not isinstance(time_str, str):
+            break
+        time_str = time_str.replace('Z', '+00:00')
+        if time_str.endswith('+00:00'):
+            time_str = time_str[:-6]
+        if '+' in time_str[10:] or '-' in time_str[10:]:
+            break  # 非UTC时区偏移，交给fromisoformat换算
+        naive.append(time_str)
+    else:
+        try:
+            return np.array(naive, dtype='datetime64[us]').astype(np.int64)
+        except ValueError:
+            pass
+
+    out = np.empty(len(time_strs), dtype=np.int64)
+    for i, time_str in enumerate(time_strs):
+        signal_time = _parse_signal_time(time_str)
+        out[i] = _NAT_US if signal_time is None else (signal_time - _EPOCH) // timedelta(microseconds=1)
+    return out
+
+
+def _us_to_datetime(ts_us: int) -> datetime:
+    """UTC微秒时间戳 -> datetime（精确，不经过浮点）"""
+    return _EPOCH + timedelta(microseconds=int(ts_us))
+
+
+def _parse_signal_time(signal_time_str: str) -> Optional[datetime]:
+    """解析信号时间（ISO格式，无时区按UTC），失败返回None"""
+    try:
+        signal_time = datetime.fromisoformat(signal_time_str.replace('Z', '+00:00'))
+    except (TypeError, ValueError, AttributeError):
+        return None
+    if signal_time.tzinfo is None:
+        signal_time = signal_time.replace(tzinfo=timezone.utc)
+    return signal_time
 
 
 class Backtester:
@@ -167,6 +377,13 @@ class Backtester:
         self.commission_rate = bt_cfg.get("commission_rate", 0.0004)
         self.slippage_rate = bt_cfg.get("slippage_rate", 0.001)
         self.initial_capital = bt_cfg.get("initial_capital", 10000)
+        self.fetch_workers = bt_cfg.get("fetch_workers", 16)
+        self.quiet = bt_cfg.get("quiet", False)  # 关闭模拟进度输出（参数扫描时用）
+        self.klines_direct = bt_cfg.get("klines_direct", True)  # 直连币安合约K线接口，绕过ccxt解析
+        self.klines_rate_per_sec = bt_cfg.get("klines_rate_per_sec", 20)
+        
+        # 信号库连接：引擎生命周期内复用，多次run()共享SQLite页缓存
+        self._conn = self._open_signals_db()
         
         # 交易所实例
         self.exchange = ccxt.binance({
@@ -174,10 +391,28 @@ class Backtester:
             'options': {'defaultType': 'future'}
         })
         
-        # K线缓存
-        self._kline_cache: Dict[str, List] = {}
-        
-        print(f"[BACKTEST] 初始化完成 | DB: {self.db_path}")
+        # 🔥 直连K线：复用一个keep-alive连接池，多线程共享；全局限速避免触发币安权重限制
+        self._http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.fetch_workers)
+        self._http.mount("https://", adapter)
+        self._market_ids: Dict[str, Optional[str]] = {}
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+        
+        # K线缓存：内存（本次运行） + 本地SQLite（跨运行持久化）
+        self._kline_cache: Dict[str, _Bars] = {}
+        self._cache_conn: Optional[sqlite3.Connection] = None
+        self._init_ohlcv_cache()
+        
+        # 🔥 预热JIT：编译开销在初始化时一次性支付
+        if NUMBA_AVAILABLE and not AOT_KERNELS_AVAILABLE:
+            _warm = _to_bars([[0, 0, 0, 0, 0, 0]])
+            for scan in (scan_exit_long, scan_exit_short):
+                scan(_warm.ts, *_warm.hlc, 0.0, 1.0, 1.0, 0.0)
+            compute_metrics(np.zeros(1), np.zeros(1, dtype=np.int32), 1.0)
+            parse_iso_us(np.zeros((1, 10), dtype=np.uint8), np.empty(1, dtype=np.int64))
+        
+        log.info("[BACKTEST] 初始化完成 | DB: %s", self.db_path)
     
     def run(
         self,
@@ -209,19 +444,19 @@ class Backtester:
                 days = self.default_days
             start_date = end_date - timedelta(days=days)
         
-        print(f"[BACKTEST] 回测区间: {start_date.date()} ~ {end_date.date()}")
+        log.info("[BACKTEST] 回测区间: %s ~ %s", start_date.date(), end_date.date())
         
         # 加载历史信号
         signals = self._load_signals(start_date, end_date, symbols, min_score)
-        print(f"[BACKTEST] 加载信号数: {len(signals)}")
+        log.info("[BACKTEST] 加载信号数: %d", len(signals))
         
         if not signals:
-            print("[BACKTEST] 没有找到符合条件的信号")
+            log.info("[BACKTEST] 没有找到符合条件的信号")
             return BacktestResult()
         
         # 模拟交易
         trades = self._simulate_trades(signals)
-        print(f"[BACKTEST] 模拟交易数: {len(trades)}")
+        log.info("[BACKTEST] 模拟交易数: %d", len(trades))
         
         # 计算绩效指标
         result = self._calculate_metrics(trades, start_date, end_date)
@@ -235,112 +470,98 @@ class Backtester:
         symbols: List[str] = None,
         min_score: float = 0.0,
     ) -> List[Dict]:
-        """从数据库加载历史信号"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """从数据库加载历史信号（pushed_signals + watch_signals 单条UNION ALL查询）"""
+        cursor = self._conn.cursor()
+        cursor.arraysize = 1000
         
         # 检查表结构
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [t[0] for t in cursor.fetchall()]
-        
-        signals = []
+        tables = {t[0] for t in cursor.fetchall()}
         
-        # 尝试从不同的表加载
-        if "pushed_signals" in tables:
-            signals.extend(self._load_from_pushed_signals(
-                cursor, start_date, end_date, symbols, min_score
-            ))
+        queries = [
+            (table, *self._signal_query(table, start_date, end_date, symbols, min_score, self._json1))
+            for table in _SIGNAL_TABLES if table in tables
+        ]
         
-        if "watch_signals" in tables:
-            signals.extend(self._load_from_watch_signals(
-                cursor, start_date, end_date, symbols, min_score
-            ))
-        
-        conn.close()
-        
-        # 按时间排序
-        signals.sort(key=lambda x: x.get("signal_time", ""))
+        signals = []
+        if queries:
+            union_sql = " UNION ALL ".join(q[1] for q in queries) + " ORDER BY created_at, source"
+            union_params = [p for q in queries for p in q[2]]
+            try:
+                cursor.execute(union_sql, union_params)
+                signals = self._fetch_signals(cursor)
+            except sqlite3.OperationalError:
+                # 某张表结构不符时逐表查询，不让一张表拖垮另一张
+                for table, query, params in queries:
+                    try:
+                        cursor.execute(query, params)
+                        signals.extend(self._fetch_signals(cursor))
+                    except sqlite3.OperationalError as e:
+                        log.warning("[BACKTEST] %s查询失败: %s", table, e)
+                signals.sort(key=lambda x: x.get("signal_time", ""))
+        
+        cursor.close()
+        
+        # 🔥 一次性解析所有信号时间（int64微秒），模拟时不再逐条解析字符串
+        for signal, ts_us in zip(signals, _signal_times_us([s["signal_time"] for s in signals]).tolist()):
+            signal["signal_ts_us"] = ts_us
         
         return signals
     
-    def _load_from_pushed_signals(
-        self,
-        cursor,
-        start_date: datetime,
-        end_date: datetime,
-        symbols: List[str] = None,
-        min_score: float = 0.0,
-    ) -> List[Dict]:
-        """从pushed_signals表加载"""
-        query = """
-        SELECT symbol, side, score, entry_price, tp_price, sl_price, 
-               leverage, created_at, payload
-        FROM pushed_signals
-        WHERE created_at BETWEEN ? AND ?
-          AND score >= ?
-        """
-        params = [start_date.isoformat(), end_date.isoformat(), min_score]
-        
-        if symbols:
-            placeholders = ",".join(["?" for _ in symbols])
-            query += f" AND symbol IN ({placeholders})"
-            params.extend(symbols)
-        
-        query += " ORDER BY created_at ASC"
-        
+    def _open_signals_db(self) -> sqlite3.Connection:
+        """打开信号库：设置读优化PRAGMA，并补建回测查询用的 (created_at, score) 索引"""
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
         try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-        except sqlite3.OperationalError as e:
-            print(f"[BACKTEST] pushed_signals查询失败: {e}")
-            return []
+            conn.execute("SELECT json_valid('{}')")
+            self._json1 = True
+        except sqlite3.OperationalError:
+            self._json1 = False  # SQLite未编译JSON1，payload回退到Python解析
         
-        signals = []
-        for row in rows:
-            symbol, side, score, entry_price, tp_price, sl_price, leverage, created_at, payload_json = row
-            
-            # 解析payload
+        for pragma in _SIGNALS_DB_PRAGMAS:
             try:
-                payload = json.loads(payload_json) if payload_json else {}
-            except:
-                payload = {}
-            
-            # 如果没有止盈止损，从payload中获取
-            if not tp_price and payload:
-                tp_price = payload.get("calculated_stops", {}).get("tp_price", 0)
-            if not sl_price and payload:
-                sl_price = payload.get("calculated_stops", {}).get("sl_price", 0)
-            
-            signals.append({
-                "symbol": symbol,
-                "side": side or "long",
-                "score": float(score or 0),
-                "entry_price": float(entry_price or 0),
-                "tp_price": float(tp_price or 0),
-                "sl_price": float(sl_price or 0),
-                "leverage": int(leverage or 5),
-                "signal_time": created_at,
-                "source": "pushed_signals",
-            })
+                conn.execute(pragma)
+            except sqlite3.Error as e:
+                log.warning("[BACKTEST] ⚠️ %s 失败: %s", pragma, e)
         
-        return signals
+        tables = {t[0] for t in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        try:
+            with conn:
+                for table in _SIGNAL_TABLES:
+                    if table in tables:
+                        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_created_score ON {table}(created_at, score)")
+        except sqlite3.Error as e:
+            log.warning("[BACKTEST] ⚠️ 创建信号索引失败（只读库？）: %s", e)
+        return conn
     
-    def _load_from_watch_signals(
-        self,
-        cursor,
+    def close(self):
+        """释放数据库连接与HTTP连接池"""
+        self._conn.close()
+        if self._cache_conn is not None:
+            self._cache_conn.close()
+            self._cache_conn = None
+        self._http.close()
+    
+    @staticmethod
+    def _signal_query(
+        table: str,
         start_date: datetime,
         end_date: datetime,
         symbols: List[str] = None,
         min_score: float = 0.0,
-    ) -> List[Dict]:
-        """从watch_signals表加载"""
-        query = """
-        SELECT symbol, side, score, entry_price, tp_price, sl_price,
-               leverage, created_at, status
-        FROM watch_signals
+        json1: bool = True,
+    ) -> Tuple[str, List]:
+        """构造单表的信号查询（筛选条件全部下推到SQL）"""
+        payload_col, extra_where = _SIGNAL_TABLES[table]
+        tp_col, sl_col = "tp_price", "sl_price"
+        if json1 and payload_col == "payload":
+            tp_col, sl_col = (_PAYLOAD_STOP_SQL.format(col=col) for col in ("tp_price", "sl_price"))
+            payload_col = "NULL"
+        query = f"""
+        SELECT symbol, side, score, entry_price, {tp_col}, {sl_col},
+               leverage, created_at, {payload_col} AS payload, '{table}' AS source
+        FROM {table}
         WHERE created_at BETWEEN ? AND ?
-          AND score >= ?
-          AND status IN ('executed', 'filled', 'completed')
+          AND score >= ?{extra_where}
         """
         params = [start_date.isoformat(), end_date.isoformat(), min_score]
         
@@ -349,224 +570,348 @@ class Backtester:
             query += f" AND symbol IN ({placeholders})"
             params.extend(symbols)
         
-        query += " ORDER BY created_at ASC"
-        
-        try:
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-        except sqlite3.OperationalError as e:
-            print(f"[BACKTEST] watch_signals查询失败: {e}")
-            return []
-        
+        return query, params
+    
+    @staticmethod
+    def _fetch_signals(cursor) -> List[Dict]:
+        """分批读取查询结果并转换为信号字典"""
         signals = []
-        for row in rows:
-            symbol, side, score, entry_price, tp_price, sl_price, leverage, created_at, status = row
-            
-            signals.append({
-                "symbol": symbol,
-                "side": side or "long",
-                "score": float(score or 0),
-                "entry_price": float(entry_price or 0),
-                "tp_price": float(tp_price or 0),
-                "sl_price": float(sl_price or 0),
-                "leverage": int(leverage or 5),
-                "signal_time": created_at,
-                "source": "watch_signals",
-            })
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            for symbol, side, score, entry_price, tp_price, sl_price, leverage, created_at, payload_json, source in rows:
+                # 没有止盈止损时才解析payload（仅SQLite不支持JSON1时会取出payload）
+                if payload_json and (not tp_price or not sl_price):
+                    try:
+                        stops = json_loads(payload_json).get("calculated_stops", {})
+                    except (ValueError, AttributeError):
+                        stops = {}
+                    if not tp_price:
+                        tp_price = stops.get("tp_price", 0)
+                    if not sl_price:
+                        sl_price = stops.get("sl_price", 0)
+                
+                signals.append({
+                    "symbol": symbol,
+                    "side": side or "long",
+                    "score": float(score or 0),
+                    "entry_price": float(entry_price or 0),
+                    "tp_price": float(tp_price or 0),
+                    "sl_price": float(sl_price or 0),
+                    "leverage": int(leverage or 5),
+                    "signal_time": created_at,
+                    "source": source,
+                })
         
         return signals
     
-    def _simulate_trades(self, signals: List[Dict]) -> List[Trade]:
+    def _simulate_trades(self, signals: List[Dict]) -> TradesSoA:
         """模拟交易执行"""
-        trades = []
-        
-        for i, signal in enumerate(signals):
-            print(f"  处理信号 {i+1}/{len(signals)}: {signal['symbol']} {signal['side']}", end="\r")
+        self._prefetch_klines(signals)
+        
+        # 🔥 逐笔常量（默认止盈止损、含滑点入场价）整批向量化预计算
+        total = len(signals)
+        show_progress = not self.quiet and log.isEnabledFor(logging.INFO)
+        entry = np.fromiter((s["entry_price"] for s in signals), dtype=np.float64, count=total)
+        tp = np.fromiter((s["tp_price"] for s in signals), dtype=np.float64, count=total)
+        sl = np.fromiter((s["sl_price"] for s in signals), dtype=np.float64, count=total)
+        is_long = np.fromiter((s["side"].lower() == "long" for s in signals), dtype=bool, count=total)
+        entry_us = np.fromiter((s["signal_ts_us"] for s in signals), dtype=np.int64, count=total)
+        
+        actual_entry = np.where(is_long, entry * (1 + self.slippage_rate), entry * (1 - self.slippage_rate))
+        # 没有止盈止损时使用默认值：多单 +8% / -2%，空单 -8% / +2%
+        tp = np.where(tp > 0, tp, entry * np.where(is_long, 1.08, 0.92))
+        sl = np.where(sl > 0, sl, entry * np.where(is_long, 0.98, 1.02))
+        
+        # 🔥 出场结果直接写入预分配的槽位，无效信号由valid掩码最后一次性剔除
+        exit_price = np.zeros(total, dtype=np.float64)
+        exit_ms = np.zeros(total, dtype=np.int64)
+        reason = np.zeros(total, dtype=np.int8)
+        valid = np.zeros(total, dtype=bool)
+        
+        for i, (signal, long_i, tp_i, sl_i) in enumerate(zip(signals, is_long.tolist(), tp.tolist(), sl.tolist())):
+            # 🔥 每256条刷新一次进度，避免逐条print的I/O开销
+            if show_progress and i & 255 == 0:
+                print(f"  处理信号 {i+1}/{total}", end="\r")
             
-            trade = self._simulate_single_trade(signal)
-            if trade:
-                trades.append(trade)
-        
-        print()  # 换行
-        return trades
-    
-    def _simulate_single_trade(self, signal: Dict) -> Optional[Trade]:
-        """模拟单笔交易"""
-        symbol = signal["symbol"]
-        side = signal["side"].lower()
-        entry_price = signal["entry_price"]
-        tp_price = signal["tp_price"]
-        sl_price = signal["sl_price"]
-        leverage = signal["leverage"]
-        signal_time_str = signal["signal_time"]
-        
-        # 验证数据
-        if entry_price <= 0:
-            return None
-        
-        # 如果没有止盈止损，使用默认值
-        if tp_price <= 0:
-            if side == "long":
-                tp_price = entry_price * 1.08  # 默认8%止盈
-            else:
-                tp_price = entry_price * 0.92
+            result = self._simulate_single_trade(signal, long_i, tp_i, sl_i)
+            if result is not None:
+                exit_price[i], exit_ms[i], reason[i] = result
+                valid[i] = True
+        
+        if show_progress:
+            print(f"  处理信号 {total}/{total}")
+        
+        # 盈亏（扣除开仓+平仓手续费）与持仓时间整批计算
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl = np.where(is_long, exit_price - actual_entry, actual_entry - exit_price) / actual_entry * 100
+        pnl -= self.commission_rate * 100 * 2
+        with np.errstate(invalid='ignore'):
+            hold = ((exit_ms * 1000 - entry_us) / 1e6 / 60).astype(np.int32)
+        
+        return TradesSoA(
+            symbols=np.array([s["symbol"] for s in signals], dtype=object),
+            sides=(~is_long).astype(np.int8),
+            entry=actual_entry,
+            exit_=exit_price,
+            tp=tp,
+            sl=sl,
+            pnl=pnl,
+            hold=hold,
+            entry_us=entry_us,
+            exit_ms=exit_ms,
+            reason=reason,
+            lev=np.fromiter((s["leverage"] for s in signals), dtype=np.int16, count=total),
+        ).select(valid)
+    
+    def _simulate_single_trade(
+        self,
+        signal: Dict,
+        is_long: bool,
+        tp_price: float,
+        sl_price: float,
+    ) -> Optional[Tuple[float, int, int]]:
+        """
+        模拟单笔交易的出场（止盈止损已由 _simulate_trades 补齐默认值）
         
-        if sl_price <= 0:
-            if side == "long":
-                sl_price = entry_price * 0.98  # 默认2%止损
-            else:
-                sl_price = entry_price * 1.02
+        Returns:
+            (出场价, 出场K线毫秒时间戳, 出场原因编码)；信号无效或无K线返回None
+        """
+        signal_ts_us = signal["signal_ts_us"]
         
-        # 解析时间
-        try:
-            signal_time = datetime.fromisoformat(signal_time_str.replace('Z', '+00:00'))
-            if signal_time.tzinfo is None:
-                signal_time = signal_time.replace(tzinfo=timezone.utc)
-        except:
+        # 验证数据
+        if signal["entry_price"] <= 0 or signal_ts_us == _NAT_US:
             return None
         
         # 获取K线数据
-        klines = self._get_klines(symbol, signal_time)
-        if not klines:
+        bars = self._get_klines(signal["symbol"], _us_to_datetime(signal_ts_us))
+        if bars.ts.size == 0:
             return None
         
-        # 模拟入场（加入滑点）
-        if side == "long":
-            actual_entry = entry_price * (1 + self.slippage_rate)
-        else:
-            actual_entry = entry_price * (1 - self.slippage_rate)
-        
-        # 寻找出场点
-        exit_price = 0.0
-        exit_time = None
-        exit_reason = ""
-        
-        for kline in klines:
-            timestamp, open_p, high, low, close, volume = kline
-            kline_time = datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc)
-            
-            if kline_time <= signal_time:
-                continue
-            
-            if side == "long":
-                # 先检查止损
-                if low <= sl_price:
-                    exit_price = sl_price * (1 - self.slippage_rate)
-                    exit_time = kline_time
-                    exit_reason = "stop_loss"
-                    break
-                # 再检查止盈
-                if high >= tp_price:
-                    exit_price = tp_price * (1 - self.slippage_rate)
-                    exit_time = kline_time
-                    exit_reason = "take_profit"
-                    break
-            else:
-                # 做空：先检查止损
-                if high >= sl_price:
-                    exit_price = sl_price * (1 + self.slippage_rate)
-                    exit_time = kline_time
-                    exit_reason = "stop_loss"
-                    break
-                # 再检查止盈
-                if low <= tp_price:
-                    exit_price = tp_price * (1 + self.slippage_rate)
-                    exit_time = kline_time
-                    exit_reason = "take_profit"
-                    break
-        
-        # 如果24小时内未触发，按最后价格平仓
-        if not exit_time and klines:
-            last_kline = klines[-1]
-            exit_price = last_kline[4]  # close
-            exit_time = datetime.fromtimestamp(last_kline[0] / 1000, tz=timezone.utc)
-            exit_reason = "timeout_24h"
+        # 寻找出场点（24小时内未触发则按最后收盘价平仓）
+        high, low, close = bars.hlc
+        # 多空内核在K线循环外分派一次
+        scan = scan_exit_long if is_long else scan_exit_short
+        exit_idx, exit_price, reason_code = scan(
+            bars.ts, high, low, close, signal_ts_us / 1000,
+            tp_price, sl_price, self.slippage_rate,
+        )
         
         if not exit_price:
             return None
         
-        # 计算盈亏
-        if side == "long":
-            pnl_pct = (exit_price - actual_entry) / actual_entry * 100
-        else:
-            pnl_pct = (actual_entry - exit_price) / actual_entry * 100
-        
-        # 扣除手续费
-        pnl_pct -= self.commission_rate * 100 * 2  # 开仓+平仓
-        
-        # 计算持仓时间
-        holding_minutes = int((exit_time - signal_time).total_seconds() / 60)
-        
-        return Trade(
-            symbol=symbol,
-            side=side,
-            entry_price=actual_entry,
-            entry_time=signal_time,
-            exit_price=exit_price,
-            exit_time=exit_time,
-            tp_price=tp_price,
-            sl_price=sl_price,
-            pnl_pct=pnl_pct,
-            exit_reason=exit_reason,
-            holding_minutes=holding_minutes,
-            leverage=leverage,
-        )
+        return exit_price, int(bars.ts[exit_idx]), reason_code
+    
+    def _prefetch_klines(self, signals: List[Dict], hours: int = 24):
+        """
+        🔥 并发预取K线（I/O密集，线程池重叠网络等待）
+        
+        每个 (symbol, 日期) 缓存键使用该日第一条信号的时间作为since，
+        与逐条模拟时的取数完全一致；失败的键不写缓存，模拟时按原逻辑重试。
+        """
+        pending: Dict[str, Tuple[str, str, int]] = {}
+        for signal in signals:
+            if signal["entry_price"] <= 0 or signal["signal_ts_us"] == _NAT_US:
+                continue
+            signal_time = _us_to_datetime(signal["signal_ts_us"])
+            day = str(signal_time.date())
+            cache_key = f"{signal['symbol']}_{day}"
+            if cache_key not in self._kline_cache and cache_key not in pending:
+                since_ts = int(signal_time.timestamp() * 1000)
+                cached = self._load_cached_ohlcv(signal["symbol"], day, since_ts)
+                if cached is not None:
+                    self._kline_cache[cache_key] = cached
+                else:
+                    pending[cache_key] = (signal["symbol"], day, since_ts)
+        
+        if not pending:
+            return
+        
+        log.info("[BACKTEST] 并发预取K线: %d组 (%d线程)", len(pending), self.fetch_workers)
+        try:
+            # 先在主线程加载市场信息，避免多个线程同时触发load_markets
+            self.exchange.load_markets()
+        except Exception as e:
+            log.warning("[BACKTEST] 加载市场信息失败，跳过预取: %s", e)
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            futures = {
+                executor.submit(self._fetch_ohlcv, symbol, since_ts, hours + 2): cache_key
+                for cache_key, (symbol, _, since_ts) in pending.items()
+            }
+            fetched = []
+            for future in as_completed(futures):
+                try:
+                    bars = future.result()
+                except Exception:
+                    continue
+                cache_key = futures[future]
+                self._kline_cache[cache_key] = bars
+                fetched.append(pending[cache_key] + (bars,))
+        
+        self._store_ohlcv(fetched, hours)
     
-    def _get_klines(self, symbol: str, since: datetime, hours: int = 24) -> List:
+    def _get_klines(self, symbol: str, since: datetime, hours: int = 24) -> _Bars:
         """获取K线数据（带缓存）"""
         cache_key = f"{symbol}_{since.date()}"
         
         if cache_key in self._kline_cache:
             return self._kline_cache[cache_key]
         
+        since_ts = int(since.timestamp() * 1000)
+        cached = self._load_cached_ohlcv(symbol, str(since.date()), since_ts)
+        if cached is not None:
+            self._kline_cache[cache_key] = cached
+            return cached
+        
         try:
-            since_ts = int(since.timestamp() * 1000)
-            klines = self.exchange.fetch_ohlcv(
-                symbol, 
-                '1h', 
-                since=since_ts, 
-                limit=hours + 2
-            )
-            
-            self._kline_cache[cache_key] = klines
-            return klines
+            bars = self._fetch_ohlcv(symbol, since_ts, hours + 2)
+            self._kline_cache[cache_key] = bars
+            self._store_ohlcv([(symbol, str(since.date()), since_ts, bars)], hours)
+            return bars
             
         except Exception as e:
-            print(f"\n[BACKTEST] 获取K线失败 {symbol}: {e}")
-            return []
+            log.warning("[BACKTEST] 获取K线失败 %s: %s", symbol, e)
+            return _to_bars([])
+    
+    def _fetch_ohlcv(self, symbol: str, since_ts: int, limit: int) -> _Bars:
+        """
+        拉取1h K线
+        
+        U本位合约直接请求 /fapi/v1/klines（与ccxt发出的请求相同，省去ccxt的逐行解析）；
+        其他市场或关闭直连时走ccxt。
+        """
+        market_id = self._binance_market_id(symbol) if self.klines_direct else None
+        if market_id is None:
+            return _to_bars(self.exchange.fetch_ohlcv(symbol, '1h', since=since_ts, limit=limit))
+        
+        self._throttle()
+        resp = self._http.get(
+            _BINANCE_FAPI_KLINES,
+            params={"symbol": market_id, "interval": "1h", "startTime": since_ts, "limit": limit},
+            timeout=10,
+        )
+        resp.raise_for_status()
+        # 每行: [开盘时间, 开, 高, 低, 收, 量, ...]，价格为字符串
+        return _to_bars([row[:6] for row in resp.json()])
+    
+    def _binance_market_id(self, symbol: str) -> Optional[str]:
+        """symbol -> 币安U本位合约ID（按ccxt的市场解析），非U本位合约返回None"""
+        if symbol not in self._market_ids:
+            try:
+                self.exchange.load_markets()
+                market = self.exchange.market(symbol)
+                self._market_ids[symbol] = market["id"] if market.get("linear") and not market.get("spot") else None
+            except Exception:
+                self._market_ids[symbol] = None
+        return self._market_ids[symbol]
+    
+    def _throttle(self):
+        """全局请求限速（线程安全）：按 klines_rate_per_sec 均匀分配请求时刻"""
+        with self._rate_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_request_at)
+            self._next_request_at = start_at + 1.0 / self.klines_rate_per_sec
+        if start_at > now:
+            time.sleep(start_at - now)
+    
+    # ==================== K线本地缓存 ====================
+    
+    def _init_ohlcv_cache(self):
+        """打开K线缓存库（与信号库同目录的 ohlcv_cache.db），失败时只用内存缓存"""
+        cache_path = Path(self.db_path).parent / "ohlcv_cache.db"
+        try:
+            self._cache_conn = sqlite3.connect(str(cache_path), check_same_thread=False)
+            self._cache_conn.execute("""
+                CREATE TABLE IF NOT EXISTS ohlcv (
+                    symbol TEXT,
+                    day TEXT,
+                    since_ms INTEGER,
+                    payload BLOB,
+                    PRIMARY KEY (symbol, day, since_ms)
+                )
+            """)
+            self._cache_conn.commit()
+        except sqlite3.Error as e:
+            log.warning("[BACKTEST] ⚠️ K线缓存库不可用，仅使用内存缓存: %s", e)
+            self._cache_conn = None
+    
+    def _load_cached_ohlcv(self, symbol: str, day: str, since_ts: int) -> Optional[_Bars]:
+        """读取持久化的K线（int64时间戳字节 + float32高低收字节，直接还原为数组）"""
+        if self._cache_conn is None:
+            return None
+        row = self._cache_conn.execute(
+            "SELECT payload FROM ohlcv WHERE symbol = ? AND day = ? AND since_ms = ?",
+            (symbol, day, since_ts)
+        ).fetchone()
+        if row is None:
+            return None
+        n = len(row[0]) // 20  # 每根K线: 8字节时间戳 + 3×4字节价格
+        return _Bars(
+            np.frombuffer(row[0], dtype=np.int64, count=n),
+            np.frombuffer(row[0], dtype=np.float32, offset=8 * n).reshape(3, n),
+        )
+    
+    def _store_ohlcv(self, rows: List[Tuple[str, str, int, _Bars]], hours: int):
+        """
+        批量写入K线缓存（单个事务）
+        
+        只持久化完整窗口：最后一根K线已覆盖 since + hours，或返回条数达到请求上限。
+        空结果和仍在形成中的窗口（如当天信号）只留在内存缓存，下次运行重新拉取。
+        """
+        if self._cache_conn is None:
+            return
+        limit = hours + 2
+        rows = [
+            (symbol, day, since_ts, bars) for symbol, day, since_ts, bars in rows
+            if len(bars.ts) and (len(bars.ts) >= limit or int(bars.ts[-1]) >= since_ts + hours * 3600_000)
+        ]
+        if not rows:
+            return
+        try:
+            with self._cache_conn:
+                self._cache_conn.executemany(
+                    "INSERT OR REPLACE INTO ohlcv (symbol, day, since_ms, payload) VALUES (?, ?, ?, ?)",
+                    [(symbol, day, since_ts, bars.ts.tobytes() + bars.hlc.tobytes()) for symbol, day, since_ts, bars in rows]
+                )
+        except sqlite3.Error as e:
+            log.warning("[BACKTEST] ⚠️ K线缓存写入失败: %s", e)
     
     def _calculate_metrics(
         self,
-        trades: List[Trade],
+        trades: TradesSoA,
         start_date: datetime,
         end_date: datetime
     ) -> BacktestResult:
         """计算绩效指标"""
-        result = BacktestResult()
-        result.trades = trades
+        result = BacktestResult(soa=trades, initial_capital=float(self.initial_capital))
         result.total_days = (end_date - start_date).days
         
-        if not trades:
+        if not len(trades):
             return result
         
+        pnl = trades.pnl
+        n = len(trades)
+        
+        # 🔥 单次遍历融合计算：盈亏汇总、持仓时间、最大回撤、最大连亏（权益曲线不落地）
+        (total_pnl, win_sum, n_win, loss_sum, n_loss, hold_sum,
+         max_dd, max_consec) = compute_metrics(pnl, trades.hold, float(self.initial_capital))
+        
         # 基础统计
-        result.total_trades = len(trades)
-        result.winning_trades = sum(1 for t in trades if t.is_win)
-        result.losing_trades = result.total_trades - result.winning_trades
+        result.total_trades = n
+        result.winning_trades = int(n_win)
+        result.losing_trades = int(n_loss)
         
         # 胜率
-        result.win_rate = result.winning_trades / result.total_trades if result.total_trades > 0 else 0
+        result.win_rate = result.winning_trades / result.total_trades
         
         # 收益统计
-        pnls = [t.pnl_pct for t in trades]
-        result.total_pnl_pct = sum(pnls)
-        result.avg_pnl_pct = np.mean(pnls) if pnls else 0
-        
-        wins = [t.pnl_pct for t in trades if t.is_win]
-        losses = [t.pnl_pct for t in trades if not t.is_win]
-        
-        result.avg_win_pct = np.mean(wins) if wins else 0
-        result.avg_loss_pct = np.mean(losses) if losses else 0
+        result.total_pnl_pct = float(total_pnl)
+        result.avg_pnl_pct = result.total_pnl_pct / n
+        result.avg_win_pct = win_sum / n_win if n_win else 0
+        result.avg_loss_pct = loss_sum / n_loss if n_loss else 0
         
         # 盈亏比
         if result.avg_loss_pct != 0:
@@ -575,65 +920,26 @@ class Backtester:
             result.profit_loss_ratio = float('inf') if result.avg_win_pct > 0 else 0
         
         # 持仓时间
-        holding_times = [t.holding_minutes for t in trades]
-        result.avg_holding_minutes = np.mean(holding_times) if holding_times else 0
-        
-        # 权益曲线
-        equity = self.initial_capital
-        equity_curve = [equity]
-        peak = equity
-        max_dd = 0
-        
-        for trade in trades:
-            # 计算本次交易的资金变化
-            position_size = equity * 0.1  # 每次使用10%资金
-            trade_pnl = position_size * trade.pnl_pct / 100
-            equity += trade_pnl
-            equity_curve.append(equity)
-            
-            # 计算回撤
-            if equity > peak:
-                peak = equity
-            dd = (peak - equity) / peak * 100 if peak > 0 else 0
-            max_dd = max(max_dd, dd)
-        
-        result.equity_curve = equity_curve
-        result.max_drawdown_pct = max_dd
-        
-        # 日收益率（用于Sharpe计算）
-        daily_returns = []
-        trades_by_date = {}
-        for trade in trades:
-            date_key = trade.entry_time.date()
-            if date_key not in trades_by_date:
-                trades_by_date[date_key] = []
-            trades_by_date[date_key].append(trade.pnl_pct)
-        
-        for date_key in sorted(trades_by_date.keys()):
-            daily_pnl = sum(trades_by_date[date_key])
-            daily_returns.append(daily_pnl)
-        
-        result.daily_returns = daily_returns
+        result.avg_holding_minutes = hold_sum / n
+        
+        # 回撤与连亏
+        result.max_drawdown_pct = float(max_dd)
+        result.max_consecutive_losses = int(max_consec)
+        
+        # 日收益率（用于Sharpe计算）：按入场日期分组求和，日期升序
+        _, day_index = np.unique(trades.entry_us // 86_400_000_000, return_inverse=True)
+        daily_returns = np.bincount(day_index, weights=pnl)
+        
+        result._daily_returns = daily_returns
         
         # Sharpe Ratio (假设无风险利率为0)
         if len(daily_returns) > 1:
-            returns_std = np.std(daily_returns)
+            returns_std = daily_returns.std()
             if returns_std > 0:
-                result.sharpe_ratio = (np.mean(daily_returns) / returns_std) * np.sqrt(252)  # 年化
+                result.sharpe_ratio = float(daily_returns.mean() / returns_std * np.sqrt(252))  # 年化
             else:
                 result.sharpe_ratio = 0
         
-        # 最大连亏
-        max_consecutive = 0
-        current_consecutive = 0
-        for trade in trades:
-            if not trade.is_win:
-                current_consecutive += 1
-                max_consecutive = max(max_consecutive, current_consecutive)
-            else:
-                current_consecutive = 0
-        result.max_consecutive_losses = max_consecutive
-        
         return result
 
 
@@ -658,7 +964,10 @@ def run_backtest(
             config = yaml.safe_load(f)
     
     backtester = Backtester(config)
-    return backtester.run(days=days, min_score=min_score)
+    try:
+        return backtester.run(days=days, min_score=min_score)
+    finally:
+        backtester.close()
 
 
 # ==================== 测试代码 ====================
@@ -0,0 +1,272 @@
+# core/bt_kernels.py - 回测数值内核
+# 用途：回测热路径的numba内核（JIT版本）；tools/build_bt_kernels.py 以本模块为源AOT编译出 core/_bt_kernels
+
+# 🔥 numba可选：未安装时njit退化为原样返回函数（纯Python执行）
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+
+import numpy as np
+
+# AOT导出签名：函数名 -> numba类型签名
+_SCAN_SIGNATURE = "Tuple((i8, f8, i8))(i8[:], f4[:], f4[:], f4[:], f8, f8, f8, f8)"
+AOT_SIGNATURES = {
+    "scan_exit_long": _SCAN_SIGNATURE,
+    "scan_exit_short": _SCAN_SIGNATURE,
+    "compute_metrics": "Tuple((f8, f8, i8, f8, i8, f8, f8, i8))(f8[:], i4[:], f8)",
+}
+
+
+# 出场扫描（同一根K线先判止损再判止盈）
+# ts为int64毫秒，high/low/close为float32；阈值保持float64，比较时提升精度
+# 返回 (K线下标, 出场价, 原因编码)；未触发返回 (-1, 最后收盘价, 3)
+# 多空各一个内核，循环内不再判断方向
+
+@njit(cache=True)
+def scan_exit_long(ts, high, low, close, entry_ts, tp, sl, slip):
+    """多单：最低价触及止损 / 最高价触及止盈"""
+    for i in range(ts.shape[0]):
+        if ts[i] <= entry_ts:
+            continue
+        if low[i] <= sl:
+            return i, sl * (1 - slip), 1
+        if high[i] >= tp:
+            return i, tp * (1 - slip), 2
+    return -1, float(close[-1]), 3
+
+
+@njit(cache=True)
+def scan_exit_short(ts, high, low, close, entry_ts, tp, sl, slip):
+    """空单：最高价触及止损 / 最低价触及止盈"""
+    for i in range(ts.shape[0]):
+        if ts[i] <= entry_ts:
+            continue
+        if high[i] >= sl:
+            return i, sl * (1 + slip), 1
+        if low[i] <= tp:
+            return i, tp * (1 + slip), 2
+    return -1, float(close[-1]), 3
+
+
+@njit(cache=True)
+def compute_metrics(pnl, hold, initial_capital):
+    """
+    绩效指标融合内核：一次遍历pnl完成所有累加
+
+    权益按每笔使用10%资金滚动（growth *= 1 + 0.1 * pnl%），只跟踪峰值与回撤，不保存曲线
+
+    Returns:
+        (总盈亏, 盈利和, 盈利笔数, 亏损和, 亏损笔数, 持仓分钟和, 最大回撤%, 最大连亏)
+    """
+    total = win_sum = loss_sum = hold_sum = 0.0
+    n_win = n_loss = 0
+    growth = 1.0
+    peak = initial_capital
+    max_dd = 0.0
+    streak = max_streak = 0
+    for i in range(pnl.shape[0]):
+        p = pnl[i]
+        total += p
+        hold_sum += hold[i]
+        if p > 0:
+            win_sum += p
+            n_win += 1
+            streak = 0
+        else:
+            loss_sum += p
+            n_loss += 1
+            streak += 1
+            if streak > max_streak:
+                max_streak = streak
+        growth *= 1 + 0.1 * p / 100
+        equity = initial_capital * growth
+        if equity > peak:
+            peak = equity
+        if peak > 0:
+            dd = (peak - equity) / peak * 100
+            if dd > max_dd:
+                max_dd = dd
+    return total, win_sum, n_win, loss_sum, n_loss, hold_sum, max_dd, max_streak
+
+
+# NumPy版本：一次布尔掩码 + argmax 定位首根触发K线（无numba时替代逐根的纯Python循环）
+
+def _scan_exit_long_np(ts, high, low, close, entry_ts, tp, sl, slip):
+    """多单（向量化）"""
+    sl_hit = low <= sl
+    hit = (ts > entry_ts) & (sl_hit | (high >= tp))
+    if not hit.any():
+        return -1, float(close[-1]), 3
+    i = int(hit.argmax())
+    if sl_hit[i]:
+        return i, sl * (1 - slip), 1
+    return i, tp * (1 - slip), 2
+
+
+def _scan_exit_short_np(ts, high, low, close, entry_ts, tp, sl, slip):
+    """空单（向量化）"""
+    sl_hit = high >= sl
+    hit = (ts > entry_ts) & (sl_hit | (low <= tp))
+    if not hit.any():
+        return -1, float(close[-1]), 3
+    i = int(hit.argmax())
+    if sl_hit[i]:
+        return i, sl * (1 + slip), 1
+    return i, tp * (1 + slip), 2
+
+
+def _max_drawdown_pct(equity):
+    """权益曲线的最大回撤%（相对历史最高点）"""
+    peak = np.maximum.accumulate(equity)
+    drawdown = peak - equity
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown /= peak
+    drawdown *= 100
+    drawdown[peak <= 0] = 0.0
+    return float(drawdown.max())
+
+
+def _max_run(mask):
+    """布尔数组中最长连续True段的长度（游程编码）"""
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    runs = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+    return int(runs.max()) if runs.size else 0
+
+
+def equity_curve(pnl, initial_capital):
+    """权益曲线（长度n+1，首项为初始资金），与compute_metrics的滚动方式一致"""
+    equity = np.empty(len(pnl) + 1, dtype=np.float64)
+    equity[0] = initial_capital
+    equity[1:] = initial_capital * np.cumprod(1 + 0.1 * pnl / 100)
+    return equity
+
+
+def _compute_metrics_np(pnl, hold, initial_capital):
+    """绩效指标（向量化，与compute_metrics返回值一致）"""
+    win_mask = pnl > 0
+    n_win = int(np.count_nonzero(win_mask))
+    return (
+        float(pnl.sum()), float(pnl.sum(where=win_mask)), n_win,
+        float(pnl.sum(where=~win_mask)), len(pnl) - n_win, float(hold.sum()),
+        _max_drawdown_pct(equity_curve(pnl, initial_capital)), _max_run(~win_mask),
+    )
+
+
+if not NUMBA_AVAILABLE:
+    scan_exit_long = _scan_exit_long_np
+    scan_exit_short = _scan_exit_short_np
+    compute_metrics = _compute_metrics_np
+
+
+# ==================== ISO时间解析 ====================
+
+ISO_PARSE_FAIL = -(2 ** 63) + 1  # 解析失败标记（调用方对这些行回退到datetime.fromisoformat）
+
+AOT_SIGNATURES["parse_iso_us"] = "void(u1[:, :], i8[:])"
+
+
+@njit(cache=True)
+def _days_from_civil(y, m, d):
+    """公历日期 -> 1970-01-01起的天数（Howard Hinnant算法）"""
+    if m <= 2:
+        y -= 1
+    era = (y if y >= 0 else y - 399) // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+@njit(cache=True)
+def _digits(row, start, count):
+    """row[start:start+count] 按十进制数字解析，含非数字返回-1"""
+    value = 0
+    for j in range(start, start + count):
+        c = row[j]
+        if c < 48 or c > 57:
+            return -1
+        value = value * 10 + (c - 48)
+    return value
+
+
+@njit(cache=True)
+def parse_iso_us(buf, out):
+    """
+    批量解析ISO时间 -> UTC微秒时间戳
+
+    buf为 (N, W) uint8（定长ASCII，右侧0填充），支持：
+    YYYY-MM-DD[(T| )HH:MM:SS[.f{1,6}]][Z|±HH:MM]，无时区按UTC；
+    其他格式或非法日期写入 ISO_PARSE_FAIL
+    """
+    width = buf.shape[1]
+    for i in range(buf.shape[0]):
+        row = buf[i]
+        out[i] = ISO_PARSE_FAIL
+        if width < 10 or row[4] != 45 or row[7] != 45:  # '-'
+            continue
+        y = _digits(row, 0, 4)
+        m = _digits(row, 5, 2)
+        d = _digits(row, 8, 2)
+        if y < 1 or m < 1 or m > 12 or d < 1:
+            continue
+        leap = y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)
+        if m == 2:
+            dim = 29 if leap else 28
+        elif m == 4 or m == 6 or m == 9 or m == 11:
+            dim = 30
+        else:
+            dim = 31
+        if d > dim:
+            continue
+
+        hh = mi = ss = frac = offset = 0
+        pos = 10
+        if pos < width and row[pos] != 0:
+            # 时间部分
+            if row[pos] != 84 and row[pos] != 32:  # 'T' / ' '
+                continue
+            if width < 19 or row[13] != 58 or row[16] != 58:  # ':'
+                continue
+            hh = _digits(row, 11, 2)
+            mi = _digits(row, 14, 2)
+            ss = _digits(row, 17, 2)
+            if hh < 0 or hh > 23 or mi < 0 or mi > 59 or ss < 0 or ss > 59:
+                continue
+            pos = 19
+            if pos < width and row[pos] == 46:  # '.'
+                pos += 1
+                n_frac = 0
+                while pos < width and 48 <= row[pos] <= 57 and n_frac < 6:
+                    frac = frac * 10 + (row[pos] - 48)
+                    n_frac += 1
+                    pos += 1
+                if n_frac == 0:
+                    continue
+                for _ in range(6 - n_frac):
+                    frac *= 10
+            if pos < width and row[pos] == 90:  # 'Z'
+                pos += 1
+            elif pos < width and (row[pos] == 43 or row[pos] == 45):  # '+' / '-'
+                if pos + 6 > width or row[pos + 3] != 58:
+                    continue
+                oh = _digits(row, pos + 1, 2)
+                om = _digits(row, pos + 4, 2)
+                if oh < 0 or oh > 23 or om < 0 or om > 59:
+                    continue
+                offset = (oh * 60 + om) * 60
+                if row[pos] == 45:
+                    offset = -offset
+                pos += 6
+        if pos < width and row[pos] != 0:
+            continue  # 尾部有多余字符
+
+        seconds = _days_from_civil(y, m, d) * 86400 + hh * 3600 + mi * 60 + ss - offset
+        out[i] = seconds * 1000000 + frac
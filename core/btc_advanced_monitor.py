@@ -8,139 +8,381 @@ btc_advanced_monitor.py - 增强版BTC市场监控 (网络容错版)
 新增: BTC Dominance监控（1小时更新一次）
 🆕 新增: 网络重试机制 + 缓存降级，提高稳定性
 """
-import pandas as pd
+import json
+import os
+import ccxt
 import numpy as np
 import requests
+import threading
 import time
-from typing import Dict, Any, List, Tuple, Optional
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, List, NamedTuple, Tuple, Optional, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 🔥 fcntl仅POSIX可用：不可用时令牌桶退化为单进程（无文件锁）
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+from core.bt_kernels import NUMBA_AVAILABLE, njit
+from core.utils import json_loads
+
+# 🔧 内存缓存的 timestamp 统一为 time.monotonic() 秒（不受系统时钟调整影响）；
+#    落盘时换算成墙上时钟，恢复时再换算回来
 
 # 🆕 Dominance 缓存（1小时有效）
 _DOMINANCE_CACHE = {
     "data": None,
     "timestamp": 0,
-    "ttl": 3600  # 1小时 = 3600秒
+    "ttl": 3600,  # 1小时 = 3600秒
+    "min_interval": 60,  # 两次API请求的最小间隔（含失败的请求），避免429
+    "last_request": float("-inf"),  # monotonic秒（开机不足60秒时monotonic可能小于min_interval）
+    "disk_file": "btc_dominance.json",
+    "disk_max_age": 86400  # 重启时只恢复1天内的磁盘缓存（过期部分按stale返回并后台刷新）
 }
 
+# 🆕 Dominance 后台刷新：过期后先返回旧值，同一时间只有一个刷新线程
+_DOMINANCE_REFRESH_LOCK = threading.Lock()
+_DOMINANCE_REFRESHING = False
+
+# 🆕 CoinGecko 长连接会话：复用TLS连接；429/5xx由urllib3按指数退避重试（遵守Retry-After）
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(["GET"]),
+    raise_on_status=False  # 重试耗尽后返回最后一次响应，由调用方按状态码处理
+)))
+
 # 🆕 BTC数据缓存（用于网络失败时的降级）
 _BTC_DATA_CACHE = {
     "data": None,
     "timestamp": 0,
-    "ttl": 300  # 缓存有效期5分钟，超过后标记为过期但仍可降级使用
+    "ttl": 300,  # 缓存有效期5分钟，超过后标记为过期但仍可降级使用
+    "disk_file": "btc_status.json",
+    "disk_max_age": 3600  # 重启时只恢复1小时内的降级数据
 }
 
+# 🆕 磁盘缓存目录：进程重启后恢复上面两个缓存，避免冷启动时集中请求API
+_DISK_CACHE_DIR = "data/cache"
+
+
+def _save_disk_cache(cache: Dict[str, Any]) -> None:
+    """缓存写入磁盘（先写临时文件再替换，其他进程不会读到半个文件）"""
+    path = os.path.join(_DISK_CACHE_DIR, cache["disk_file"])
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(_DISK_CACHE_DIR, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            wall_ts = time.time() - (time.monotonic() - cache["timestamp"])
+            json.dump({"data": dict(cache["data"]), "timestamp": wall_ts}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"[BTC_ADV] ⚠️ 磁盘缓存写入失败({cache['disk_file']}): {e}")
+
+
+def _load_disk_cache(cache: Dict[str, Any]) -> None:
+    """启动时从磁盘恢复缓存（文件不存在、损坏或超过disk_max_age时忽略）"""
+    path = os.path.join(_DISK_CACHE_DIR, cache["disk_file"])
+    if not os.path.exists(path):
+        return
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        age = time.time() - saved["timestamp"]
+        if saved.get("data") and age < cache["disk_max_age"]:
+            # JSON里的数组还原为元组，保持快照内部同样不可变
+            cache["data"] = MappingProxyType({
+                k: tuple(v) if isinstance(v, list) else v for k, v in saved["data"].items()
+            })
+            cache["timestamp"] = time.monotonic() - max(0.0, age)
+    except Exception:
+        pass
 
-def calculate_rsi(series: pd.Series, period: int = 14) -> pd.Series:
-    """计算RSI指标"""
-    delta = series.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
 
+_load_disk_cache(_DOMINANCE_CACHE)
+_load_disk_cache(_BTC_DATA_CACHE)
 
-def get_btc_dominance(coingecko_api_key: str = "") -> Dict[str, Any]:
+# 🆕 CoinGecko 跨进程令牌桶（免费档30次/分钟）：状态存文件，flock保证多个进程串行读写
+_COINGECKO_BUCKET = {
+    "file": "coingecko_bucket.json",
+    "capacity": 30,
+    "refill_per_sec": 0.5
+}
+
+
+def _take_coingecko_token() -> bool:
     """
-    🆕 获取BTC市场占比（Dominance）
-    使用1小时缓存，减少API调用
-    
+    从令牌桶取一个令牌
+
     Returns:
-        {
-            "dominance": 58.5,           # BTC市场占比 (%)
-            "dominance_change_24h": 0.3, # 24小时变化 (%)
-            "market_cap": 1200000000000, # BTC市值 ($)
-            "total_market_cap": 2050000000000,  # 总市值 ($)
-            "cached": True/False         # 是否使用缓存
-        }
+        True表示可以请求；桶文件读写异常时放行，不因限流器故障阻断数据更新
     """
-    global _DOMINANCE_CACHE
-    
-    now = time.time()
-    
-    # 检查缓存
-    if (_DOMINANCE_CACHE["data"] is not None and 
-        now - _DOMINANCE_CACHE["timestamp"] < _DOMINANCE_CACHE["ttl"]):
-        data = _DOMINANCE_CACHE["data"].copy()
-        data["cached"] = True
-        data["cache_age_sec"] = int(now - _DOMINANCE_CACHE["timestamp"])
-        return data
-    
-    # 调用 CoinGecko API
+    bucket = _COINGECKO_BUCKET
+    path = os.path.join(_DISK_CACHE_DIR, bucket["file"])
+    try:
+        os.makedirs(_DISK_CACHE_DIR, exist_ok=True)
+        with open(path, "a+", encoding="utf-8") as f:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                state = json.loads(raw) if raw else {"tokens": bucket["capacity"], "ts": 0}
+                now = time.time()  # 跨进程共享，只能用墙上时钟
+                elapsed = max(0.0, now - state["ts"])
+                tokens = min(bucket["capacity"], state["tokens"] + elapsed * bucket["refill_per_sec"])
+                granted = tokens >= 1
+                if granted:
+                    tokens -= 1
+                f.seek(0)
+                f.truncate()
+                json.dump({"tokens": tokens, "ts": now}, f)
+                f.flush()
+                return granted
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+    except Exception as e:
+        print(f"[BTC_DOM] ⚠️ 令牌桶读写失败，放行本次请求: {e}")
+        return True
+
+
+# 🆕 按K线时间戳缓存的分析结果（同一根1分钟K线内重复调用直接复用）
+_ANALYSIS_CACHE = {
+    "ts": None,         # 分析时最后一根K线的开盘时间(ms)
+    "result": None,
+    "timestamp": 0
+}
+
+# 🆕 RSI增量状态：截至最后一根已收盘K线的Wilder均值，新K线只递推增量部分
+_RSI_STATE = {
+    "ts": None,         # 已计入状态的最后一根K线开盘时间(ms)
+    "close": 0.0,       # 该K线收盘价（用于校验数据是否被修订）
+    "avg_gain": 0.0,
+    "avg_loss": 0.0
+}
+
+# 🆕 成交量均线增量状态：截至最后一根已收盘K线的 VOLUME_MA_WINDOW-1 根成交量之和
+_VOLUME_STATE = {
+    "ts": None,         # 已计入状态的最后一根K线开盘时间(ms)
+    "volume": 0.0,      # 该K线成交量（用于校验数据是否被修订）
+    "sum": 0.0
+}
+
+RSI_PERIOD = 14
+VOLUME_MA_WINDOW = 20
+SR_LOOKBACK = 60
+VOLATILITY_WINDOW = 60
+
+
+@njit(cache=True, fastmath=True)
+def _rma_update(close, avg_gain, avg_loss, period):
+    """Wilder RMA递推：从close[0]开始，逐根计入close[1:]的涨跌幅"""
+    # 涨跌拆分用np.maximum（无分支，可向量化），递推本身是串行的
+    delta = np.diff(close)
+    gains = np.maximum(delta, 0.0)
+    losses = np.maximum(-delta, 0.0)
+    for i in range(delta.shape[0]):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+    return avg_gain, avg_loss
+
+
+@njit(cache=True, fastmath=True)
+def _rma_seed(close, period):
+    """
+    Wilder RMA（alpha=1/period，与TradingView一致）
+
+    首个均值取前period个涨跌幅的简单平均，之后 avg = (avg*(n-1) + x) / n
+    """
+    delta = np.diff(close[:period + 1])
+    avg_gain = np.maximum(delta, 0.0).sum() / period
+    avg_loss = np.maximum(-delta, 0.0).sum() / period
+    return _rma_update(close[period:], avg_gain, avg_loss, period)
+
+
+def _rsi_from_rma(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else 50.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+def calculate_rsi(close: np.ndarray, period: int = RSI_PERIOD) -> float:
+    """计算RSI指标（Wilder RMA），只返回最后一根的值；K线不足period+1根时返回中性值50"""
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    if close.shape[0] <= period:
+        return 50.0
+    return _rsi_from_rma(*_rma_seed(close, period))
+
+
+def _rsi_state(ts: np.ndarray, close: np.ndarray, period: int = RSI_PERIOD) -> Tuple[float, float]:
+    """
+    🆕 增量RSI状态：返回截至最后一根已收盘K线（close[-2]）的Wilder均值
+
+    新到K线只做递推；状态中的K线已滑出窗口或收盘价被修订时全量重算。
+    最后一根未收盘K线由调用方临时计入，不写回状态。要求 len(close) > period+1
+    """
+    n = close.shape[0]
+    state = _RSI_STATE
+    start = -1
+    if state["ts"] is not None:
+        idx = int(np.searchsorted(ts, state["ts"]))
+        if idx < n - 1 and ts[idx] == state["ts"] and close[idx] == state["close"]:
+            start = idx
+
+    if start >= 0:
+        avg_gain, avg_loss = _rma_update(close[start:n - 1], state["avg_gain"], state["avg_loss"], period)
+    else:
+        avg_gain, avg_loss = _rma_seed(close[:n - 1], period)
+
+    state["ts"] = int(ts[n - 2])
+    state["close"] = float(close[n - 2])
+    state["avg_gain"] = avg_gain
+    state["avg_loss"] = avg_loss
+    return avg_gain, avg_loss
+
+
+def _fetch_btc_dominance(coingecko_api_key: str) -> Optional[MappingProxyType]:
+    """
+    调用 CoinGecko /global 获取BTC Dominance，成功时写入缓存
+
+    Returns:
+        最新数据的只读快照，失败返回None
+    """
+    _DOMINANCE_CACHE["last_request"] = time.monotonic()
+    if not _take_coingecko_token():
+        print("[BTC_DOM] ⏳ CoinGecko令牌桶已空（多进程共享限额），本次使用旧缓存")
+        return None
     try:
         url = "https://api.coingecko.com/api/v3/global"
         headers = {}
         if coingecko_api_key:
             headers["x-cg-demo-api-key"] = coingecko_api_key
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _SESSION.get(url, headers=headers, timeout=10)
         
         if response.status_code == 429:
-            print("[BTC_DOM] ⚠️ CoinGecko API限流，使用旧缓存")
-            if _DOMINANCE_CACHE["data"]:
-                return _DOMINANCE_CACHE["data"]
-            return {"dominance": 0, "dominance_change_24h": 0, "cached": False}
+            print("[BTC_DOM] ⚠️ CoinGecko API限流（重试后仍失败），使用旧缓存")
+            return None
         
         if response.status_code != 200:
             print(f"[BTC_DOM] ⚠️ API返回错误码: {response.status_code}")
-            if _DOMINANCE_CACHE["data"]:
-                return _DOMINANCE_CACHE["data"]
-            return {"dominance": 0, "dominance_change_24h": 0, "cached": False}
+            return None
         
-        data = response.json()
+        data = json_loads(response.content)
         global_data = data.get("data", {})
         
         # 提取 BTC Dominance
         market_cap_percentage = global_data.get("market_cap_percentage", {})
         btc_dominance = market_cap_percentage.get("btc", 0)
         
-        # 提取市值数据
-        market_cap_btc = global_data.get("market_cap", {}).get("btc", 0)
-        total_market_cap = global_data.get("total_market_cap", {}).get("usd", 0)
-        
         # 计算24小时变化（通过市值变化推算）
         market_cap_change_24h = global_data.get("market_cap_change_percentage_24h_usd", 0)
         
+        # 只保留下游用到的字段（缓存/落盘的就是这份）
         result = {
             "dominance": round(btc_dominance, 2),
             "dominance_change_24h": round(market_cap_change_24h * 0.1, 2),  # 粗略估算
-            "market_cap": market_cap_btc,
-            "total_market_cap": total_market_cap,
             "cached": False,
-            "cache_age_sec": 0,
-            "timestamp": now
+            "timestamp": time.time()  # 墙上时钟，仅供展示
         }
         
-        # 更新缓存
-        _DOMINANCE_CACHE["data"] = result
-        _DOMINANCE_CACHE["timestamp"] = now
+        # 更新缓存（只读快照，读取方不必再复制）
+        snapshot = MappingProxyType(result)
+        _DOMINANCE_CACHE["data"] = snapshot
+        _DOMINANCE_CACHE["timestamp"] = time.monotonic()  # 请求完成时刻（可能在后台线程）
+        _save_disk_cache(_DOMINANCE_CACHE)
         
         print(f"[BTC_DOM] ✅ 更新成功: {btc_dominance:.2f}% (下次更新: 1小时后)")
         
-        return result
+        return snapshot
         
     except Exception as e:
         print(f"[BTC_DOM] ⚠️ 获取失败: {e}")
-        # 返回旧缓存或默认值
-        if _DOMINANCE_CACHE["data"]:
-            return _DOMINANCE_CACHE["data"]
-        return {"dominance": 0, "dominance_change_24h": 0, "cached": False}
+        return None
 
 
-def analyze_momentum(df: pd.DataFrame) -> Dict[str, Any]:
-    """
-    分析价格动量
+def _refresh_btc_dominance(coingecko_api_key: str) -> None:
+    """后台刷新线程入口"""
+    global _DOMINANCE_REFRESHING
+    try:
+        _fetch_btc_dominance(coingecko_api_key)
+    finally:
+        with _DOMINANCE_REFRESH_LOCK:
+            _DOMINANCE_REFRESHING = False
+
+
+def get_btc_dominance(coingecko_api_key: str = "", now: Optional[float] = None) -> Dict[str, Any]:
     """
-    if len(df) < 20:
-        return {
-            "momentum_15m": 0, "momentum_5m": 0, "momentum_1m": 0,
-            "is_weakening": False, "acceleration": 0
+    🆕 获取BTC市场占比（Dominance）
+    使用1小时缓存，减少API调用
+    🆕 stale-while-revalidate: 缓存过期时立即返回旧值并在后台线程刷新，只有冷启动会阻塞
+    
+    Returns:
+        {
+            "dominance": 58.5,           # BTC市场占比 (%)
+            "dominance_change_24h": 0.3, # 24小时变化 (%)
+            "cached": True/False,        # 是否使用缓存
+            "stale": True/False          # 缓存已过期（后台刷新中）
         }
+
+    Args:
+        now: 调用方取好的 time.monotonic()，None时自行获取
+    """
+    global _DOMINANCE_REFRESHING
+    
+    if now is None:
+        now = time.monotonic()
+    can_request = now - _DOMINANCE_CACHE["last_request"] >= _DOMINANCE_CACHE["min_interval"]
+    
+    # 冷启动：没有任何缓存，只能同步请求
+    if _DOMINANCE_CACHE["data"] is None:
+        result = _fetch_btc_dominance(coingecko_api_key) if can_request else None
+        if result is None:
+            return {"dominance": 0, "dominance_change_24h": 0, "cached": False}
+        return dict(result)
+    
+    age = now - _DOMINANCE_CACHE["timestamp"]
+    stale = age >= _DOMINANCE_CACHE["ttl"]
     
-    price_now = float(df['close'].iloc[-1])
-    price_15m = float(df['close'].iloc[-15])
-    price_5m = float(df['close'].iloc[-5])
-    price_1m = float(df['close'].iloc[-2]) if len(df) >= 2 else price_now
+    # 缓存过期：启动后台刷新（已在刷新或距上次请求不足min_interval时跳过）
+    if stale and can_request:
+        with _DOMINANCE_REFRESH_LOCK:
+            start = not _DOMINANCE_REFRESHING
+            _DOMINANCE_REFRESHING = True
+        if start:
+            threading.Thread(
+                target=_refresh_btc_dominance, args=(coingecko_api_key,),
+                daemon=True, name="BTC-DOM-Refresh"
+            ).start()
     
+    # 快照只读：直接展开并叠加缓存状态字段，不再先copy再逐个赋值
+    return {**_DOMINANCE_CACHE["data"], "cached": True, "stale": stale, "cache_age_sec": int(age)}
+
+
+# 🔧 反转原因编码：山寨币过滤按编码判断，不再对文案做子串匹配
+# RSI_OB/RSI_HIGH/RSI_OS/RSI_LOW: RSI超买/偏高/超卖/偏低  MOM_WEAK: 动势衰竭
+# NEAR_RES/NEAR_SUP: 接近阻力/支撑位  VOL_OB/VOL_OS: 放量+超买/超卖  BLOCK: ⛔暂停标记
+_ALTCOIN_EXCLUDED_REASONS = frozenset({"NEAR_RES", "NEAR_SUP", "BLOCK"})
+
+# 🔥 主入口用到的全部收盘价位置（当前/1/5/15/60/240根前），一次花式索引取出
+_PRICE_OFFSETS = [-1, -2, -5, -15, -60, -240]
+
+# 🔧 主入口的K线数量门槛：不足MIN_BARS直接降级；不足BARS_4H时不计算4小时涨跌（避免负下标回绕）
+MIN_BARS = 100
+BARS_4H = 240
+
+
+def analyze_momentum(price_now: float, price_15m: float, price_5m: float, price_1m: float) -> Dict[str, Any]:
+    """
+    分析价格动量（参数为当前价与15/5/1分钟前的收盘价）
+    """
     momentum_15m = (price_now - price_15m) / price_15m * 100
     momentum_5m = (price_now - price_5m) / price_5m * 100
     momentum_1m = (price_now - price_1m) / price_1m * 100
@@ -161,15 +403,32 @@ def analyze_momentum(df: pd.DataFrame) -> Dict[str, Any]:
     }
 
 
-def find_support_resistance(df: pd.DataFrame, lookback: int = 60) -> Dict[str, Any]:
+def _quantile(arr: np.ndarray, q: float) -> float:
     """
-    识别支撑位和阻力位
+    线性插值分位数（与pandas quantile默认口径一致）
+
+    np.partition只把相邻两个次序统计量放到位（O(N)选择），不做全排序
     """
-    recent_df = df.tail(lookback)
-    support = float(recent_df['low'].quantile(0.2))
-    resistance = float(recent_df['high'].quantile(0.8))
-    price_now = float(df['close'].iloc[-1])
-    
+    pos = (arr.shape[0] - 1) * q
+    lo = int(pos)
+    if lo + 1 >= arr.shape[0]:
+        return float(np.partition(arr, lo)[lo])
+    part = np.partition(arr, (lo, lo + 1))
+    return float(part[lo] + (part[lo + 1] - part[lo]) * (pos - lo))
+
+
+def find_support_resistance(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, lookback: int = 60
+) -> Dict[str, Any]:
+    """
+    识别支撑位和阻力位（最近lookback根最低价的20%分位 / 最高价的80%分位）
+    """
+    support = _quantile(low[-lookback:], 0.2)
+    resistance = _quantile(high[-lookback:], 0.8)
+    return _sr_levels(support, resistance, float(close[-1]))
+
+
+def _sr_levels(support: float, resistance: float, price_now: float) -> Dict[str, Any]:
     distance_to_support_pct = (price_now - support) / price_now * 100
     distance_to_resistance_pct = (resistance - price_now) / price_now * 100
     
@@ -187,88 +446,240 @@ def find_support_resistance(df: pd.DataFrame, lookback: int = 60) -> Dict[str, A
     }
 
 
-def detect_volume_spike(df: pd.DataFrame) -> Dict[str, Any]:
+def _volume_sum_state(ts: np.ndarray, volume: np.ndarray, window: int = VOLUME_MA_WINDOW) -> float:
+    """
+    🆕 增量均量状态：返回最后window-1根已收盘K线的成交量之和（不含未收盘K线）
+
+    新收盘K线滑动窗口时加入新值、移出最旧值；
+    状态失效（锚点K线不在窗口内或成交量被修订）时对尾部切片重新求和。要求 len(volume) >= window
+    """
+    n = volume.shape[0]
+    state = _VOLUME_STATE
+    total = None
+    if state["ts"] is not None:
+        idx = int(np.searchsorted(ts, state["ts"]))
+        if idx < n - 1 and ts[idx] == state["ts"] and volume[idx] == state["volume"] and idx >= window - 1:
+            total = state["sum"]
+            for i in range(idx + 1, n - 1):
+                total += volume[i] - volume[i - window + 1]
+    if total is None:
+        total = float(volume[n - window:n - 1].sum())
+
+    state["ts"] = int(ts[n - 2])
+    state["volume"] = float(volume[n - 2])
+    state["sum"] = total
+    return total
+
+
+def _volume_spike(volume_ratio: float) -> Dict[str, Any]:
+    return {
+        "volume_ratio": round(volume_ratio, 2), 
+        "is_spike": volume_ratio > 1.5
+    }
+
+
+def detect_volume_spike(volume: np.ndarray) -> Dict[str, Any]:
     """
     检测成交量异常
     """
-    if len(df) < 20: 
+    if len(volume) < VOLUME_MA_WINDOW: 
         return {"volume_ratio": 1.0, "is_spike": False}
     
-    volume_ma = float(df['volume'].rolling(20).mean().iloc[-1])
-    current_volume = float(df['volume'].iloc[-1])
+    volume_ma = float(volume[-VOLUME_MA_WINDOW:].mean())
+    current_volume = float(volume[-1])
     
     volume_ratio = current_volume / volume_ma if volume_ma > 0 else 1.0
-    return {
-        "volume_ratio": round(volume_ratio, 2), 
-        "is_spike": volume_ratio > 1.5
-    }
+    return _volume_spike(volume_ratio)
+
+
+# ==================== 融合指标内核 ====================
+
+class _Indicators(NamedTuple):
+    """一次计算得到的全部数组类指标（动量只是几次取值，不在此列）"""
+    rsi: float
+    volume_ratio: float
+    volatility: float      # 最近60根1分钟收益率的总体标准差（小数，ddof=0）
+    support: float
+    resistance: float
+
+
+@njit(cache=True)
+def _interp_quantile(sorted_arr, q):
+    pos = (sorted_arr.shape[0] - 1) * q
+    lo = int(pos)
+    if lo + 1 >= sorted_arr.shape[0]:
+        return sorted_arr[lo]
+    return sorted_arr[lo] + (sorted_arr[lo + 1] - sorted_arr[lo]) * (pos - lo)
+
+
+@njit(cache=True)
+def _fused_indicators(high, low, close, volume, avg_gain, avg_loss, volume_sum,
+                      period, window, lookback, vol_window):
+    """
+    RSI收尾 + 均量比 + 波动率 + 支撑阻力，一次调用完成
+
+    avg_gain/avg_loss/volume_sum 为截至最后一根已收盘K线的状态（见 _rsi_state / _volume_sum_state），
+    内核只计入最后一根未收盘K线；其余指标直接在尾部窗口上计算。要求 len(close) >= max(period+2, window)
+    """
+    n = close.shape[0]
+
+    # RSI：在已收盘状态上计入最后一根
+    delta = close[n - 1] - close[n - 2]
+    g = (avg_gain * (period - 1) + max(delta, 0.0)) / period
+    l = (avg_loss * (period - 1) + max(-delta, 0.0)) / period
+    if l == 0:
+        rsi = 100.0 if g > 0 else 50.0
+    else:
+        rsi = 100.0 - 100.0 / (1.0 + g / l)
+
+    # 均量比
+    volume_ma = (volume_sum + volume[n - 1]) / window
+    volume_ratio = volume[n - 1] / volume_ma if volume_ma > 0 else 1.0
+
+    # 波动率：最近vol_window个收益率的总体标准差（两遍法，ddof=0）
+    m = min(vol_window, n - 1)
+    mean = 0.0
+    for i in range(n - m, n):
+        mean += (close[i] - close[i - 1]) / close[i - 1]
+    mean /= m
+    var = 0.0
+    for i in range(n - m, n):
+        d = (close[i] - close[i - 1]) / close[i - 1] - mean
+        var += d * d
+    volatility = np.sqrt(var / m)
+
+    # 支撑/阻力：窗口只有lookback根，直接排序副本取插值分位
+    k = min(lookback, n)
+    support = _interp_quantile(np.sort(low[n - k:]), 0.2)
+    resistance = _interp_quantile(np.sort(high[n - k:]), 0.8)
+
+    return rsi, volume_ratio, volatility, support, resistance
+
+
+def _fused_indicators_np(high, low, close, volume, avg_gain, avg_loss, volume_sum,
+                         period, window, lookback, vol_window):
+    """融合内核的NumPy版本（无numba时替代逐元素的纯Python循环），返回值一致"""
+    rsi = _rsi_from_rma(*_rma_update(close[-2:], avg_gain, avg_loss, period))
+    volume_ma = (volume_sum + volume[-1]) / window
+    volume_ratio = volume[-1] / volume_ma if volume_ma > 0 else 1.0
+    tail = close[-(vol_window + 1):]
+    volatility = (np.diff(tail) / tail[:-1]).std()
+    return (
+        rsi, volume_ratio, volatility,
+        _quantile(low[-lookback:], 0.2), _quantile(high[-lookback:], 0.8),
+    )
+
+
+if not NUMBA_AVAILABLE:
+    _fused_indicators = _fused_indicators_np
+
+
+def compute_indicators(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+    ts: Optional[np.ndarray] = None
+) -> _Indicators:
+    """
+    计算反转分析用到的全部数组类指标
+
+    Args:
+        high/low/close/volume: K线各列的float64数组
+        ts: K线开盘时间(ms)；传入时RSI/均量走增量状态（同一序列的连续调用），否则全量计算
+    """
+    n = close.shape[0]
+    if n < max(RSI_PERIOD + 2, VOLUME_MA_WINDOW):
+        # K线过少：逐项计算，各自按原口径给中性值
+        tail = close[-(VOLATILITY_WINDOW + 1):]
+        volatility = float((np.diff(tail) / tail[:-1]).std()) if n > 1 else 0.0
+        return _Indicators(
+            calculate_rsi(close), detect_volume_spike(volume)["volume_ratio"], volatility,
+            _quantile(low[-SR_LOOKBACK:], 0.2), _quantile(high[-SR_LOOKBACK:], 0.8),
+        )
+
+    if ts is not None:
+        avg_gain, avg_loss = _rsi_state(ts, close)
+        volume_sum = _volume_sum_state(ts, volume)
+    else:
+        avg_gain, avg_loss = _rma_seed(close[:-1], RSI_PERIOD)
+        volume_sum = float(volume[-VOLUME_MA_WINDOW:-1].sum())
+
+    values = _fused_indicators(
+        high, low, close, volume, avg_gain, avg_loss, volume_sum,
+        RSI_PERIOD, VOLUME_MA_WINDOW, SR_LOOKBACK, VOLATILITY_WINDOW
+    )
+    return _Indicators(*(float(v) for v in values))
 
 
 def analyze_btc_reversal_risk(
-    df: pd.DataFrame, change_1h: float, change_4h: float
+    current_rsi: float, momentum: Dict[str, Any], sr: Dict[str, Any], volume: Dict[str, Any],
+    change_1h: float
 ) -> Dict[str, Any]:
     """
     综合分析BTC反转风险
     🔧 修复: RSI阈值优化 (25/30/70/75)
+    🔧 只做阈值判断与文案组装，指标由调用方一次算好传入
+
+    Args:
+        current_rsi: 最新RSI
+        momentum: analyze_momentum 的结果
+        sr: 支撑阻力（_sr_levels 的结果）
+        volume: 成交量异常（_volume_spike 的结果）
+        change_1h: 1小时涨跌（小数）
+
+    Returns:
+        reversal_reasons 为 (原因编码, 文案) 列表，编码见 _ALTCOIN_EXCLUDED_REASONS 上方说明
     """
-    rsi_series = calculate_rsi(df['close'])
-    current_rsi = float(rsi_series.iloc[-1])
-    momentum = analyze_momentum(df)
-    sr = find_support_resistance(df)
-    volume = detect_volume_spike(df)
-    
     reversal_risk = "none"
-    reversal_reasons = []
+    reversal_reasons = []  # (原因编码, 文案)
     
     # 🔧 核心修改: 上涨时的RSI检查 (阈值调整)
     if change_1h > 0:
         # 只有真正极端的RSI才触发HIGH风险
         if current_rsi > 75:  # ✅ 从70改为75
             reversal_risk = "high"
-            reversal_reasons.append(f"RSI超买({current_rsi:.1f})")
+            reversal_reasons.append(("RSI_OB", f"RSI超买({current_rsi:.1f})"))
         elif current_rsi > 70:  # ✅ 从65改为70
             reversal_risk = "medium" if reversal_risk == "none" else reversal_risk
-            reversal_reasons.append(f"RSI偏高({current_rsi:.1f})")
+            reversal_reasons.append(("RSI_HIGH", f"RSI偏高({current_rsi:.1f})"))
         
         # 动势衰竭检查
         if momentum.get("is_weakening"):
             reversal_risk = "medium" if reversal_risk == "none" else "high"
-            reversal_reasons.append("涨势衰竭")
+            reversal_reasons.append(("MOM_WEAK", "涨势衰竭"))
         
         # 阻力位检查
         if sr.get("near_resistance"):
             reversal_risk = "medium" if reversal_risk == "none" else "high"
-            reversal_reasons.append(f"接近阻力位({sr['resistance']:.0f})")
+            reversal_reasons.append(("NEAR_RES", f"接近阻力位({sr['resistance']:.0f})"))
         
         # 放量+超买组合(顶部信号) - 阈值也调整为70
         if volume.get("is_spike") and current_rsi > 70:  # ✅ 从65改为70
             reversal_risk = "high"
-            reversal_reasons.append("放量+超买(疑似顶部)")
+            reversal_reasons.append(("VOL_OB", "放量+超买(疑似顶部)"))
     
     # 🔧 核心修改: 下跌时的RSI检查 (阈值调整)
     elif change_1h < 0:
         # 只有真正极端的RSI才触发HIGH风险
         if current_rsi < 25:  # ✅ 从30改为25
             reversal_risk = "high"
-            reversal_reasons.append(f"RSI超卖({current_rsi:.1f})")
+            reversal_reasons.append(("RSI_OS", f"RSI超卖({current_rsi:.1f})"))
         elif current_rsi < 30:  # ✅ 从35改为30
             reversal_risk = "medium" if reversal_risk == "none" else reversal_risk
-            reversal_reasons.append(f"RSI偏低({current_rsi:.1f})")
+            reversal_reasons.append(("RSI_LOW", f"RSI偏低({current_rsi:.1f})"))
         
         # 动势衰竭检查
         if momentum.get("is_weakening"):
             reversal_risk = "medium" if reversal_risk == "none" else "high"
-            reversal_reasons.append("跌势衰竭")
+            reversal_reasons.append(("MOM_WEAK", "跌势衰竭"))
         
         # 支撑位检查
         if sr.get("near_support"):
             reversal_risk = "medium" if reversal_risk == "none" else "high"
-            reversal_reasons.append(f"接近支撑位({sr['support']:.0f})")
+            reversal_reasons.append(("NEAR_SUP", f"接近支撑位({sr['support']:.0f})"))
         
         # 放量+超卖组合(底部信号) - 阈值也调整为30
         if volume.get("is_spike") and current_rsi < 30:  # ✅ 从35改为30
             reversal_risk = "high"
-            reversal_reasons.append("放量+超卖(疑似底部)")
+            reversal_reasons.append(("VOL_OS", "放量+超卖(疑似底部)"))
 
     # 决定建议操作
     recommended_action = "ALLOW_ALL"
@@ -277,7 +688,7 @@ def analyze_btc_reversal_risk(
             recommended_action = "BLOCK_LONG"
         elif change_1h < 0:
             recommended_action = "BLOCK_SHORT"
-        reversal_reasons.append(f"⛔ 暂停做{'多' if change_1h > 0 else '空'}")
+        reversal_reasons.append(("BLOCK", f"⛔ 暂停做{'多' if change_1h > 0 else '空'}"))
 
     return {
         "reversal_risk": reversal_risk, 
@@ -290,33 +701,96 @@ def analyze_btc_reversal_risk(
     }
 
 
+@dataclass
+class BTCStatus:
+    """
+    BTC市场状态（固定字段 + __slots__），字段与 check_btc_market_advanced 返回的dict一一对应
+
+    主入口仍返回dict（下游按dict读取并写入信号payload），需要属性访问时用 from_dict 转换
+    """
+    __slots__ = (
+        "allow_long", "allow_short", "trend", "price", "price_change_1h", "price_change_4h",
+        "dominance", "dominance_change", "dominance_cached", "volatility", "volatility_state",
+        "reversal_risk", "reversal_reasons", "altcoin_reversal_reasons",
+        "rsi", "momentum_15m", "is_weakening", "support", "resistance", "updated", "cache_age_sec",
+    )
+    allow_long: bool
+    allow_short: bool
+    trend: str
+    price: float
+    price_change_1h: float   # %
+    price_change_4h: float   # %
+    dominance: float
+    dominance_change: float
+    dominance_cached: bool
+    volatility: float        # %
+    volatility_state: str
+    reversal_risk: str
+    reversal_reasons: Tuple[str, ...]           # BTC自己用的完整原因
+    altcoin_reversal_reasons: Tuple[str, ...]   # 山寨币用的过滤原因
+    rsi: float
+    momentum_15m: float
+    is_weakening: bool
+    support: float
+    resistance: float
+    updated: bool
+    cache_age_sec: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BTCStatus":
+        """从状态dict构建（缺失字段取 _BTC_STATUS_DEFAULTS）"""
+        return cls(**{name: data.get(name, _BTC_STATUS_DEFAULTS[name]) for name in cls.__slots__})
+
+
+# 字段缺失时的中性取值（from_dict 兼容旧缓存/部分字段的dict）
+_BTC_STATUS_DEFAULTS = {
+    "allow_long": True, "allow_short": True, "trend": "unknown", "price": 0,
+    "price_change_1h": 0, "price_change_4h": 0,
+    "dominance": 0, "dominance_change": 0, "dominance_cached": False,
+    "volatility": 0, "volatility_state": "unknown",
+    "reversal_risk": "unknown", "reversal_reasons": (), "altcoin_reversal_reasons": (),
+    "rsi": 50, "momentum_15m": 0, "is_weakening": False, "support": 0, "resistance": 0,
+    "updated": True, "cache_age_sec": 0,
+}
+
+
 def _get_default_btc_status() -> Dict[str, Any]:
     """默认BTC状态(数据获取失败时)"""
-    return {
-        "allow_long": True, 
-        "allow_short": True, 
-        "trend": "unknown", 
-        "price": 0,
-        "price_change_1h": 0,
-        "price_change_4h": 0,
-        "dominance": 0,
-        "dominance_change": 0,
-        "volatility": 0,
-        "volatility_state": "unknown",
-        "reversal_risk": "unknown", 
-        "reversal_reasons": ["数据获取失败"],
-        "altcoin_reversal_reasons": ["数据获取失败"],
-        "rsi": 50, 
-        "momentum_15m": 0,
-        "is_weakening": False, 
-        "support": 0, 
-        "resistance": 0, 
-        "updated": False, 
-        "cache_age_sec": 0
-    }
+    return BTCStatus(
+        allow_long=True, 
+        allow_short=True, 
+        trend="unknown", 
+        price=0,
+        price_change_1h=0,
+        price_change_4h=0,
+        dominance=0,
+        dominance_change=0,
+        dominance_cached=False,
+        volatility=0,
+        volatility_state="unknown",
+        reversal_risk="unknown", 
+        reversal_reasons=("数据获取失败",),
+        altcoin_reversal_reasons=("数据获取失败",),
+        rsi=50, 
+        momentum_15m=0,
+        is_weakening=False, 
+        support=0, 
+        resistance=0, 
+        updated=False, 
+        cache_age_sec=0
+    ).to_dict()
+
+
+# 🔧 值得重试的错误类型（ccxt.NetworkError 已涵盖 RequestTimeout / ExchangeNotAvailable / DDoSProtection）
+_RETRYABLE_ERRORS = (ccxt.NetworkError, ConnectionError, TimeoutError)
 
 
-def _fetch_btc_ohlcv_with_retry(ex, symbol: str, max_retries: int = 3) -> Optional[list]:
+def _fetch_btc_ohlcv_with_retry(
+    ex, symbol: str, max_retries: int = 3, backoff_sec: float = 1.0
+) -> Optional[list]:
     """
     🆕 带重试机制的K线数据获取
     
@@ -324,31 +798,22 @@ def _fetch_btc_ohlcv_with_retry(ex, symbol: str, max_retries: int = 3) -> Option
         ex: ccxt交易所实例
         symbol: 交易对
         max_retries: 最大重试次数
+        backoff_sec: 首次重试等待秒数，之后指数翻倍
         
     Returns:
         K线数据列表，失败返回None
     """
-    last_error = None
-    
     for attempt in range(max_retries):
         try:
             ohlcv = ex.fetch_ohlcv(symbol, '1m', limit=300)
             return ohlcv
         except Exception as e:
-            last_error = e
             error_type = type(e).__name__
-            
-            # 判断是否值得重试的错误类型
-            retryable_errors = [
-                'NetworkError', 'RequestTimeout', 'ExchangeNotAvailable',
-                'ConnectionError', 'RemoteDisconnected', 'ProtocolError'
-            ]
-            
-            is_retryable = any(err in error_type or err in str(e) for err in retryable_errors)
+            is_retryable = isinstance(e, _RETRYABLE_ERRORS)
             
             if attempt < max_retries - 1 and is_retryable:
-                wait_time = 2 ** attempt  # 指数退避: 1s, 2s, 4s
-                print(f"[BTC_ADV] ⚠️ 网络错误({error_type})，{wait_time}秒后重试 ({attempt+1}/{max_retries})...")
+                wait_time = backoff_sec * 2 ** attempt  # 指数退避: 1s, 2s, 4s
+                print(f"[BTC_ADV] ⚠️ 网络错误({error_type})，{wait_time:g}秒后重试 ({attempt+1}/{max_retries})...")
                 time.sleep(wait_time)
             else:
                 # 最后一次失败或不可重试的错误
@@ -361,37 +826,43 @@ def _fetch_btc_ohlcv_with_retry(ex, symbol: str, max_retries: int = 3) -> Option
     return None
 
 
-def _get_cached_btc_data() -> Optional[Dict[str, Any]]:
+def _get_cached_btc_data(now: Optional[float] = None) -> Optional[Dict[str, Any]]:
     """
     🆕 获取缓存的BTC数据（用于降级）
+
+    Args:
+        now: 调用方取好的 time.monotonic()，None时自行获取
     """
     global _BTC_DATA_CACHE
     
     if _BTC_DATA_CACHE["data"] is None:
         return None
     
-    now = time.time()
+    if now is None:
+        now = time.monotonic()
     cache_age = int(now - _BTC_DATA_CACHE["timestamp"])
     
-    # 复制缓存数据并更新缓存年龄
-    cached = _BTC_DATA_CACHE["data"].copy()
-    cached["cache_age_sec"] = cache_age
-    cached["updated"] = False  # 标记为非实时数据
+    # 在只读快照上叠加缓存年龄，并标记为非实时数据
+    snapshot = _BTC_DATA_CACHE["data"]
     
     # 缓存超过5分钟，添加警告标记
     if cache_age > _BTC_DATA_CACHE["ttl"]:
-        cached["reversal_reasons"] = cached.get("reversal_reasons", []) + [f"⚠️ 数据延迟{cache_age}秒"]
+        return {
+            **snapshot, "cache_age_sec": cache_age, "updated": False,
+            "reversal_reasons": (*snapshot.get("reversal_reasons", ()), f"⚠️ 数据延迟{cache_age}秒")
+        }
     
-    return cached
+    return {**snapshot, "cache_age_sec": cache_age, "updated": False}
 
 
-def _update_btc_cache(data: Dict[str, Any]) -> None:
+def _update_btc_cache(data: MappingProxyType, now: Optional[float] = None) -> None:
     """
-    🆕 更新BTC数据缓存
+    🆕 更新BTC数据缓存（data 为只读快照，调用方之后不得再修改其底层dict）
     """
     global _BTC_DATA_CACHE
-    _BTC_DATA_CACHE["data"] = data.copy()
-    _BTC_DATA_CACHE["timestamp"] = time.time()
+    _BTC_DATA_CACHE["data"] = data
+    _BTC_DATA_CACHE["timestamp"] = time.monotonic() if now is None else now
+    _save_disk_cache(_BTC_DATA_CACHE)
 
 
 def check_btc_market_advanced(ex, cfg) -> Dict[str, Any]:
@@ -403,44 +874,68 @@ def check_btc_market_advanced(ex, cfg) -> Dict[str, Any]:
     """
     symbol = "BTC/USDT:USDT"
     
-    # 🆕 使用带重试的数据获取
-    ohlcv = _fetch_btc_ohlcv_with_retry(ex, symbol, max_retries=3)
+    # 🆕 使用带重试的数据获取（重试次数/退避秒数可在 btc_monitor 中配置）
+    monitor_cfg = cfg.get("btc_monitor", {})
+    ohlcv = _fetch_btc_ohlcv_with_retry(
+        ex, symbol,
+        max_retries=monitor_cfg.get("fetch_max_retries", 3),
+        backoff_sec=monitor_cfg.get("fetch_backoff_sec", 1.0)
+    )
+    now = time.monotonic()  # 🔧 本次调用统一的时间点，传给各缓存助手
     
     # 🆕 数据获取失败，尝试使用缓存降级
     if ohlcv is None:
-        cached = _get_cached_btc_data()
+        cached = _get_cached_btc_data(now=now)
         if cached:
             print(f"[BTC_ADV] 📦 使用缓存数据降级 (age: {cached['cache_age_sec']}s)")
             return cached
         else:
             print("[BTC_ADV] ❌ 无可用缓存，返回默认状态")
             return _get_default_btc_status()
+
+    # 🆕 最后一根K线未变化（仍在同一分钟内），直接复用上次分析结果
+    if ohlcv and ohlcv[-1][0] == _ANALYSIS_CACHE["ts"]:
+        return {**_ANALYSIS_CACHE["result"], "cache_age_sec": int(now - _ANALYSIS_CACHE["timestamp"])}
     
     try:
-        # 数据长度检查
-        if len(ohlcv) < 240:
-            print("[BTC_ADV_WARN] 获取的BTC K线数据不足240根,部分指标可能不准。")
-            if len(ohlcv) < 100:
-                cached = _get_cached_btc_data()
+        # 数据长度检查（MIN_BARS 已覆盖RSI/动量/均量/支撑阻力/波动率各自所需的最少根数）
+        n_bars = len(ohlcv)
+        if n_bars < BARS_4H:
+            print(f"[BTC_ADV_WARN] 获取的BTC K线数据不足{BARS_4H}根({n_bars}),4小时涨跌不参与判断。")
+            if n_bars < MIN_BARS:
+                cached = _get_cached_btc_data(now=now)
                 if cached:
                     return cached
                 return _get_default_btc_status()
 
-        df = pd.DataFrame(ohlcv, columns=["ts", "open", "high", "low", "close", "volume"])
+        # 🔥 K线列表一次性转为按列连续的数组（不再构建DataFrame），下游指标直接按下标取值
+        columns = np.ascontiguousarray(np.asarray(ohlcv, dtype=np.float64).T)
+        ts = columns[0].astype(np.int64)  # 毫秒时间戳在float64中可精确表示
+        high, low, close, volume = columns[2], columns[3], columns[4], columns[5]
         
-        price_now = float(df['close'].iloc[-1])
-        price_1h = float(df['close'].iloc[-60])
-        price_4h = float(df['close'].iloc[-240])
+        if n_bars >= BARS_4H:
+            price_now, price_1m, price_5m, price_15m, price_1h, price_4h = close[_PRICE_OFFSETS].tolist()
+            change_4h = (price_now - price_4h) / price_4h
+        else:
+            # 不足4小时：close[-240]会回绕到错误的K线，4小时涨跌记0（不触发4h阈值）
+            price_now, price_1m, price_5m, price_15m, price_1h = close[_PRICE_OFFSETS[:-1]].tolist()
+            change_4h = 0.0
         
         change_1h = (price_now - price_1h) / price_1h
-        change_4h = (price_now - price_4h) / price_4h
         
         # 🆕 获取 BTC Dominance（1小时缓存）
         coingecko_key = cfg.get("coingecko", {}).get("api_key", "")
-        dominance_data = get_btc_dominance(coingecko_key)
+        dominance_data = get_btc_dominance(coingecko_key, now=now)
         
-        # 调用修复后的反转风险分析
-        reversal_analysis = analyze_btc_reversal_risk(df, change_1h, change_4h)
+        # 调用修复后的反转风险分析（指标由融合内核一次算出，RSI/均量走增量状态）
+        indicators = compute_indicators(high, low, close, volume, ts=ts)
+        momentum = analyze_momentum(price_now, price_15m, price_5m, price_1m)
+        reversal_analysis = analyze_btc_reversal_risk(
+            indicators.rsi, momentum,
+            _sr_levels(indicators.support, indicators.resistance, price_now),
+            _volume_spike(indicators.volume_ratio),
+            change_1h
+        )
         
         allow_long, allow_short, trend = True, True, "stable"
         
@@ -460,22 +955,15 @@ def check_btc_market_advanced(ex, cfg) -> Dict[str, Any]:
             allow_short = False
         
         # 🔧 新增: 生成适用于山寨币的过滤原因 (排除价格位置相关)
-        altcoin_reversal_reasons = []
-        for reason in reversal_analysis["reversal_reasons"]:
-            # 只保留山寨币需要关注的原因:
-            # 1. RSI极端情况
-            # 2. 动势衰竭
-            # 3. 放量+极端RSI组合
-            # 排除: 支撑位、阻力位、⛔标记
-            if ("支撑位" not in reason and 
-                "阻力位" not in reason and 
-                "⛔" not in reason):
-                altcoin_reversal_reasons.append(reason)
+        # 只保留山寨币需要关注的原因（RSI极端、动势衰竭、放量+极端RSI），排除支撑位、阻力位、⛔标记
+        reason_codes = reversal_analysis["reversal_reasons"]
+        # 元组：结果会整体放进只读快照，调用方拿到的浅拷贝不能改到缓存里的原因列表
+        reversal_reasons = tuple(text for _, text in reason_codes)
+        altcoin_reversal_reasons = tuple(text for code, text in reason_codes if code not in _ALTCOIN_EXCLUDED_REASONS)
         
         # 波动率状态
         vol_cfg = cfg.get("btc_monitor", {})
-        returns_1h = df["close"].pct_change().tail(60)
-        vol_1h = float(returns_1h.std())
+        vol_1h = indicators.volatility
         volatility = vol_1h * 100  # 转为百分比
         volatility_state = "normal"
         if vol_1h > vol_cfg.get("volatility_extreme", 0.04)/60: 
@@ -485,48 +973,55 @@ def check_btc_market_advanced(ex, cfg) -> Dict[str, Any]:
         elif vol_1h < vol_cfg.get("volatility_low", 0.005)/60:
             volatility_state = "low"
 
-        result = {
-            "allow_long": allow_long, 
-            "allow_short": allow_short, 
-            "trend": trend,
-            "price": price_now,
-            "price_change_1h": round(change_1h * 100, 2),  # 转为百分比
-            "price_change_4h": round(change_4h * 100, 2),  # 转为百分比
+        momentum = reversal_analysis["momentum"]
+        sr = reversal_analysis["support_resistance"]
+        result = BTCStatus(
+            allow_long=allow_long, 
+            allow_short=allow_short, 
+            trend=trend,
+            price=price_now,
+            price_change_1h=round(change_1h * 100, 2),  # 转为百分比
+            price_change_4h=round(change_4h * 100, 2),  # 转为百分比
             
             # 🆕 Dominance 数据
-            "dominance": dominance_data.get("dominance", 0),
-            "dominance_change": dominance_data.get("dominance_change_24h", 0),
-            "dominance_cached": dominance_data.get("cached", False),
+            dominance=dominance_data.get("dominance", 0),
+            dominance_change=dominance_data.get("dominance_change_24h", 0),
+            dominance_cached=dominance_data.get("cached", False),
             
             # 波动率
-            "volatility": round(volatility, 2),
-            "volatility_state": volatility_state,
+            volatility=round(volatility, 2),
+            volatility_state=volatility_state,
             
             # 反转风险
-            "reversal_risk": reversal_analysis["reversal_risk"],
-            "reversal_reasons": reversal_analysis["reversal_reasons"],  # BTC自己用的完整原因
-            "altcoin_reversal_reasons": altcoin_reversal_reasons,  # 🔧 山寨币用的过滤原因
+            reversal_risk=reversal_analysis["reversal_risk"],
+            reversal_reasons=reversal_reasons,  # BTC自己用的完整原因
+            altcoin_reversal_reasons=altcoin_reversal_reasons,  # 🔧 山寨币用的过滤原因
             
             # 技术指标
-            "rsi": reversal_analysis["rsi"],
-            "momentum_15m": reversal_analysis["momentum"].get("momentum_15m", 0),
-            "support": reversal_analysis["support_resistance"].get("support", 0),
-            "resistance": reversal_analysis["support_resistance"].get("resistance", 0),
+            rsi=reversal_analysis["rsi"],
+            momentum_15m=momentum.get("momentum_15m", 0),
+            is_weakening=momentum.get("is_weakening", False),
+            support=sr.get("support", 0),
+            resistance=sr.get("resistance", 0),
             
-            "updated": True, 
-            "cache_age_sec": 0
-        }
+            updated=True, 
+            cache_age_sec=0
+        ).to_dict()
         
-        # 🆕 更新缓存
-        _update_btc_cache(result)
+        # 🆕 更新缓存：两个缓存共享同一只读快照，调用方拿到的是独立副本
+        snapshot = MappingProxyType(result)
+        _update_btc_cache(snapshot, now=now)
+        _ANALYSIS_CACHE["ts"] = ohlcv[-1][0]
+        _ANALYSIS_CACHE["result"] = snapshot
+        _ANALYSIS_CACHE["timestamp"] = now
         
-        return result
+        return dict(result)
         
     except Exception as e:
         # 处理过程中出错，尝试缓存降级
         print(f"[BTC_ADV_ERR] 分析过程失败: {type(e).__name__}: {str(e)[:100]}")
         
-        cached = _get_cached_btc_data()
+        cached = _get_cached_btc_data(now=now)
         if cached:
             print(f"[BTC_ADV] 📦 分析失败，使用缓存降级 (age: {cached['cache_age_sec']}s)")
             return cached
@@ -534,44 +1029,48 @@ def check_btc_market_advanced(ex, cfg) -> Dict[str, Any]:
         return _get_default_btc_status()
 
 
-def format_btc_status_message(btc_status: Dict[str, Any]) -> List[str]:
+_TREND_EMOJI = {"stable": "🟢", "moon": "🚀", "crash": "💥", "unknown": "❓"}
+_TREND_NAME = {"stable": "稳定", "moon": "急涨", "crash": "急跌", "unknown": "未知"}
+_VOL_EMOJI = {"low": "😴", "normal": "➡️", "high": "⚡", "extreme": "🔥", "unknown": "❓"}
+
+
+def format_btc_status_message(btc_status: Union[BTCStatus, Dict[str, Any]]) -> List[str]:
     """
     格式化BTC状态消息
     🆕 新增: 显示缓存状态
+    🔧 字段按属性访问（传入dict时先转为BTCStatus）
     """
-    trend_emoji = {"stable": "🟢", "moon": "🚀", "crash": "💥", "unknown": "❓"}
-    trend_name = {"stable": "稳定", "moon": "急涨", "crash": "急跌", "unknown": "未知"}
-    vol_emoji = {"low": "😴", "normal": "➡️", "high": "⚡", "extreme": "🔥", "unknown": "❓"}
+    s = btc_status if isinstance(btc_status, BTCStatus) else BTCStatus.from_dict(btc_status)
     
-    emoji = trend_emoji.get(btc_status["trend"], "❓")
-    name = trend_name.get(btc_status["trend"], "未知")
-    vol_e = vol_emoji.get(btc_status.get("volatility_state", "unknown"), "❓")
+    emoji = _TREND_EMOJI.get(s.trend, "❓")
+    name = _TREND_NAME.get(s.trend, "未知")
+    vol_e = _VOL_EMOJI.get(s.volatility_state, "❓")
     
     # 🆕 缓存状态标识
     cache_indicator = ""
-    cache_age = btc_status.get("cache_age_sec", 0)
-    if not btc_status.get("updated", True) and cache_age > 0:
+    cache_age = s.cache_age_sec
+    if not s.updated and cache_age > 0:
         if cache_age > 300:
             cache_indicator = f" ⚠️[缓存{cache_age//60}分钟]"
         else:
             cache_indicator = f" 📦[缓存{cache_age}秒]"
     
     messages = [
-        f"💰 当前价格: ${btc_status['price']:,.2f}{cache_indicator}",
-        f"➡️ 1小时涨跌: {btc_status['price_change_1h']:+.2f}%",
-        f"➡️ 4小时涨跌: {btc_status['price_change_4h']:+.2f}%",
-        f"{vol_e} 波动率: {btc_status.get('volatility', 0):.2f}% ({btc_status.get('volatility_state', 'UNKNOWN').upper()})",
+        f"💰 当前价格: ${s.price:,.2f}{cache_indicator}",
+        f"➡️ 1小时涨跌: {s.price_change_1h:+.2f}%",
+        f"➡️ 4小时涨跌: {s.price_change_4h:+.2f}%",
+        f"{vol_e} 波动率: {s.volatility:.2f}% ({s.volatility_state.upper()})",
         f"{emoji} 趋势: {name.upper()}",
-        f"⚖️ RSI: {btc_status['rsi']:.1f}",
-        f"➡️ 动量(15分钟): {btc_status['momentum_15m']:+.2f}%",
+        f"⚖️ RSI: {s.rsi:.1f}",
+        f"➡️ 动量(15分钟): {s.momentum_15m:+.2f}%",
     ]
     
     # 交易方向建议
-    if btc_status["allow_long"] and btc_status["allow_short"]:
+    if s.allow_long and s.allow_short:
         messages.append("✅ 山寨币: 双向可交易")
-    elif btc_status["allow_long"]:
+    elif s.allow_long:
         messages.append("⚠️ 山寨币: 仅可做多")
-    elif btc_status["allow_short"]:
+    elif s.allow_short:
         messages.append("⚠️ 山寨币: 仅可做空")
     else:
         messages.append("🚫 山寨币: 暂停交易")
@@ -580,7 +1079,7 @@ def format_btc_status_message(btc_status: Dict[str, Any]) -> List[str]:
 
 
 # 🆕 新增: 获取缓存状态的工具函数
-def get_btc_cache_status() -> Dict[str, Any]:
+def get_btc_cache_status(now: Optional[float] = None) -> Dict[str, Any]:
     """
     获取BTC数据缓存状态（用于诊断）
     """
@@ -589,7 +1088,8 @@ def get_btc_cache_status() -> Dict[str, Any]:
     if _BTC_DATA_CACHE["data"] is None:
         return {"has_cache": False, "cache_age_sec": 0}
     
-    now = time.time()
+    if now is None:
+        now = time.monotonic()
     cache_age = int(now - _BTC_DATA_CACHE["timestamp"])
     
     return {
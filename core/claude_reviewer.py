@@ -19,13 +19,26 @@ Claude审核器 - CVD背离+Funding Z-Score版 v10.0
 """
 
 import anthropic
+import asyncio
+import httpx
 import requests
-import json
+import functools
 import math
+import queue
+import random
+import re
+import threading
+import time
 import numpy as np
-from typing import Dict, Optional, Tuple, List, Any
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from enum import IntEnum
+from typing import Dict, Optional, Tuple, List, Any, NamedTuple
 from datetime import datetime, timezone
 
+from core.bt_kernels import NUMBA_AVAILABLE, njit
+from core.utils import json_dumps, json_loads
+
 # 🔥 v10.0: 导入新指标函数
 try:
     from .utils import (
@@ -39,7 +52,523 @@ except ImportError:
     print("[CLAUDE_REVIEWER] ⚠️ 新指标函数未找到，使用内置版本")
 
 # 🔥 v10.0: Funding历史缓存
-_FUNDING_HISTORY: Dict[str, List[float]] = {}
+# 🔥 每个symbol每小时最多采样一次（资金费率8小时结算一次，更密的采样只会重复同一个值），
+#    TTL内直接返回上次的Z-Score
+_FUNDING_TTL_SEC = 3600
+_FUNDING_HISTORY: Dict[str, deque] = defaultdict(lambda: deque(maxlen=90))  # 只保留最近90个数据点
+_FUNDING_UPDATED_AT: Dict[str, float] = {}   # monotonic秒
+_FUNDING_ZSCORE: Dict[str, Dict] = {}
+_FUNDING_LOCK = threading.Lock()
+
+
+# ==================== 🔥 AI调用重试（瞬时故障退避重试）====================
+
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 529})
+_API_MAX_ATTEMPTS = 3      # 单次审核最多调用次数（含首次）
+_JSON_REPAIR_ATTEMPTS = 2  # 返回无法解析时追加提示重问的次数
+_JSON_REPAIR_PROMPT = "你上一次的回复无法解析为JSON。请只返回JSON对象，不要包含其他内容。"
+
+# 🔥 流式审核：回复开头已是 {"approved": false 时提前结束，不再等待后续字段
+_EARLY_REJECT_RE = re.compile(r'^\s*(?:```(?:json)?\s*)?\{\s*"approved"\s*:\s*false\b')
+_EARLY_REJECT_RESULT = '{"approved": false, "reasoning": "AI拒绝（流式提前结束，未等待理由）"}'
+
+# 🔥 审核回复只有约60 token的JSON（approved/confidence/side/reasoning≤20字），输出上限按此收紧
+_REVIEW_MAX_TOKENS = 200
+_CLAUDE_TOOL_MAX_TOKENS = 256
+
+# 🔥 Claude用工具调用强制输出结构化审核结果（tool_use.input即结果字典，无需从文本中提取JSON）
+_REVIEW_TOOL = {
+    "name": "submit_review",
+    "description": "提交交易信号审核结论",
+    "input_schema": {
+        "type": "object",
+        "required": ["approved", "confidence", "side", "reasoning"],
+        "properties": {
+            "approved": {"type": "boolean"},
+            "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+            "side": {"type": "string", "enum": ["long", "short"]},
+            "reasoning": {"type": "string", "maxLength": 20}
+        }
+    }
+}
+
+# 🔥 批量审核：多个信号合并成一次调用，max_tokens按信号数放大（有上限）
+_BATCH_TOKENS_PER_SIGNAL = _REVIEW_MAX_TOKENS
+_BATCH_MAX_TOKENS = 4000
+
+# 🔥 审核规则（静态文本，不含任何信号数据）：放在system中，Claude标记为提示缓存段、DeepSeek自动前缀缓存，
+# 每次审核只有用户消息里的信号数据是新输入；三类信号的规则合在一段里，长度超过缓存的最小前缀要求
+_REVIEW_RUBRIC = """
+# 审核规则（按用户消息标明的信号类型使用对应规则）
+
+## 🔮 趋势预判信号 - 严格模式
+
+🚨🚨🚨 **极其重要的风控铁律** 🚨🚨🚨
+1. BTC下跌时（1h跌>0.5%）→ 必须拒绝做多
+2. BTC上涨时（1h涨>0.5%）→ 必须拒绝做空  
+3. 成交量<1.5x → 必须拒绝
+4. 没有明显支撑/阻力确认 → 必须拒绝
+5. 多时间框架确认<2个 → 必须拒绝
+6. 任何疑虑 → 拒绝（宁可错过，不可做错）
+
+### 🚨 必须检查的拒绝条件
+1. ❓ BTC方向是否与信号方向冲突？（做多时BTC跌/做空时BTC涨）
+2. ❓ 成交量是否足够？（至少1.5x）
+3. ❓ 是否有有效支撑/阻力位确认？
+4. ❓ 动能是否真的在减弱？
+
+⚠️ 记住：你的任务是保护资金安全！有任何疑虑就拒绝。
+
+## 📈 趋势延续信号
+
+⚠️ **这是趋势延续信号，跟随BTC方向！**
+- 不要求RSI极值
+- 重点看：BTC方向 + 相关性 + 回调入场
+
+⚠️ 只判断信号质量！
+
+## 🔄 反转信号 - 🔥v10.0 CVD+Funding增强版
+
+🚨🚨🚨 **核心风控铁律** 🚨🚨🚨
+1. RSI没到极值（做多>15，做空<85）→ 必须拒绝
+2. 价格还在创新高/新低（趋势进行中）→ 必须拒绝
+3. 动能没有明显减弱 → 必须拒绝
+4. 成交量<2x均量 → 必须拒绝
+5. BTC方向与信号冲突 → 必须拒绝
+6. 🆕 CVD背离不支持反转方向 → 谨慎
+7. 任何疑虑 → 拒绝（宁可错过，不可做错）
+
+### 🔥🔥🔥 v10.0新增：反转质量指标的含义
+- **CVD背离**
+  - 做多时看涨背离(价格跌+CVD涨)= ✅支持
+  - 做空时看跌背离(价格涨+CVD跌)= ✅支持
+- **Funding拥挤**
+  - 做多时空头拥挤 = ✅做多价值高
+  - 做空时多头拥挤 = ✅做空价值高
+
+### 🚨 必须检查的拒绝条件
+1. ❓ RSI是否真的到了极值区域？（做多≤15/做空≥85）
+2. ❓ 价格是否还在创新高/新低？（还在趋势中=危险）
+3. ❓ 动能是否真的在减弱？（至少4根K线确认）
+4. ❓ BTC方向是否支持？（做多时BTC不能跌/做空时BTC不能涨）
+5. ❓ 成交量是否足够？（至少2x）
+6. 🆕 CVD是否支持反转？（做多要看涨背离/做空要看跌背离）
+
+⚠️ 记住：反转交易是逆势交易，风险极高！有任何疑虑就拒绝。
+
+# 返回格式
+```json
+{
+    "approved": true/false,
+    "confidence": 0.0-1.0,
+    "side": "long"/"short",
+    "reasoning": "20字以内简短理由（反转信号需提及CVD/Funding）"
+}
+```
+
+只返回JSON。
+"""
+
+_CLAUDE_REVIEW_SYSTEM = "你是专业的加密货币交易审核专家。严格分析信号质量，给出明确决策。JSON的第一个键必须是approved。"
+_CLAUDE_TOOL_SYSTEM = "你是专业的加密货币交易审核专家。严格分析信号质量，通过submit_review工具提交明确决策。"
+
+
+def _cached_system(text: str) -> List[Dict]:
+    """Claude的system参数：静态指令+审核规则作为一个提示缓存段（ephemeral）"""
+    return [{"type": "text", "text": text + "\n" + _REVIEW_RUBRIC, "cache_control": {"type": "ephemeral"}}]
+
+
+def _is_retryable_api_error(e: Exception) -> bool:
+    """限流/服务端错误/超时/连接错误可重试，其余（鉴权、参数错误等）直接失败"""
+    if isinstance(e, anthropic.APIStatusError):
+        return e.status_code in _RETRYABLE_STATUS
+    if isinstance(e, (anthropic.APIConnectionError, requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
+        return e.response.status_code in _RETRYABLE_STATUS
+    # 异步DeepSeek请求（httpx）
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code in _RETRYABLE_STATUS
+    if isinstance(e, httpx.TransportError):
+        return True
+    return False
+
+
+def _retry_api(max_attempts: int = _API_MAX_ATTEMPTS):
+    """
+    🔥 AI接口重试装饰器：可重试错误按 random(2,4)*(第n次) 秒退避（带抖动，避免多个请求同时重试）
+    
+    最后一次仍失败或错误不可重试时原样抛出，由调用方转成错误结果；
+    协程函数用asyncio.sleep退避，不阻塞事件循环
+    """
+    def decorator(fn):
+        def backoff(attempt: int, e: Exception) -> float:
+            if attempt + 1 >= max_attempts or not _is_retryable_api_error(e):
+                raise e
+            wait = random.uniform(2, 4) * (attempt + 1)
+            print(f"[AI_RETRY] {fn.__name__} 第{attempt + 1}次失败，{wait:.1f}秒后重试: {e}")
+            return wait
+        
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(max_attempts):
+                    try:
+                        return await fn(*args, **kwargs)
+                    except Exception as e:
+                        await asyncio.sleep(backoff(attempt, e))
+            return async_wrapper
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            for attempt in range(max_attempts):
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as e:
+                    time.sleep(backoff(attempt, e))
+        return wrapper
+    return decorator
+
+
+# ==================== 🔥 反转信号数值硬规则（JIT内核）====================
+
+# 内核拒绝编码（RejectCode沿用同一数值）；{limit}为内核返回的阈值/估算值；编码顺序即检查顺序
+GUARD_PASS = 0
+GUARD_DEAD_CHOP = 1
+GUARD_BB_SQUEEZE_HIGH_VOL = 2
+GUARD_BB_SQUEEZE_LOW_VOL = 3
+GUARD_BB_SQUEEZE_NEUTRAL_RSI = 4
+GUARD_TREND_NO_VOLUME = 5
+GUARD_NO_CONFIRM_LONG = 6
+GUARD_NO_CONFIRM_SHORT = 7
+GUARD_MACD_NOISE = 8
+GUARD_TREND_END = 9
+GUARD_SL_TIGHT = 10
+GUARD_SL_SQUEEZE = 11
+GUARD_SL_LOW_VOL = 12
+GUARD_FUNDING_LONG = 13
+GUARD_FUNDING_SHORT = 14
+GUARD_ORDERBOOK = 15
+GUARD_SLIPPAGE = 16
+
+class RejectCode(IntEnum):
+    """硬规则拒绝编码（反转数值规则沿用JIT内核的GUARD_*编码）"""
+    DEAD_CHOP = GUARD_DEAD_CHOP
+    BB_SQUEEZE_HIGH_VOL = GUARD_BB_SQUEEZE_HIGH_VOL
+    BB_SQUEEZE_LOW_VOL = GUARD_BB_SQUEEZE_LOW_VOL
+    BB_SQUEEZE_NEUTRAL_RSI = GUARD_BB_SQUEEZE_NEUTRAL_RSI
+    TREND_NO_VOLUME = GUARD_TREND_NO_VOLUME
+    NO_CONFIRM_LONG = GUARD_NO_CONFIRM_LONG
+    NO_CONFIRM_SHORT = GUARD_NO_CONFIRM_SHORT
+    MACD_NOISE = GUARD_MACD_NOISE
+    TREND_END = GUARD_TREND_END
+    SL_TIGHT = GUARD_SL_TIGHT
+    SL_SQUEEZE = GUARD_SL_SQUEEZE
+    SL_LOW_VOL = GUARD_SL_LOW_VOL
+    FUNDING_LONG = GUARD_FUNDING_LONG
+    FUNDING_SHORT = GUARD_FUNDING_SHORT
+    ORDERBOOK = GUARD_ORDERBOOK
+    SLIPPAGE = GUARD_SLIPPAGE
+    
+    # 趋势预判
+    TA_SCORE = 101
+    TA_ADX = 102
+    TA_RSI_LONG = 103
+    TA_RSI_SHORT = 104
+    TA_BB_WIDTH = 105
+    TA_VOLUME = 106
+    TA_FUNDING_LONG = 107
+    TA_FUNDING_SHORT = 108
+    TA_ORDERBOOK = 109
+    TA_MOMENTUM = 110
+    TA_BTC_DROP_1H = 111
+    TA_BTC_CRASH = 112
+    TA_BTC_DOWN = 113
+    TA_BTC_RISE_1H = 114
+    TA_BTC_MOON = 115
+    TA_BTC_UP = 116
+    
+    # 趋势延续
+    TC_SCORE = 201
+    TC_ADX = 202
+    TC_FUNDING_LONG = 203
+    TC_FUNDING_SHORT = 204
+    TC_ORDERBOOK = 205
+    
+    # 反转（Python侧规则）
+    CVD_FAKE_BREAKOUT = 301
+    RSI_NOT_OVERSOLD = 302
+    RSI_NOT_OVERBOUGHT = 303
+    STILL_FALLING = 304
+    STILL_RISING = 305
+    SCORE = 306
+    VOLUME = 307
+    PRICE_CHANGE_EXTREME = 308
+    PRICE_CHANGE_SCORE = 309
+    PRICE_CHANGE_VOLUME = 310
+
+
+# 拒绝编码 -> 原因模板（str.format字段；只格式化最终命中的那一条）
+_REJECT_FMT = {
+    RejectCode.DEAD_CHOP: "ADX{adx:.1f}<15且Vol{vol_spike:.2f}x<2.0死寂震荡",
+    RejectCode.BB_SQUEEZE_HIGH_VOL: "布林带极度挤压{bb_width:.4f}即使Vol{vol_spike:.2f}x高仍不足",
+    RejectCode.BB_SQUEEZE_LOW_VOL: "布林带极度挤压{bb_width:.4f}+Vol{vol_spike:.2f}x不足",
+    RejectCode.BB_SQUEEZE_NEUTRAL_RSI: "布林带极挤压{bb_width:.4f}+RSI{rsi:.1f}中性,方向不明",
+    RejectCode.TREND_NO_VOLUME: "ADX{adx:.1f}强趋势但Vol{vol_spike:.2f}x不支持",
+    RejectCode.NO_CONFIRM_LONG: "❌ 缺少反转确认 | RSI={rsi:.0f}超卖但MACD未金叉且无底背离",
+    RejectCode.NO_CONFIRM_SHORT: "❌ 缺少反转确认 | RSI={rsi:.0f}超买但MACD未死叉且无顶背离",
+    RejectCode.MACD_NOISE: "布林带挤压{bb_width:.4f}时MACD交叉为噪音",
+    RejectCode.TREND_END: "ADX{adx:.1f}高+BB{bb_width:.4f}缩+Vol{vol_spike:.2f}x衰=趋势末端",
+    RejectCode.SL_TIGHT: "止损{sl_pct:.2f}%过紧(<{limit:.2f}%)",
+    RejectCode.SL_SQUEEZE: "布林带挤压期止损需≥{limit:.2f}%",
+    RejectCode.SL_LOW_VOL: "低流动性Vol{vol_spike:.2f}x时止损需≥{limit:.2f}%",
+    RejectCode.FUNDING_LONG: "做多资金费率{funding_rate:.4f}>0.001过高",
+    RejectCode.FUNDING_SHORT: "做空资金费率{funding_rate:.4f}<-0.001过负",
+    RejectCode.ORDERBOOK: "订单簿{orderbook:.2f}<0.30深度不足",
+    RejectCode.SLIPPAGE: "预估滑点{limit:.2f}%>止损{sl_pct:.2f}%×0.6",
+    
+    RejectCode.TA_SCORE: "❌ 趋势预判评分{score:.2f}<{min_score:.2f}",
+    RejectCode.TA_ADX: "❌ ADX{adx:.1f}<{min_adx} 趋势不明确",
+    RejectCode.TA_RSI_LONG: "❌ 趋势预判做多RSI{rsi:.1f}不在{rsi_range[0]}-{rsi_range[1]}区间",
+    RejectCode.TA_RSI_SHORT: "❌ 趋势预判做空RSI{rsi:.1f}不在{rsi_range[0]}-{rsi_range[1]}区间",
+    RejectCode.TA_BB_WIDTH: "❌ 布林带{bb_width_pct:.1f}%>{max_bb_width_pct:.1f}% 未蓄势",
+    RejectCode.TA_VOLUME: "❌ 成交量{vol_spike:.1f}x<{min_vol:.1f}x 太低",
+    RejectCode.TA_FUNDING_LONG: "❌ 做多但资金费率{funding_rate:.4f}>0.12%",
+    RejectCode.TA_FUNDING_SHORT: "❌ 做空但资金费率{funding_rate:.4f}<-0.12%",
+    RejectCode.TA_ORDERBOOK: "❌ 订单簿{orderbook:.2f}<0.45 深度不足",
+    RejectCode.TA_MOMENTUM: "❌ 动能未减弱且评分{score:.2f}<0.90",
+    RejectCode.TA_BTC_DROP_1H: "❌ 做多但BTC 1h跌{btc_change_1h:.1f}%，方向冲突",
+    RejectCode.TA_BTC_CRASH: "❌ 做多但BTC暴跌中，方向冲突",
+    RejectCode.TA_BTC_DOWN: "❌ 做多但BTC下跌中({btc_change_1h:.1f}%)，方向冲突",
+    RejectCode.TA_BTC_RISE_1H: "❌ 做空但BTC 1h涨{btc_change_1h:.1f}%，方向冲突",
+    RejectCode.TA_BTC_MOON: "❌ BTC强势上涨，做空需评分≥0.93 | 当前:{score:.2f}",
+    RejectCode.TA_BTC_UP: "❌ BTC上涨中({btc_change_1h:.1f}%)，做空需评分≥0.90 | 当前:{score:.2f}",
+    
+    RejectCode.TC_SCORE: "❌ 趋势延续评分{score:.2f}<{min_score:.2f}",
+    RejectCode.TC_ADX: "❌ ADX{adx:.1f}<{min_adx} 趋势不明确",
+    RejectCode.TC_FUNDING_LONG: "❌ 做多但资金费率{funding_rate:.4f}>0.15%",
+    RejectCode.TC_FUNDING_SHORT: "❌ 做空但资金费率{funding_rate:.4f}<-0.15%",
+    RejectCode.TC_ORDERBOOK: "❌ 订单簿{orderbook:.2f}<0.25",
+    
+    RejectCode.CVD_FAKE_BREAKOUT: "❌ CVD检测到假突破(背离强度{strength:.0f})",
+    RejectCode.RSI_NOT_OVERSOLD: "❌ 做多要求RSI≤{limit}(超卖) | 当前:{rsi:.1f}",
+    RejectCode.RSI_NOT_OVERBOUGHT: "❌ 做空要求RSI≥{limit}(超买) | 当前:{rsi:.1f}",
+    RejectCode.STILL_FALLING: "❌ 还在创新低(趋势中)无背离，要求评分≥0.80 | 当前:{score:.2f}",
+    RejectCode.STILL_RISING: "❌ 还在创新高(趋势中)无背离，要求评分≥0.80 | 当前:{score:.2f}",
+    RejectCode.SCORE: "❌ 评分{score:.2f}<{min_score:.2f}",
+    RejectCode.VOLUME: "❌ 成交量{vol_spike:.2f}x<{min_vol:.1f}x",
+    RejectCode.PRICE_CHANGE_EXTREME: "❌ 24h涨跌幅{change_pct:.1f}%>{max_pct:.0f}%过于极端",
+    RejectCode.PRICE_CHANGE_SCORE: "❌ 暴涨暴跌({change_pct:.1f}%)要求评分>={min_score:.2f} | 当前:{score:.2f}",
+    RejectCode.PRICE_CHANGE_VOLUME: "❌ 暴涨暴跌({change_pct:.1f}%)要求成交量>={min_vol:.1f}x | 当前:{vol_spike:.2f}x",
+}
+
+
+def _reject(code: int, **values) -> Tuple[bool, str, int]:
+    """按拒绝编码生成 (False, 原因, 编码)；只有命中的模板会被格式化"""
+    return False, _REJECT_FMT[code].format(**values), code
+
+
+@njit(cache=True)
+def _slippage_estimate(vol_spike, obk_score):
+    """估算预期滑点%（成交量越低、订单簿越薄滑点越大）"""
+    if vol_spike < 0.5:
+        base_slip = 0.8
+    elif vol_spike < 1.0:
+        base_slip = 0.5
+    elif vol_spike < 2.0:
+        base_slip = 0.3
+    elif vol_spike < 5.0:
+        base_slip = 0.15
+    else:
+        base_slip = 0.08
+    
+    if obk_score < 0.3:
+        multiplier = 2.0
+    elif obk_score < 0.5:
+        multiplier = 1.5
+    elif obk_score < 0.7:
+        multiplier = 1.2
+    else:
+        multiplier = 1.0
+    
+    return base_slip * multiplier
+
+
+@njit(cache=True)
+def _reversal_guards(side_long, rsi, adx, vol_spike, bb_width, atr_pct, sl_pct, orderbook,
+                     funding_rate, macd_dir, bullish_div, bearish_div, extreme_rsi_long, extreme_rsi_short):
+    """
+    反转信号的数值硬规则（纯标量比较，无日志）
+    
+    macd_dir: 1=金叉 / -1=死叉 / 0=无
+    
+    Returns:
+        (GUARD_*编码, 拒绝原因里的阈值/估算值)；全部通过返回 (GUARD_PASS, 0.0)
+    """
+    # ADX震荡检测
+    if adx < 15 and vol_spike < 2.0:
+        return GUARD_DEAD_CHOP, 0.0
+    
+    # 布林带陷阱检测
+    if bb_width < 0.01:
+        if vol_spike >= 0.8:
+            if bb_width < 0.005:
+                return GUARD_BB_SQUEEZE_HIGH_VOL, 0.0
+        else:
+            return GUARD_BB_SQUEEZE_LOW_VOL, 0.0
+    
+    if bb_width < 0.008 and 45 < rsi < 55:
+        return GUARD_BB_SQUEEZE_NEUTRAL_RSI, 0.0
+    
+    if adx > 35 and vol_spike < 0.5:
+        return GUARD_TREND_NO_VOLUME, 0.0
+    
+    # 反转确认（使用统一的极端RSI阈值）
+    if side_long:
+        if not (macd_dir == 1 or bullish_div or (rsi <= extreme_rsi_long and vol_spike >= 3.0)):
+            return GUARD_NO_CONFIRM_LONG, 0.0
+    else:
+        if not (macd_dir == -1 or bearish_div or (rsi >= extreme_rsi_short and vol_spike >= 3.0)):
+            return GUARD_NO_CONFIRM_SHORT, 0.0
+    
+    if bb_width < 0.01 and macd_dir != 0 and vol_spike < 1.0:
+        return GUARD_MACD_NOISE, 0.0
+    
+    if adx > 40 and bb_width < 0.02 and vol_spike < 1.0:
+        return GUARD_TREND_END, 0.0
+    
+    min_sl_by_atr = atr_pct * 1.5
+    if sl_pct < min_sl_by_atr:
+        return GUARD_SL_TIGHT, min_sl_by_atr
+    
+    if bb_width < 0.015:
+        min_sl_squeeze = max(atr_pct * 1.5, 1.0) if vol_spike >= 2.0 else max(atr_pct * 2.0, 1.5)
+        if sl_pct < min_sl_squeeze:
+            return GUARD_SL_SQUEEZE, min_sl_squeeze
+    
+    if vol_spike < 1.0:
+        min_sl_low_vol = atr_pct * 2.5
+        if sl_pct < min_sl_low_vol:
+            return GUARD_SL_LOW_VOL, min_sl_low_vol
+    
+    # 资金费率检查
+    if side_long and funding_rate > 0.001:
+        return GUARD_FUNDING_LONG, 0.0
+    if not side_long and funding_rate < -0.001:
+        return GUARD_FUNDING_SHORT, 0.0
+    
+    if orderbook < 0.30:
+        return GUARD_ORDERBOOK, 0.0
+    
+    estimated_slip = _slippage_estimate(vol_spike, orderbook)
+    if estimated_slip > sl_pct * 0.6:
+        return GUARD_SLIPPAGE, estimated_slip
+    
+    return GUARD_PASS, 0.0
+
+
+# ==================== 🔥 CVD背离（JIT内核）====================
+
+@njit(cache=True)
+def _cvd_window(open_, close, volume, lookback):
+    """
+    最近lookback根K线的CVD变化量与CVD波动范围
+    
+    CVD差值与累加起点无关，只需从窗口起点开始累加成交量差（阳线+、阴线-、十字星0）
+    
+    Returns:
+        (cvd[-1] - cvd[-lookback], max(cvd[-lookback:]) - min(cvd[-lookback:]))
+    """
+    n = close.shape[0]
+    cvd = 0.0
+    lo = 0.0
+    hi = 0.0
+    for i in range(n - lookback + 1, n):
+        d = close[i] - open_[i]
+        if d > 0:
+            cvd += volume[i]
+        elif d < 0:
+            cvd -= volume[i]
+        if cvd > hi:
+            hi = cvd
+        elif cvd < lo:
+            lo = cvd
+    return cvd, hi - lo
+
+
+def _kline_columns(klines) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    K线 -> (open, close, volume) float64列
+    
+    支持：DataFrame / 列字典（open/close/volume列）、字典列表、ccxt OHLCV行 [ts, o, h, l, c, v]
+    """
+    if hasattr(klines, "columns") or isinstance(klines, dict):
+        return (np.asarray(klines["open"], dtype=np.float64),
+                np.asarray(klines["close"], dtype=np.float64),
+                np.asarray(klines["volume"], dtype=np.float64))
+    if isinstance(klines[0], dict):
+        n = len(klines)
+        return tuple(np.fromiter((k[col] for k in klines), dtype=np.float64, count=n)
+                     for col in ("open", "close", "volume"))
+    rows = np.asarray(klines, dtype=np.float64)
+    return rows[:, 1], rows[:, 4], rows[:, 5]
+
+
+# ==================== 🔥 payload数值字段批量读取 ====================
+
+# (点分路径, 默认值)；缺失/无法转换/NaN/inf 时取默认值
+_METRIC_SCHEMA = (
+    ("score", 0.0),
+    ("price", 0.0),
+    ("metrics.rsi", 50.0),
+    ("metrics.adx", 0.0),
+    ("metrics.vol_spike_ratio", 1.0),
+    ("metrics.bb_width", 0.03),
+    ("metrics.atr", 0.0),
+    ("metrics.price_change_24h_pct", 0.0),
+    ("metrics.divergence_strength", 0.0),
+    ("calculated_stops.sl_pct", 3.0),
+    ("subscores.orderbook", 0.5),
+    ("funding.rate", 0.0),
+    ("btc_status.price_change_1h", 0.0),
+    ("correlation_analysis.correlation_value", 0.0),
+    ("pullback_pct", 0.0),
+)
+(IDX_SCORE, IDX_PRICE, IDX_RSI, IDX_ADX, IDX_VOL_SPIKE, IDX_BB_WIDTH, IDX_ATR, IDX_PRICE_CHANGE_24H,
+ IDX_DIV_STRENGTH, IDX_SL_PCT, IDX_ORDERBOOK, IDX_FUNDING_RATE, IDX_BTC_CHANGE_1H, IDX_CORR_VALUE,
+ IDX_PULLBACK_PCT) = range(len(_METRIC_SCHEMA))
+
+# 路径预先拆分，避免每次审核重复split
+_METRIC_PATHS = tuple((tuple(path.split(".")), default) for path, default in _METRIC_SCHEMA)
+
+
+def _unpack(payload: Dict, paths=_METRIC_PATHS) -> List[float]:
+    """
+    一次读出payload的全部数值字段（按IDX_*下标访问）
+    
+    中间层缺失/为None、值无法转为浮点数或为NaN/inf时取该字段默认值
+    
+    逐字段float()+isfinite：只有15个字段，np.asarray+np.where整体转换反而慢约一倍（数组构造开销），
+    且遇到无法转换的值时整批失败；try在CPython 3.11+无异常时没有额外开销
+    """
+    out = []
+    for keys, default in paths:
+        obj = payload
+        for key in keys:
+            if not isinstance(obj, dict):
+                obj = None
+                break
+            obj = obj.get(key)
+        if obj is None:
+            out.append(default)
+            continue
+        try:
+            v = float(obj)
+        except Exception:
+            out.append(default)
+            continue
+        out.append(v if math.isfinite(v) else default)
+    return out
 
 
 # ==================== 🔥 统一配置读取（v7.9.1极端收紧）====================
@@ -60,6 +589,74 @@ def get_rsi_thresholds(cfg: Dict) -> Dict:
     }
 
 
+class HardRulesConfig(NamedTuple):
+    """硬规则用到的全部配置阈值（每份cfg只解析一次）"""
+    # RSI阈值
+    long_max: float
+    short_min: float
+    extreme_long: float
+    extreme_short: float
+    # 趋势预判
+    ta_min_score: float
+    ta_min_adx: float
+    ta_long_rsi_range: List[float]
+    ta_short_rsi_range: List[float]
+    ta_max_bb_width: float
+    ta_min_volume_ratio: float
+    # 趋势延续
+    tc_min_score: float
+    tc_adx_min: float
+    # 反转
+    min_score: float
+    min_volume_ratio: float
+    max_price_change_extreme: float
+    max_price_change_high: float
+    price_change_high_min_score: float
+    price_change_high_min_vol: float
+
+
+def resolve_hard_rules_config(cfg: Dict, rsi_cfg: Dict) -> HardRulesConfig:
+    """一次性读取硬规则配置子树（默认值与原先分散读取时一致）"""
+    ta_cfg = cfg.get("trend_anticipation", {})
+    hard_filter = ta_cfg.get("hard_filter", {})
+    tc_cfg = cfg.get("trend_continuation", {})
+    hard_rules = cfg.get("review", {}).get("hard_rules", {})
+    
+    return HardRulesConfig(
+        long_max=rsi_cfg["long_max"],
+        short_min=rsi_cfg["short_min"],
+        extreme_long=rsi_cfg["extreme_long"],
+        extreme_short=rsi_cfg["extreme_short"],
+        ta_min_score=ta_cfg.get("scoring", {}).get("min_score_to_emit", 0.85),          # 🔥 v7.9.3: 0.80->0.85
+        ta_min_adx=hard_filter.get("min_adx", 28),                                      # 🔥 v7.9.3: 25->28
+        ta_long_rsi_range=ta_cfg.get("long_conditions", {}).get("rsi_range", [12, 20]),  # 🔥 v7.9.3: [18,28]->[12,20]
+        ta_short_rsi_range=ta_cfg.get("short_conditions", {}).get("rsi_range", [80, 88]),  # 🔥 v7.9.3: [72,82]->[80,88]
+        ta_max_bb_width=hard_filter.get("max_bb_width", 0.022),                         # 🔥 v7.9.3: 0.025->0.022
+        ta_min_volume_ratio=hard_filter.get("min_volume_ratio", 1.0),                   # 🔥 v7.9.3: 0.5->1.0
+        tc_min_score=tc_cfg.get("scoring", {}).get("base_score", 0.65),
+        tc_adx_min=tc_cfg.get("signal", {}).get("adx_min", 20),
+        # 优先级: review.hard_rules.min_score > push.thresholds.majors
+        min_score=hard_rules.get("min_score", cfg.get("push", {}).get("thresholds", {}).get("majors", 0.55)),
+        # 🔥🔥🔥 v7.9.3从统一配置读取，提高到2.0x
+        min_volume_ratio=cfg.get("reversal_strategy", {}).get("min_volume_ratio",
+                                                              hard_rules.get("min_volume_ratio", 2.0)),  # 🔥 v7.9.3: 1.8->2.0
+        max_price_change_extreme=hard_rules.get("max_price_change_extreme", 0.60),
+        max_price_change_high=hard_rules.get("max_price_change_high", 0.40),
+        price_change_high_min_score=hard_rules.get("price_change_high_min_score", 0.86),
+        price_change_high_min_vol=hard_rules.get("price_change_high_min_vol", 1.0),
+    )
+
+
+class HardRuleContext(NamedTuple):
+    """各信号类型硬规则处理函数共用的输入（payload只解析一次）"""
+    payload: Dict
+    metrics: Dict
+    vals: List[float]  # _unpack结果，按IDX_*下标读取
+    symbol: str
+    side: str
+    cfg: HardRulesConfig
+
+
 class ClaudeReviewer:
     """
     Claude审核器 - 双AI版
@@ -71,6 +668,123 @@ class ClaudeReviewer:
     4. 返回整合结果
     """
     
+    # ========== 🔥 审核提示词模板（str.format_map填充，{{ }}为JSON示例的字面花括号）==========
+    
+    _DEEPSEEK_SYSTEM_PROMPT = """你是加密货币交易分析专家，负责审核交易信号。
+
+🎯 **审核原则**：
+- 趋势预判信号特点是"提前布局"，RSI在15-30做多、70-85做空是合理区间
+- 反转信号需要更极端的RSI（<15做多，>85做空）
+- 重点关注：趋势方向、支撑阻力、BTC配合
+
+⛔ **必须拒绝**：
+1. BTC明显下跌（1h跌>1.0%）时做多
+2. BTC明显上涨（1h涨>1.0%）时做空
+3. 完全没有支撑/阻力确认
+
+✅ **可以通过**：
+1. 预判信号：RSI 15-30做多或70-85做空 + 布林带收窄
+2. 反转信号：RSI <15做多或>85做空 + 成交量放大
+3. BTC稳定（变化<0.5%）或方向配合
+
+📊 审核通过率目标：40-50%
+
+只返回JSON，第一个键必须是approved。"""
+    
+    _MACD_STATUS_MAP = {"golden": "✅ 金叉(看涨)", "death": "⚠️ 死叉(看跌)"}
+    
+    # 信号数据模板（审核规则见 _REVIEW_RUBRIC，位于system中）
+    _PROMPT_TREND_ANTICIPATION = """
+## 🔮 趋势预判信号审核 - 严格模式（按【🔮 趋势预判信号】规则判断）
+
+### 基础信息
+- 币种: {symbol}
+- 方向: {side_upper}
+- 当前价: ${price:.6f}
+- 综合评分: {score:.2f}
+
+### 🔥 预判信号核心指标
+- 最近支撑位: ${nearest_support:.6f} ({support_type})
+- 距支撑位: {support_distance:.2f}%
+- K线形态: {patterns_text}
+- 成交量结构: {volume_structure}
+- 多时间框架确认数: {mtf_confirm}个
+
+### 技术指标
+- RSI: {rsi:.1f} （预判区间，非极值）
+- ADX: {adx:.1f} （趋势强度）
+- 成交量: {vol_ratio:.2f}x均量
+- MACD: {macd_status}
+
+### BTC背景 ⚠️关键判断依据
+- BTC趋势: {btc_trend}
+- BTC 1h变化: {btc_change_1h:+.2f}%
+- 相关性: {btc_corr_text}
+{history_text}
+"""
+    
+    _PROMPT_TREND_CONTINUATION = """
+## 📈 趋势延续信号审核（按【📈 趋势延续信号】规则判断）
+
+### 基础信息
+- 币种: {symbol}
+- 方向: {side_upper}
+- 当前价: ${price:.6f}
+- 综合评分: {score:.2f}
+
+### 趋势延续核心指标
+- BTC 1h变化: {btc_change_1h_x100:+.2f}%
+- 与BTC相关性: {corr_value:.2f}
+- 回调幅度: {pullback_pct_x100:+.2f}%
+
+### 技术指标
+- RSI: {rsi:.1f} | ADX: {adx:.1f}
+- 成交量: {vol_ratio:.2f}x均量
+"""
+    
+    _PROMPT_REVERSAL = """
+## 🔄 反转信号审核（按【🔄 反转信号】规则判断）
+
+### 🔥🔥🔥 v10.0新增：反转质量指标
+- **CVD背离**: {cvd_status}
+- **Funding拥挤**: {funding_status}
+
+### 基础信息
+- 币种: {symbol}
+- 方向: {side_upper}
+- 当前价: ${price:.6f}
+- 综合评分: {score:.2f}
+
+### 技术指标
+- RSI: {rsi:.1f} {rsi_label}
+- ADX: {adx:.1f}
+- 成交量: {vol_ratio:.2f}x均量 {vol_label}
+- MACD: {macd_status}
+- 背离: {divergence_desc}
+
+### 🚨 关键判断 - 动能状态
+- 动能减弱: {momentum_status}
+- 趋势状态: {trending_status}
+
+### BTC背景 ⚠️关键判断依据
+- BTC趋势: {btc_trend}
+- BTC 1h变化: {btc_change_1h:+.2f}%
+- 相关性: {btc_corr_text}
+"""
+    
+    _PROMPT_BATCH = """以下共{count}个交易信号，请按每个信号各自的审核要求独立判断（信号之间互不影响）。
+
+{signals}
+
+### 📦 批量返回格式（代替上面各信号中的单个JSON要求）
+只返回一个JSON对象，reviews数组中每个信号一个元素，index为信号编号（从1开始）:
+```json
+{{"reviews": [
+    {{"index": 1, "approved": true/false, "confidence": 0.0-1.0, "side": "long"/"short", "reasoning": "20字以内简短理由"}}
+]}}
+```
+"""
+    
     def __init__(self, config: Dict):
         """初始化审核器"""
         self.config = config
@@ -82,6 +796,15 @@ class ClaudeReviewer:
         if not self.claude_api_key:
             raise ValueError("⛔ 缺少Claude API Key")
         
+        # 🔥 Claude客户端只创建一次，连接池保持keep-alive，避免每次审核重新TCP+TLS握手
+        self._anthropic_client = anthropic.Anthropic(
+            api_key=self.claude_api_key,
+            http_client=httpx.Client(
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0),
+                timeout=120.0
+            )
+        )
+        
         # DeepSeek配置（可选）
         deepseek_cfg = config.get("deepseek", {})
         self.deepseek_enabled = deepseek_cfg.get("enabled", False)
@@ -89,9 +812,48 @@ class ClaudeReviewer:
         self.deepseek_model = deepseek_cfg.get("model", "deepseek-chat")
         self.deepseek_base_url = deepseek_cfg.get("base_url", "https://api.deepseek.com/v1")
         self.deepseek_timeout = deepseek_cfg.get("timeout", 60)
+        # 🔥 流式读取AI回复，一旦确定拒绝立即断开（拒绝理由不再等待）
+        self.stream_early_reject = config.get("review", {}).get("stream_early_reject", True)
+        # 🔥 对冲备审：DeepSeek超过parallel_fallback_delay_sec仍未返回时才提前发起Claude备审，
+        #    DeepSeek连接失败可直接取Claude结果；备审一旦发出就会计费，默认关闭
+        self.parallel_fallback = deepseek_cfg.get("parallel_fallback", False)
+        self.parallel_fallback_delay_sec = deepseek_cfg.get("parallel_fallback_delay_sec", 5.0)
+        
+        # 🔥 AI审核线程池（被放弃的Claude备审仍会占用一个线程直到返回，所以留出余量）
+        self._review_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="AI-Review")
+        
+        # 🔥 异步审核（review_signals / review_signal_async）：后台事件循环线程与异步客户端，首次使用时创建
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_anthropic: Optional[anthropic.AsyncAnthropic] = None
+        self._async_http: Optional[httpx.AsyncClient] = None
+        self._async_lock = threading.Lock()
+        
+        # 🔥 DeepSeek复用同一个Session（连接池keep-alive），后续请求省去握手
+        self._ds_session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=0)
+        self._ds_session.mount("https://", adapter)
         
         # 🔥 预加载统一RSI阈值
         self.rsi_thresholds = get_rsi_thresholds(config)
+        # 🔥 硬规则配置缓存：最近一次payload的cfg对象 -> 解析结果（cfg通常是同一个全局配置对象）
+        self._cfg_cache: Optional[Tuple[Dict, HardRulesConfig]] = None
+        # 🔥 拒绝冷却缓存：(币种, 信号类型, 方向, 硬规则拒绝编码) -> (monotonic秒, 拒绝结果)；deque按写入顺序记录，用于淘汰过期条目
+        self.reject_cooldown_sec = config.get("review", {}).get("reject_cooldown_sec", 60)
+        self._reject_cache: Dict[Tuple, Tuple[float, Dict]] = {}
+        self._reject_order: deque = deque()
+        self._reject_lock = threading.Lock()
+        
+        # 🔥 信号类型 -> 硬规则/提示词处理函数（未列出的类型按反转处理）
+        self._hard_rules_dispatch = {
+            "trend_anticipation": self._hr_trend_anticipation,
+            "trend_continuation": self._hr_trend_continuation,
+            "reversal": self._hr_reversal,
+        }
+        self._prompt_dispatch = {
+            "trend_anticipation": self._prompt_trend_anticipation,
+            "trend_continuation": self._prompt_trend_continuation,
+            "reversal": self._prompt_reversal,
+        }
         print(f"[CLAUDE_REVIEWER] RSI阈值: 做多≤{self.rsi_thresholds['long_max']} | 做空≥{self.rsi_thresholds['short_min']}")
         
         if self.deepseek_enabled:
@@ -119,14 +881,16 @@ class ClaudeReviewer:
         print(f"\n[REVIEW] 🔍 开始审核 {symbol}...")
         print(f"[REVIEW] 第一关：硬规则过滤")
         
-        passed, reason = self._hard_rules_filter(payload)
+        passed, reason, code = self._hard_rules_filter(payload)
         
         if not passed:
-            print(f"[REVIEW] ⛔ 硬规则拒绝 | {reason}")
-            return self._build_reject_result("hard_rules", reason, payload)
+            return self._hard_reject(payload, reason, code)
         
         print(f"[REVIEW] ✅ 硬规则通过")
-        
+        return self._ai_review(payload)
+    
+    def _ai_review(self, payload: Dict) -> Dict:
+        """第二关AI审核（硬规则已通过）：DeepSeek初审，连接失败回退Claude"""
         # ========== 第二关：DeepSeek初审（v8.0 更宽松）==========
         # 🔥 v8.0: 初审改用DeepSeek，更宽松，成本更低
         # 🔥 v9.0: DeepSeek失败时回退到Claude
@@ -135,20 +899,29 @@ class ClaudeReviewer:
         
         if self.deepseek_enabled and self.deepseek_api_key:
             print(f"[REVIEW] 第二关：DeepSeek初审（更宽松）")
-            ai_result = self._deepseek_review(payload)
+            fut_ds = self._review_pool.submit(self._deepseek_review, payload)
+            fut_cl = None
+            if self.parallel_fallback and not wait([fut_ds], timeout=self.parallel_fallback_delay_sec).done:
+                print(f"[REVIEW] ⏱️ DeepSeek {self.parallel_fallback_delay_sec}s未返回，提前发起Claude备审")
+                fut_cl = self._review_pool.submit(self._claude_review, payload)
+            ai_result = fut_ds.result()
             
             # 🔥🔥🔥 检查是否是API错误导致的拒绝
-            if not ai_result.get("approved", False):
-                reasoning = ai_result.get("reasoning", "")
-                if "调用失败" in reasoning or "连接" in reasoning or "timeout" in reasoning.lower():
-                    print(f"[REVIEW] ⚠️ DeepSeek连接失败，回退到Claude")
-                    ai_result = self._claude_review(payload)
-                    ai_name = "CLAUDE"
+            if self._is_connection_failure(ai_result):
+                print(f"[REVIEW] ⚠️ DeepSeek连接失败，回退到Claude")
+                ai_result = fut_cl.result() if fut_cl is not None else self._claude_review(payload)
+                ai_name = "CLAUDE"
+            elif fut_cl is not None:
+                fut_cl.cancel()  # 还没开始执行时直接取消；已在请求中的结果丢弃
         else:
             print(f"[REVIEW] 第二关：Claude审核")
             ai_result = self._claude_review(payload)
             ai_name = "CLAUDE"
         
+        return self._finalize_review(ai_name, ai_result, payload)
+    
+    def _finalize_review(self, ai_name: str, ai_result: Dict, payload: Dict) -> Dict:
+        """记录AI结论并构建统一返回结果"""
         ai_approved = ai_result.get("approved", False)
         ai_status = "✅通过" if ai_approved else "⛔拒绝"
         ai_reason = ai_result.get('reasoning', 'N/A')[:80]
@@ -169,203 +942,324 @@ class ClaudeReviewer:
             payload
         )
     
-    # ========== 🔥 硬规则过滤（使用统一配置）==========
+    @staticmethod
+    def _is_connection_failure(ai_result: Dict) -> bool:
+        """AI拒绝是否由API调用失败/连接问题导致（而非真实审核结论）"""
+        if ai_result.get("approved", False):
+            return False
+        reasoning = ai_result.get("reasoning", "")
+        return "调用失败" in reasoning or "连接" in reasoning or "timeout" in reasoning.lower()
     
-    def _hard_rules_filter(self, payload: Dict) -> Tuple[bool, str]:
-        """硬规则过滤 - 🔥使用统一RSI配置"""
-        
-        m = payload.get("metrics", {}) or {}
-        subs = payload.get("subscores", {}) or {}
-        stops = payload.get("calculated_stops", {}) or {}
+    # ========== 🔥 拒绝冷却缓存 ==========
+    
+    def _hard_reject(self, payload: Dict, reason: str, code: int) -> Dict:
+        """
+        硬规则拒绝结果；(币种, 信号类型, 方向, 拒绝编码) 冷却期内重复命中时复用上次的结果
         
+        硬规则每次都会重新计算，缓存只合并同一条规则的连续拒绝（原因文本换成本次的数值），
+        不会跳过任何检查；AI结论不缓存。
+        """
         symbol = payload.get("symbol", "UNKNOWN")
-        score = self._safe_float(payload.get("score"), 0.0)
-        price = self._safe_float(payload.get("price"), 0.0)
-        side = payload.get("bias", "long").lower()
-        
-        rsi = self._safe_float(m.get("rsi"), 50.0)
-        adx = self._safe_float(m.get("adx"), 0.0)
-        vol_spike = self._safe_float(m.get("vol_spike_ratio"), 1.0)
-        bb_width = self._safe_float(m.get("bb_width"), 0.03)
-        atr = self._safe_float(m.get("atr"), 0.0)
-        atr_pct = (atr / price * 100) if price > 0 else 2.0
+        key = (symbol, self._signal_type(payload), payload.get("bias", "long").lower(), int(code))
+        cached = self._cached_reject(key)
+        if cached is not None:
+            print(f"[REVIEW] ⏸️ {symbol} 冷却期内同一硬规则重复拒绝 | {reason}")
+            cached["reasoning"] = reason
+            return cached
+        print(f"[REVIEW] ⛔ 硬规则拒绝 | {reason}")
+        return self._remember_reject(key, self._build_reject_result("hard_rules", reason, payload))
+    
+    def _cached_reject(self, key: Tuple) -> Optional[Dict]:
+        """冷却期内的拒绝结果（返回副本），没有时返回None"""
+        if self.reject_cooldown_sec <= 0:
+            return None
+        now = time.monotonic()
+        with self._reject_lock:
+            # 按时间顺序淘汰过期条目；同一key被重新写入过时只删除最新的那次
+            while self._reject_order and now - self._reject_order[0][0] >= self.reject_cooldown_sec:
+                ts, old_key = self._reject_order.popleft()
+                entry = self._reject_cache.get(old_key)
+                if entry is not None and entry[0] == ts:
+                    del self._reject_cache[old_key]
+            entry = self._reject_cache.get(key)
+        return dict(entry[1]) if entry is not None else None
+    
+    def _remember_reject(self, key: Tuple, result: Dict) -> Dict:
+        """记录硬规则拒绝结果，原样返回result"""
+        if self.reject_cooldown_sec <= 0:
+            return result
+        now = time.monotonic()
+        with self._reject_lock:
+            self._reject_cache[key] = (now, dict(result))
+            self._reject_order.append((now, key))
+        return result
+    
+    # ========== 🔥 批量审核 ==========
+    
+    def review_batch(self, payloads: List[Dict]) -> List[Dict]:
+        """
+        批量审核：硬规则逐个过滤，通过的信号合并成一次AI调用
         
-        sl_pct = self._safe_float(stops.get("sl_pct"), 3.0)
-        orderbook = self._safe_float(subs.get("orderbook"), 0.5)
+        只剩一个信号时走单信号流程；批量调用失败或某个信号没有有效结果时，该信号回退到单独审核
         
-        funding = payload.get("funding", {})
-        raw_funding_rate = self._safe_float(funding.get("rate"), 0.0)
+        Returns:
+            与payloads一一对应的审核结果
+        """
+        results: List[Optional[Dict]] = [None] * len(payloads)
+        pending = []
+        for i, payload in enumerate(payloads):
+            print(f"\n[REVIEW] 🔍 开始审核 {payload.get('symbol', 'UNKNOWN')}（批量）...")
+            passed, reason, code = self._hard_rules_filter(payload)
+            if passed:
+                pending.append(i)
+            else:
+                results[i] = self._hard_reject(payload, reason, code)
+        
+        if len(pending) > 1:
+            ai_name, batch_results = self._batch_ai_review([payloads[i] for i in pending])
+            for i, ai_result in zip(pending, batch_results):
+                if ai_result is not None:
+                    results[i] = self._finalize_review(ai_name, ai_result, payloads[i])
+        
+        for i in pending:
+            if results[i] is None:
+                results[i] = self._ai_review(payloads[i])
+        return results
+    
+    def _batch_ai_review(self, batch: List[Dict]) -> Tuple[str, List[Optional[Dict]]]:
+        """一次AI调用审核多个信号，返回 (AI名称, 按信号顺序的结果)；缺失或无效的位置为None"""
+        use_deepseek = bool(self.deepseek_enabled and self.deepseek_api_key)
+        ai_name = "DEEPSEEK" if use_deepseek else "CLAUDE"
+        prompt_name = "DeepSeek" if use_deepseek else "Claude"
+        
+        sections = [
+            f"# 信号 {i}/{len(batch)}\n{self._build_review_prompt(payload, prompt_name)}"
+            for i, payload in enumerate(batch, 1)
+        ]
+        messages = [{"role": "user", "content": self._PROMPT_BATCH.format(count=len(batch), signals="\n\n".join(sections))}]
+        if use_deepseek:
+            messages.insert(0, {"role": "system", "content": self._DEEPSEEK_SYSTEM_PROMPT + "\n" + _REVIEW_RUBRIC})
+        complete = self._deepseek_complete if use_deepseek else self._claude_complete
+        max_tokens = min(_BATCH_MAX_TOKENS, _BATCH_TOKENS_PER_SIGNAL * len(batch))
+        
+        print(f"[{ai_name}] 📦 批量审核 {len(batch)} 个信号")
+        try:
+            items = self._parse_batch_response(complete(messages, max_tokens=max_tokens))
+        except Exception as e:
+            print(f"[{ai_name}] ⚠️ 批量审核失败，逐个回退: {e}")
+            return ai_name, [None] * len(batch)
+        
+        results: List[Optional[Dict]] = [None] * len(batch)
+        for pos, item in enumerate(items or []):
+            if not isinstance(item, dict) or "approved" not in item:
+                continue
+            index = item.get("index", pos + 1)
+            if isinstance(index, int) and 1 <= index <= len(batch) and results[index - 1] is None:
+                item["_source"] = ai_name.lower()
+                results[index - 1] = item
+        return ai_name, results
+    
+    def _resolve_cfg(self, cfg: Dict) -> HardRulesConfig:
+        """按cfg对象身份缓存硬规则配置；cfg为空时RSI阈值用初始化时加载的实例配置"""
+        cached = self._cfg_cache
+        if cached is not None and cached[0] is cfg:
+            return cached[1]
+        rsi_cfg = get_rsi_thresholds(cfg) if cfg else self.rsi_thresholds
+        hard_cfg = resolve_hard_rules_config(cfg, rsi_cfg)
+        self._cfg_cache = (cfg, hard_cfg)  # 持有cfg引用，避免id被新对象复用
+        return hard_cfg
+    
+    # ========== 🔥 硬规则过滤（使用统一配置）==========
+    
+    def _hard_rules_filter(self, payload: Dict) -> Tuple[bool, str, int]:
+        """硬规则过滤 - 🔥使用统一RSI配置；按信号类型分派到 _hr_* 处理函数，返回 (通过, 原因, 拒绝编码)"""
         
-        cfg = payload.get("cfg", {})
+        vals = _unpack(payload)
+        side = payload.get("bias", "long").lower()
+        symbol = payload.get("symbol", "UNKNOWN")
         
-        # ========== 🔥 从统一配置读取RSI阈值 ==========
-        # 优先使用实例变量（初始化时已加载），其次从payload的cfg读取
-        rsi_cfg = get_rsi_thresholds(cfg) if cfg else self.rsi_thresholds
-        reversal_long_max = rsi_cfg["long_max"]
-        reversal_short_min = rsi_cfg["short_min"]
-        extreme_rsi_long = rsi_cfg["extreme_long"]
-        extreme_rsi_short = rsi_cfg["extreme_short"]
+        # ========== 🔥 从统一配置读取阈值（按cfg对象缓存）==========
+        # payload的cfg为空时RSI阈值使用实例变量（初始化时已加载）
+        hard_cfg = self._resolve_cfg(payload.get("cfg", {}))
         
-        print(f"[HARD_RULES] {symbol} | RSI:{rsi:.1f} 方向:{side} | 阈值:做多≤{reversal_long_max}/做空≥{reversal_short_min}")
+        print(f"[HARD_RULES] {symbol} | RSI:{vals[IDX_RSI]:.1f} 方向:{side} | 阈值:做多≤{hard_cfg.long_max}/做空≥{hard_cfg.short_min}")
         
-        # 🔥🔥🔥 读取信号类型（可能在顶层或signal_info里）
+        ctx = HardRuleContext(payload, payload.get("metrics", {}) or {}, vals, symbol, side, hard_cfg)
+        handler = self._hard_rules_dispatch.get(self._signal_type(payload), self._hr_reversal)
+        return handler(ctx)
+    
+    @staticmethod
+    def _signal_type(payload: Dict) -> str:
+        """读取信号类型（可能在顶层或signal_info里）"""
         signal_type = payload.get("signal_type", "unknown")
         if signal_type == "unknown":
             signal_info = payload.get("signal_info", {})
             signal_type = signal_info.get("signal_type", "unknown")
+        return signal_type
+    
+    def _hr_trend_anticipation(self, ctx: HardRuleContext) -> Tuple[bool, str, int]:
+        """🔥🔥🔥 趋势预判信号的硬规则检查（v9.2大幅加强）"""
+        m, vals, side, hard_cfg, payload = ctx.metrics, ctx.vals, ctx.side, ctx.cfg, ctx.payload
+        score = vals[IDX_SCORE]
+        rsi = vals[IDX_RSI]
+        adx = vals[IDX_ADX]
+        vol_spike = vals[IDX_VOL_SPIKE]
+        bb_width = vals[IDX_BB_WIDTH]
+        orderbook = vals[IDX_ORDERBOOK]
+        raw_funding_rate = vals[IDX_FUNDING_RATE]
+        
+        print(f"[TREND_ANTICIPATION] ✅ 趋势预判信号，使用专用硬规则")
+        
+        # 1. 评分检查（🔥 v7.9.3提高到0.85）
+        ta_min_score = hard_cfg.ta_min_score
+        if score < ta_min_score:
+            return _reject(RejectCode.TA_SCORE, score=score, min_score=ta_min_score)
+        print(f"[TREND_ANTICIPATION] ✅ 评分{score:.2f}≥{ta_min_score:.2f}")
+        
+        # 2. ADX趋势检查（🔥🔥 v7.9.3: 提高到28）
+        min_adx = hard_cfg.ta_min_adx
+        if adx < min_adx:
+            return _reject(RejectCode.TA_ADX, adx=adx, min_adx=min_adx)
+        print(f"[TREND_ANTICIPATION] ✅ ADX{adx:.1f}≥{min_adx}")
+        
+        # 3. RSI检查（🔥 v7.9.3大幅收窄：12-20/80-88）
+        if side == "long":
+            rsi_range = hard_cfg.ta_long_rsi_range
+            if not (rsi_range[0] <= rsi <= rsi_range[1]):
+                return _reject(RejectCode.TA_RSI_LONG, rsi=rsi, rsi_range=rsi_range)
+            print(f"[TREND_ANTICIPATION] ✅ RSI{rsi:.1f}在做多预判区间")
+        else:
+            rsi_range = hard_cfg.ta_short_rsi_range
+            if not (rsi_range[0] <= rsi <= rsi_range[1]):
+                return _reject(RejectCode.TA_RSI_SHORT, rsi=rsi, rsi_range=rsi_range)
+            print(f"[TREND_ANTICIPATION] ✅ RSI{rsi:.1f}在做空预判区间")
+        
+        # 🔥🔥 4. 蓄势确认（布林带宽度收紧：🔥 v7.9.3: 2.5%->2.2%）
+        max_bb_width = hard_cfg.ta_max_bb_width
+        if bb_width > max_bb_width:
+            return _reject(RejectCode.TA_BB_WIDTH, bb_width_pct=bb_width * 100, max_bb_width_pct=max_bb_width * 100)
+        print(f"[TREND_ANTICIPATION] ✅ 布林带{bb_width*100:.1f}%≤{max_bb_width*100:.1f}% 蓄势中")
+        
+        # 🔥🔥 5. 成交量检查（🔥 v7.9.3: 0.5x->1.0x）
+        min_vol = hard_cfg.ta_min_volume_ratio
+        if vol_spike < min_vol:
+            return _reject(RejectCode.TA_VOLUME, vol_spike=vol_spike, min_vol=min_vol)
+        print(f"[TREND_ANTICIPATION] ✅ 成交量{vol_spike:.1f}x≥{min_vol:.1f}x")
+        
+        # 6. 资金费率检查（🔥 v7.9.3收紧：0.15%->0.12%）
+        if abs(raw_funding_rate) > 0.0012:  # 🔥 v7.9.3: 0.0015->0.0012
+            if side == "long" and raw_funding_rate > 0.0012:
+                return _reject(RejectCode.TA_FUNDING_LONG, funding_rate=raw_funding_rate)
+            if side == "short" and raw_funding_rate < -0.0012:
+                return _reject(RejectCode.TA_FUNDING_SHORT, funding_rate=raw_funding_rate)
+        print(f"[TREND_ANTICIPATION] ✅ 资金费率{raw_funding_rate:.4f}正常")
+        
+        # 🔥🔥 7. 订单簿深度（🔥 v7.9.3: 0.40->0.45）
+        if orderbook < 0.45:  # 🔥 v7.9.3: 0.40->0.45
+            return _reject(RejectCode.TA_ORDERBOOK, orderbook=orderbook)
+        print(f"[TREND_ANTICIPATION] ✅ 订单簿{orderbook:.2f}≥0.45")
+        
+        # 🔥🔥🔥 8. 新增：动能减弱确认
+        momentum_weakening = m.get("momentum_weakening", False)
+        if not momentum_weakening:
+            # 如果没有动能减弱，需要更高的评分才能通过
+            if score < 0.90:
+                return _reject(RejectCode.TA_MOMENTUM, score=score)
+            print(f"[TREND_ANTICIPATION] ⚠️ 动能未减弱但评分{score:.2f}足够高")
+        else:
+            print(f"[TREND_ANTICIPATION] ✅ 动能减弱确认")
         
-        # 🔥🔥🔥 趋势预判信号的硬规则检查（v9.2大幅加强）
-        if signal_type == "trend_anticipation":
-            print(f"[TREND_ANTICIPATION] ✅ 趋势预判信号，使用专用硬规则")
-            
-            # 🔥🔥🔥 v9.2: 从配置读取加强后的阈值
-            ta_cfg = cfg.get("trend_anticipation", {})
-            hard_filter = ta_cfg.get("hard_filter", {})
-            
-            # 1. 评分检查（🔥 v7.9.3提高到0.85）
-            ta_min_score = ta_cfg.get("scoring", {}).get("min_score_to_emit", 0.85)  # 🔥 v7.9.3: 0.80->0.85
-            if score < ta_min_score:
-                return False, f"❌ 趋势预判评分{score:.2f}<{ta_min_score:.2f}"
-            print(f"[TREND_ANTICIPATION] ✅ 评分{score:.2f}≥{ta_min_score:.2f}")
-            
-            # 2. ADX趋势检查（🔥🔥 v7.9.3: 提高到28）
-            min_adx = hard_filter.get("min_adx", 28)  # 🔥 v7.9.3: 25->28
-            if adx < min_adx:
-                return False, f"❌ ADX{adx:.1f}<{min_adx} 趋势不明确"
-            print(f"[TREND_ANTICIPATION] ✅ ADX{adx:.1f}≥{min_adx}")
-            
-            # 3. RSI检查（🔥 v7.9.3大幅收窄：12-20/80-88）
-            if side == "long":
-                rsi_range = ta_cfg.get("long_conditions", {}).get("rsi_range", [12, 20])  # 🔥 v7.9.3: [18,28]->[12,20]
-                if not (rsi_range[0] <= rsi <= rsi_range[1]):
-                    return False, f"❌ 趋势预判做多RSI{rsi:.1f}不在{rsi_range[0]}-{rsi_range[1]}区间"
-                print(f"[TREND_ANTICIPATION] ✅ RSI{rsi:.1f}在做多预判区间")
-            else:
-                rsi_range = ta_cfg.get("short_conditions", {}).get("rsi_range", [80, 88])  # 🔥 v7.9.3: [72,82]->[80,88]
-                if not (rsi_range[0] <= rsi <= rsi_range[1]):
-                    return False, f"❌ 趋势预判做空RSI{rsi:.1f}不在{rsi_range[0]}-{rsi_range[1]}区间"
-                print(f"[TREND_ANTICIPATION] ✅ RSI{rsi:.1f}在做空预判区间")
-            
-            # 🔥🔥 4. 蓄势确认（布林带宽度收紧：🔥 v7.9.3: 2.5%->2.2%）
-            max_bb_width = hard_filter.get("max_bb_width", 0.022)  # 🔥 v7.9.3: 0.025->0.022
-            if bb_width > max_bb_width:
-                return False, f"❌ 布林带{bb_width*100:.1f}%>{max_bb_width*100:.1f}% 未蓄势"
-            print(f"[TREND_ANTICIPATION] ✅ 布林带{bb_width*100:.1f}%≤{max_bb_width*100:.1f}% 蓄势中")
-            
-            # 🔥🔥 5. 成交量检查（🔥 v7.9.3: 0.5x->1.0x）
-            min_vol = hard_filter.get("min_volume_ratio", 1.0)  # 🔥 v7.9.3: 0.5->1.0
-            if vol_spike < min_vol:
-                return False, f"❌ 成交量{vol_spike:.1f}x<{min_vol:.1f}x 太低"
-            print(f"[TREND_ANTICIPATION] ✅ 成交量{vol_spike:.1f}x≥{min_vol:.1f}x")
-            
-            # 6. 资金费率检查（🔥 v7.9.3收紧：0.15%->0.12%）
-            if abs(raw_funding_rate) > 0.0012:  # 🔥 v7.9.3: 0.0015->0.0012
-                if side == "long" and raw_funding_rate > 0.0012:
-                    return False, f"❌ 做多但资金费率{raw_funding_rate:.4f}>0.12%"
-                if side == "short" and raw_funding_rate < -0.0012:
-                    return False, f"❌ 做空但资金费率{raw_funding_rate:.4f}<-0.12%"
-            print(f"[TREND_ANTICIPATION] ✅ 资金费率{raw_funding_rate:.4f}正常")
-            
-            # 🔥🔥 7. 订单簿深度（🔥 v7.9.3: 0.40->0.45）
-            if orderbook < 0.45:  # 🔥 v7.9.3: 0.40->0.45
-                return False, f"❌ 订单簿{orderbook:.2f}<0.45 深度不足"
-            print(f"[TREND_ANTICIPATION] ✅ 订单簿{orderbook:.2f}≥0.45")
-            
-            # 🔥🔥🔥 8. 新增：动能减弱确认
-            momentum_weakening = m.get("momentum_weakening", False)
-            if not momentum_weakening:
-                # 如果没有动能减弱，需要更高的评分才能通过
-                if score < 0.90:
-                    return False, f"❌ 动能未减弱且评分{score:.2f}<0.90"
-                print(f"[TREND_ANTICIPATION] ⚠️ 动能未减弱但评分{score:.2f}足够高")
-            else:
-                print(f"[TREND_ANTICIPATION] ✅ 动能减弱确认")
-            
-            # 🔥🔥🔥 9. v7.9.3加强：BTC方向一致性检查（更严格）
-            btc_status = payload.get("btc_status", {})
-            btc_trend = btc_status.get("trend", "unknown")
-            btc_change_1h = self._safe_float(btc_status.get("price_change_1h"), 0.0)
-            
-            # 🔥🔥🔥 v7.9.3: btc_change_1h 已经是百分比形式
-            # 做多时BTC不能下跌，做空时BTC不能上涨（阈值从2%收紧到1%）
-            if side == "long":
-                if btc_change_1h < -1.0:  # 🔥🔥 v7.9.3: -2.0 -> -1.0 (更严格)
-                    return False, f"❌ 做多但BTC 1h跌{btc_change_1h:.1f}%，方向冲突"
-                if btc_trend == "CRASH":
-                    return False, f"❌ 做多但BTC暴跌中，方向冲突"
-                if btc_trend == "DOWN" and btc_change_1h < -0.5:  # 🔥 v7.9.3新增
-                    return False, f"❌ 做多但BTC下跌中({btc_change_1h:.1f}%)，方向冲突"
-            else:  # short
-                if btc_change_1h > 1.0:  # 🔥🔥 v7.9.3: 2.0 -> 1.0 (更严格)
-                    return False, f"❌ 做空但BTC 1h涨{btc_change_1h:.1f}%，方向冲突"
-                if btc_trend == "MOON":
-                    # 🔥 BTC强势上涨时，做空需要更严格条件
-                    if score < 0.93:  # 🔥 v7.9.3: 0.92 -> 0.93
-                        return False, f"❌ BTC强势上涨，做空需评分≥0.93 | 当前:{score:.2f}"
-                    print(f"[TREND_ANTICIPATION] ⚠️ BTC强势但做空评分{score:.2f}足够高")
-                if btc_trend == "UP" and btc_change_1h > 0.5:  # 🔥 v7.9.3新增
-                    if score < 0.90:
-                        return False, f"❌ BTC上涨中({btc_change_1h:.1f}%)，做空需评分≥0.90 | 当前:{score:.2f}"
-            print(f"[TREND_ANTICIPATION] ✅ BTC方向检查通过 | 趋势:{btc_trend} 1h:{btc_change_1h:+.1f}%")
-            
-            print(f"[TREND_ANTICIPATION] ✅ 硬规则通过 → 交给AI审核")
-            return True, "趋势预判信号硬规则通过"
-        
-        # 🔥🔥🔥 新增：趋势延续信号的硬规则检查
-        if signal_type == "trend_continuation":
-            print(f"[TREND_CONT] ✅ 趋势延续信号，使用专用硬规则")
-            
-            tc_min_score = cfg.get("trend_continuation", {}).get("scoring", {}).get("base_score", 0.65)
-            if score < tc_min_score:
-                return False, f"❌ 趋势延续评分{score:.2f}<{tc_min_score:.2f}"
-            
-            tc_adx_min = cfg.get("trend_continuation", {}).get("signal", {}).get("adx_min", 20)
-            if adx < tc_adx_min:
-                return False, f"❌ ADX{adx:.1f}<{tc_adx_min} 趋势不明确"
-            
-            if abs(raw_funding_rate) > 0.0015:
-                if side == "long" and raw_funding_rate > 0.0015:
-                    return False, f"❌ 做多但资金费率{raw_funding_rate:.4f}>0.15%"
-                if side == "short" and raw_funding_rate < -0.0015:
-                    return False, f"❌ 做空但资金费率{raw_funding_rate:.4f}<-0.15%"
-            
-            if orderbook < 0.25:
-                return False, f"❌ 订单簿{orderbook:.2f}<0.25"
-            
-            print(f"[TREND_CONT] ✅ 硬规则通过 → 交给AI审核")
-            return True, "趋势延续信号硬规则通过"
-        
-        # ========== 以下是反转信号的完整硬规则检查 ==========
+        # 🔥🔥🔥 9. v7.9.3加强：BTC方向一致性检查（更严格）
+        btc_status = payload.get("btc_status", {})
+        btc_trend = btc_status.get("trend", "unknown")
+        btc_change_1h = vals[IDX_BTC_CHANGE_1H]
         
-        # 🔥🔥🔥 v10.0新增: CVD背离检测
-        cvd_result = None
-        funding_result = None
-        reversal_quality = None
+        # 🔥🔥🔥 v7.9.3: btc_change_1h 已经是百分比形式
+        # 做多时BTC不能下跌，做空时BTC不能上涨（阈值从2%收紧到1%）
+        if side == "long":
+            if btc_change_1h < -1.0:  # 🔥🔥 v7.9.3: -2.0 -> -1.0 (更严格)
+                return _reject(RejectCode.TA_BTC_DROP_1H, btc_change_1h=btc_change_1h)
+            if btc_trend == "CRASH":
+                return _reject(RejectCode.TA_BTC_CRASH)
+            if btc_trend == "DOWN" and btc_change_1h < -0.5:  # 🔥 v7.9.3新增
+                return _reject(RejectCode.TA_BTC_DOWN, btc_change_1h=btc_change_1h)
+        else:  # short
+            if btc_change_1h > 1.0:  # 🔥🔥 v7.9.3: 2.0 -> 1.0 (更严格)
+                return _reject(RejectCode.TA_BTC_RISE_1H, btc_change_1h=btc_change_1h)
+            if btc_trend == "MOON":
+                # 🔥 BTC强势上涨时，做空需要更严格条件
+                if score < 0.93:  # 🔥 v7.9.3: 0.92 -> 0.93
+                    return _reject(RejectCode.TA_BTC_MOON, score=score)
+                print(f"[TREND_ANTICIPATION] ⚠️ BTC强势但做空评分{score:.2f}足够高")
+            if btc_trend == "UP" and btc_change_1h > 0.5:  # 🔥 v7.9.3新增
+                if score < 0.90:
+                    return _reject(RejectCode.TA_BTC_UP, btc_change_1h=btc_change_1h, score=score)
+        print(f"[TREND_ANTICIPATION] ✅ BTC方向检查通过 | 趋势:{btc_trend} 1h:{btc_change_1h:+.1f}%")
         
-        try:
-            # 获取K线数据（如果有）
-            klines = payload.get("klines")
-            if klines is not None and len(klines) > 0:
-                import pandas as pd
-                if isinstance(klines, pd.DataFrame):
-                    df = klines
-                else:
-                    df = pd.DataFrame(klines)
-                
-                # CVD背离检测
-                cvd_result = self._quick_cvd_check(df)
-                
-                # 🔥 如果是明显的假突破，直接拒绝
-                if cvd_result.get("is_fake_breakout", False) and cvd_result.get("divergence_strength", 0) > 70:
-                    print(f"[REVERSAL] ⚠️ CVD检测到假突破 | 背离强度:{cvd_result['divergence_strength']:.0f}")
-                    return False, f"❌ CVD检测到假突破(背离强度{cvd_result['divergence_strength']:.0f})"
-                
-                # Funding Z-Score检测
+        print(f"[TREND_ANTICIPATION] ✅ 硬规则通过 → 交给AI审核")
+        return True, "趋势预判信号硬规则通过", GUARD_PASS
+    
+    def _hr_trend_continuation(self, ctx: HardRuleContext) -> Tuple[bool, str, int]:
+        """🔥🔥🔥 趋势延续信号的硬规则检查"""
+        vals, side, hard_cfg = ctx.vals, ctx.side, ctx.cfg
+        score = vals[IDX_SCORE]
+        adx = vals[IDX_ADX]
+        orderbook = vals[IDX_ORDERBOOK]
+        raw_funding_rate = vals[IDX_FUNDING_RATE]
+        
+        print(f"[TREND_CONT] ✅ 趋势延续信号，使用专用硬规则")
+        
+        tc_min_score = hard_cfg.tc_min_score
+        if score < tc_min_score:
+            return _reject(RejectCode.TC_SCORE, score=score, min_score=tc_min_score)
+        
+        tc_adx_min = hard_cfg.tc_adx_min
+        if adx < tc_adx_min:
+            return _reject(RejectCode.TC_ADX, adx=adx, min_adx=tc_adx_min)
+        
+        if abs(raw_funding_rate) > 0.0015:
+            if side == "long" and raw_funding_rate > 0.0015:
+                return _reject(RejectCode.TC_FUNDING_LONG, funding_rate=raw_funding_rate)
+            if side == "short" and raw_funding_rate < -0.0015:
+                return _reject(RejectCode.TC_FUNDING_SHORT, funding_rate=raw_funding_rate)
+        
+        if orderbook < 0.25:
+            return _reject(RejectCode.TC_ORDERBOOK, orderbook=orderbook)
+        
+        print(f"[TREND_CONT] ✅ 硬规则通过 → 交给AI审核")
+        return True, "趋势延续信号硬规则通过", GUARD_PASS
+    
+    def _hr_reversal(self, ctx: HardRuleContext) -> Tuple[bool, str, int]:
+        """反转信号的完整硬规则检查（未知信号类型也按反转处理）"""
+        m, vals, side, hard_cfg, payload, symbol = ctx.metrics, ctx.vals, ctx.side, ctx.cfg, ctx.payload, ctx.symbol
+        score = vals[IDX_SCORE]
+        price = vals[IDX_PRICE]
+        rsi = vals[IDX_RSI]
+        adx = vals[IDX_ADX]
+        vol_spike = vals[IDX_VOL_SPIKE]
+        bb_width = vals[IDX_BB_WIDTH]
+        atr = vals[IDX_ATR]
+        atr_pct = (atr / price * 100) if price > 0 else 2.0
+        sl_pct = vals[IDX_SL_PCT]
+        orderbook = vals[IDX_ORDERBOOK]
+        raw_funding_rate = vals[IDX_FUNDING_RATE]
+        
+        reversal_long_max = hard_cfg.long_max
+        reversal_short_min = hard_cfg.short_min
+        extreme_rsi_long = hard_cfg.extreme_long
+        extreme_rsi_short = hard_cfg.extreme_short
+        
+        # 🔥 K线只取引用；CVD放到所有标量硬规则之后，先用廉价检查拒掉大部分候选
+        klines = payload.get("klines")
+        has_klines = hasattr(klines, "__len__") and len(klines) > 0
+        
+        # Funding Z-Score（TTL缓存，开销很小；保持原位置以维持资金费率历史的采样）
+        if has_klines:
+            try:
                 funding_result = self._quick_funding_zscore(symbol, raw_funding_rate)
-                
-                print(f"[REVERSAL] 🔥v10.0: CVD背离={cvd_result.get('divergence', 'none')} | Funding Z={funding_result.get('zscore', 0):.1f}")
-        except Exception as e:
-            print(f"[REVERSAL] CVD/Funding检测异常: {e}")
+                print(f"[REVERSAL] 🔥v10.0: Funding Z={funding_result.get('zscore', 0):.1f}")
+            except Exception as e:
+                print(f"[REVERSAL] Funding检测异常: {e}")
         
         # 判断是否符合反转信号
         is_reversal_long = (side == "long" and rsi <= reversal_long_max)
@@ -378,9 +1272,9 @@ class ClaudeReviewer:
         else:
             # 不是反转信号，直接拒绝
             if side == "long":
-                return False, f"❌ 做多要求RSI≤{reversal_long_max}(超卖) | 当前:{rsi:.1f}"
+                return _reject(RejectCode.RSI_NOT_OVERSOLD, limit=reversal_long_max, rsi=rsi)
             else:
-                return False, f"❌ 做空要求RSI≥{reversal_short_min}(超买) | 当前:{rsi:.1f}"
+                return _reject(RejectCode.RSI_NOT_OVERBOUGHT, limit=reversal_short_min, rsi=rsi)
         
         # 🔥🔥🔥 v7.9新增：检查趋势减弱确认
         momentum_weakening = m.get("momentum_weakening", False)
@@ -392,11 +1286,11 @@ class ClaudeReviewer:
         if still_trending:
             if side == "long" and not bullish_div:
                 if score < 0.80:
-                    return False, f"❌ 还在创新低(趋势中)无背离，要求评分≥0.80 | 当前:{score:.2f}"
+                    return _reject(RejectCode.STILL_FALLING, score=score)
                 print(f"[REVERSAL] ⚠️ 还在创新低但评分足够，允许通过")
             elif side == "short" and not bearish_div:
                 if score < 0.80:
-                    return False, f"❌ 还在创新高(趋势中)无背离，要求评分≥0.80 | 当前:{score:.2f}"
+                    return _reject(RejectCode.STILL_RISING, score=score)
                 print(f"[REVERSAL] ⚠️ 还在创新高但评分足够，允许通过")
         
         # 动能减弱是加分项，记录日志
@@ -404,258 +1298,442 @@ class ClaudeReviewer:
             print(f"[REVERSAL] ✅ 检测到动能减弱，信号质量+")
         
         # 评分阈值 - 🔥 使用yaml配置，优先级: review.hard_rules.min_score > push.thresholds.majors
-        score_threshold = cfg.get("review", {}).get("hard_rules", {}).get("min_score",
-                            cfg.get("push", {}).get("thresholds", {}).get("majors", 0.55))
+        score_threshold = hard_cfg.min_score
         if score < score_threshold:
-            return False, f"❌ 评分{score:.2f}<{score_threshold:.2f}"
+            return _reject(RejectCode.SCORE, score=score, min_score=score_threshold)
         
         # 成交量要求（🔥🔥🔥 v7.9.3从统一配置读取，提高到2.0x）
-        min_vol = cfg.get("reversal_strategy", {}).get("min_volume_ratio", 
-                    cfg.get("review", {}).get("hard_rules", {}).get("min_volume_ratio", 2.0))  # 🔥 v7.9.3: 1.8->2.0
+        min_vol = hard_cfg.min_volume_ratio
         if vol_spike < min_vol:
-            return False, f"❌ 成交量{vol_spike:.2f}x<{min_vol:.1f}x"
+            return _reject(RejectCode.VOLUME, vol_spike=vol_spike, min_vol=min_vol)
         
         # 🔥 暴涨暴跌过滤
-        price_change_24h = self._safe_float(m.get("price_change_24h_pct"), 0.0)
+        price_change_24h = vals[IDX_PRICE_CHANGE_24H]
         price_change_pct = abs(price_change_24h * 100)
         
-        max_extreme = cfg.get("review", {}).get("hard_rules", {}).get("max_price_change_extreme", 0.60)
-        max_high = cfg.get("review", {}).get("hard_rules", {}).get("max_price_change_high", 0.40)
-        high_min_score = cfg.get("review", {}).get("hard_rules", {}).get("price_change_high_min_score", 0.86)
-        high_min_vol = cfg.get("review", {}).get("hard_rules", {}).get("price_change_high_min_vol", 1.0)
+        max_extreme = hard_cfg.max_price_change_extreme
+        max_high = hard_cfg.max_price_change_high
+        high_min_score = hard_cfg.price_change_high_min_score
+        high_min_vol = hard_cfg.price_change_high_min_vol
         
         if abs(price_change_24h) > max_extreme:
-            return False, f"❌ 24h涨跌幅{price_change_pct:.1f}%>{max_extreme*100:.0f}%过于极端"
+            return _reject(RejectCode.PRICE_CHANGE_EXTREME, change_pct=price_change_pct, max_pct=max_extreme * 100)
         
         if abs(price_change_24h) > max_high:
             print(f"[HARD_RULES] ⚠️ 暴涨暴跌 | 24h涨跌幅:{price_change_pct:.1f}% | 提高要求")
             if score < high_min_score:
-                return False, f"❌ 暴涨暴跌({price_change_pct:.1f}%)要求评分>={high_min_score:.2f} | 当前:{score:.2f}"
+                return _reject(RejectCode.PRICE_CHANGE_SCORE, change_pct=price_change_pct, min_score=high_min_score, score=score)
             if vol_spike < high_min_vol:
-                return False, f"❌ 暴涨暴跌({price_change_pct:.1f}%)要求成交量>={high_min_vol:.1f}x | 当前:{vol_spike:.2f}x"
-        
-        # ADX震荡检测
-        if adx < 15 and vol_spike < 2.0:
-            return False, f"ADX{adx:.1f}<15且Vol{vol_spike:.2f}x<2.0死寂震荡"
-        
-        # 布林带陷阱检测
-        if bb_width < 0.01:
-            if vol_spike >= 0.8:
-                if bb_width < 0.005:
-                    return False, f"布林带极度挤压{bb_width:.4f}即使Vol{vol_spike:.2f}x高仍不足"
-            else:
-                if vol_spike < 0.8:
-                    return False, f"布林带极度挤压{bb_width:.4f}+Vol{vol_spike:.2f}x不足"
-        
-        if bb_width < 0.008 and 45 < rsi < 55:
-            return False, f"布林带极挤压{bb_width:.4f}+RSI{rsi:.1f}中性,方向不明"
-        
-        if adx > 35 and vol_spike < 0.5:
-            return False, f"ADX{adx:.1f}强趋势但Vol{vol_spike:.2f}x不支持"
+                return _reject(RejectCode.PRICE_CHANGE_VOLUME, change_pct=price_change_pct, min_vol=high_min_vol, vol_spike=vol_spike)
         
+        # 🔥 数值硬规则走JIT内核，只在拒绝时格式化原因
         macd_cross = m.get("macd_cross", "none")
-        bullish_div = m.get("bullish_divergence", False)
-        bearish_div = m.get("bearish_divergence", False)
-
-        # 🔥 反转确认检查（使用统一的极端RSI阈值）
-        if side == "long":
-            has_reversal_confirm = (
-                macd_cross == "golden" or
-                bullish_div == True or
-                (rsi <= extreme_rsi_long and vol_spike >= 3.0)
-            )
-            if not has_reversal_confirm:
-                return False, f"❌ 缺少反转确认 | RSI={rsi:.0f}超卖但MACD未金叉且无底背离"
-        else:
-            has_reversal_confirm = (
-                macd_cross == "death" or
-                bearish_div == True or
-                (rsi >= extreme_rsi_short and vol_spike >= 3.0)
-            )
-            if not has_reversal_confirm:
-                return False, f"❌ 缺少反转确认 | RSI={rsi:.0f}超买但MACD未死叉且无顶背离"
-
-        print(f"[REVERSAL_CONFIRM] ✅ 反转确认 | MACD:{macd_cross} 背离:{'底' if bullish_div else '顶' if bearish_div else '无'}")
-
-        if bb_width < 0.01 and macd_cross in ("golden", "death") and vol_spike < 1.0:
-            return False, f"布林带挤压{bb_width:.4f}时MACD交叉为噪音"
-        
-        if adx > 40 and bb_width < 0.02 and vol_spike < 1.0:
-            return False, f"ADX{adx:.1f}高+BB{bb_width:.4f}缩+Vol{vol_spike:.2f}x衰=趋势末端"
-        
-        min_sl_by_atr = atr_pct * 1.5
-        if sl_pct < min_sl_by_atr:
-            return False, f"止损{sl_pct:.2f}%过紧(<{min_sl_by_atr:.2f}%)"
-        
-        if bb_width < 0.015:
-            min_sl_squeeze = max(atr_pct * 1.5, 1.0) if vol_spike >= 2.0 else max(atr_pct * 2.0, 1.5)
-            if sl_pct < min_sl_squeeze:
-                return False, f"布林带挤压期止损需≥{min_sl_squeeze:.2f}%"
-        
-        if vol_spike < 1.0:
-            min_sl_low_vol = atr_pct * 2.5
-            if sl_pct < min_sl_low_vol:
-                return False, f"低流动性Vol{vol_spike:.2f}x时止损需≥{min_sl_low_vol:.2f}%"
+        bullish_div = m.get("bullish_divergence", False) == True
+        bearish_div = m.get("bearish_divergence", False) == True
+        macd_dir = 1 if macd_cross == "golden" else -1 if macd_cross == "death" else 0
+        
+        code, limit = _reversal_guards(
+            side == "long", rsi, adx, vol_spike, bb_width, atr_pct, sl_pct, orderbook,
+            raw_funding_rate, macd_dir, bullish_div, bearish_div,
+            float(extreme_rsi_long), float(extreme_rsi_short)
+        )
         
-        # 资金费率检查
-        if abs(raw_funding_rate) > 0.001:
-            if side == "long" and raw_funding_rate > 0.001:
-                return False, f"做多资金费率{raw_funding_rate:.4f}>0.001过高"
-            if side == "short" and raw_funding_rate < -0.001:
-                return False, f"做空资金费率{raw_funding_rate:.4f}<-0.001过负"
+        if code == GUARD_PASS or code > GUARD_NO_CONFIRM_SHORT:
+            print(f"[REVERSAL_CONFIRM] ✅ 反转确认 | MACD:{macd_cross} 背离:{'底' if bullish_div else '顶' if bearish_div else '无'}")
         
-        if orderbook < 0.30:
-            return False, f"订单簿{orderbook:.2f}<0.30深度不足"
+        if code != GUARD_PASS:
+            return _reject(
+                code, rsi=rsi, adx=adx, vol_spike=vol_spike, bb_width=bb_width, sl_pct=sl_pct,
+                orderbook=orderbook, funding_rate=raw_funding_rate, limit=limit
+            )
         
-        estimated_slip = self._estimate_slippage(vol_spike, orderbook)
-        if estimated_slip > sl_pct * 0.6:
-            return False, f"预估滑点{estimated_slip:.2f}%>止损{sl_pct:.2f}%×0.6"
+        # 🔥🔥🔥 v10.0新增: CVD背离检测（标量硬规则全部通过后才计算，直接在NumPy列上计算）
+        if has_klines:
+            try:
+                cvd_result = self._quick_cvd_check(klines)
+                
+                # 🔥 如果是明显的假突破，直接拒绝
+                if cvd_result.get("is_fake_breakout", False) and cvd_result.get("divergence_strength", 0) > 70:
+                    print(f"[REVERSAL] ⚠️ CVD检测到假突破 | 背离强度:{cvd_result['divergence_strength']:.0f}")
+                    return _reject(RejectCode.CVD_FAKE_BREAKOUT, strength=cvd_result['divergence_strength'])
+                
+                print(f"[REVERSAL] 🔥v10.0: CVD背离={cvd_result.get('divergence', 'none')}")
+            except Exception as e:
+                print(f"[REVERSAL] CVD检测异常: {e}")
         
-        return True, "硬规则全部通过"
+        return True, "硬规则全部通过", GUARD_PASS
     
     # ========== Claude审核 ==========
     
     def _claude_review(self, payload: Dict) -> Dict:
         """Claude深度审核 - 包含3档入场价"""
         try:
-            client = anthropic.Anthropic(api_key=self.claude_api_key)
             prompt = self._build_review_prompt(payload, "Claude")
+            result = self._complete_json(self._claude_submit_review, [{"role": "user", "content": prompt}])
             
-            message = client.messages.create(
-                model=self.claude_model,
-                max_tokens=2500,
-                temperature=0.3,
-                system="你是专业的加密货币交易审核专家。严格分析信号质量，给出明确决策。",
-                messages=[{"role": "user", "content": prompt}]
-            )
+            if result:
+                result["_source"] = "claude"
+                return result
+            else:
+                return self._build_ai_error_result("Claude", "返回格式错误", payload)
+                
+        except Exception as e:
+            print(f"[CLAUDE_ERR] {e}")
+            return self._build_ai_error_result("Claude", str(e), payload)
+    
+    def _early_reject(self, buffer: str) -> bool:
+        """流式缓冲区开头是否已经是拒绝决策"""
+        return self.stream_early_reject and _EARLY_REJECT_RE.match(buffer) is not None
+    
+    @_retry_api()
+    def _claude_submit_review(self, messages: List[Dict]) -> Any:
+        """
+        调用Claude并强制使用submit_review工具，返回工具输入字典（瞬时故障自动重试）
+        
+        回复中没有工具调用时返回文本内容，由_complete_json按文本解析
+        """
+        response = self._anthropic_client.messages.create(**self._claude_tool_request(messages))
+        return self._tool_result(response)
+    
+    def _claude_tool_request(self, messages: List[Dict]) -> Dict:
+        """submit_review工具调用的请求参数（同步/异步共用）"""
+        return {
+            "model": self.claude_model,
+            "max_tokens": _CLAUDE_TOOL_MAX_TOKENS,
+            "temperature": 0.3,
+            "system": _cached_system(_CLAUDE_TOOL_SYSTEM),
+            "tools": [_REVIEW_TOOL],
+            "tool_choice": {"type": "tool", "name": _REVIEW_TOOL["name"]},
+            "messages": messages
+        }
+    
+    @staticmethod
+    def _tool_result(response) -> Any:
+        """取工具输入字典；没有工具调用时返回拼接的文本"""
+        for block in response.content:
+            if block.type == "tool_use" and isinstance(block.input, dict) and block.input:
+                return dict(block.input)
+        return "".join(getattr(block, "text", "") for block in response.content)
+    
+    @_retry_api()
+    def _claude_complete(self, messages: List[Dict], max_tokens: int = _REVIEW_MAX_TOKENS) -> str:
+        """调用Claude（流式），返回文本内容（瞬时故障自动重试；批量审核使用）"""
+        buffer = ""
+        with self._anthropic_client.messages.stream(
+            model=self.claude_model,
+            max_tokens=max_tokens,
+            temperature=0.3,
+            system=_cached_system(_CLAUDE_REVIEW_SYSTEM),
+            messages=messages
+        ) as stream:
+            for text in stream.text_stream:
+                buffer += text
+                if self._early_reject(buffer):
+                    return _EARLY_REJECT_RESULT  # 退出with即关闭连接
+        return buffer
+    
+    def _complete_json(self, complete, messages: List[Dict]) -> Optional[Dict]:
+        """
+        调用AI并解析JSON；无法解析时把原回复和纠正提示追加到对话中重问（最多_JSON_REPAIR_ATTEMPTS次）
+        
+        complete返回字典（工具调用的结构化结果）时直接使用，返回文本时提取JSON
+        """
+        content = complete(messages)
+        result = content if isinstance(content, dict) else self._parse_json_response(content)
+        for _ in range(_JSON_REPAIR_ATTEMPTS):
+            if result:
+                break
+            print(f"[AI_RETRY] 返回格式错误，要求重新输出JSON: {content[:50]!r}")
+            messages = messages + [
+                {"role": "assistant", "content": content},
+                {"role": "user", "content": _JSON_REPAIR_PROMPT}
+            ]
+            content = complete(messages)
+            result = content if isinstance(content, dict) else self._parse_json_response(content)
+        return result
+    
+    # ========== DeepSeek审核 ==========
+    
+    def _deepseek_review(self, payload: Dict) -> Optional[Dict]:
+        """DeepSeek深度审核"""
+        try:
+            messages = self._deepseek_messages(payload)
+            result = self._complete_json(self._deepseek_complete, messages)
             
-            content = message.content[0].text
-            result = self._parse_json_response(content)
+            if result:
+                result["_source"] = "deepseek"
+                return result
+            else:
+                return self._build_ai_error_result("DeepSeek", "返回格式错误", payload)
+                
+        except Exception as e:
+            print(f"[DEEPSEEK_ERR] {e}")
+            return self._build_ai_error_result("DeepSeek", str(e), payload)
+    
+    def _deepseek_messages(self, payload: Dict) -> List[Dict]:
+        """DeepSeek审核对话（system：指令+审核规则；user：信号数据）"""
+        return [
+            {"role": "system", "content": self._DEEPSEEK_SYSTEM_PROMPT + "\n" + _REVIEW_RUBRIC},
+            {"role": "user", "content": self._build_review_prompt(payload, "DeepSeek")}
+        ]
+    
+    def _deepseek_request(self, messages: List[Dict], max_tokens: int) -> Tuple[Dict, bytes]:
+        """DeepSeek流式请求的 (headers, body)（同步/异步共用）"""
+        headers = {
+            "Authorization": f"Bearer {self.deepseek_api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        data = {
+            "model": self.deepseek_model,
+            "messages": messages,
+            "temperature": 0.3,  # 🔥 v8.2: 更灵活
+            "max_tokens": max_tokens,
+            "response_format": {"type": "json_object"},  # 🔥 JSON模式：只输出JSON对象
+            "stream": True
+        }
+        return headers, json_dumps(data)
+    
+    @_retry_api()
+    def _deepseek_complete(self, messages: List[Dict], max_tokens: int = _REVIEW_MAX_TOKENS) -> str:
+        """调用DeepSeek，返回文本内容（瞬时故障自动重试）"""
+        headers, body = self._deepseek_request(messages, max_tokens)
+        
+        buffer = ""
+        with self._ds_session.post(
+            f"{self.deepseek_base_url}/chat/completions",
+            headers=headers,
+            data=body,
+            timeout=self.deepseek_timeout,
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            # SSE格式：每行 "data: {...}"，结束为 "data: [DONE]"
+            for line in response.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                chunk = line[5:].strip()
+                if chunk == b"[DONE]":
+                    break
+                delta = json_loads(chunk)["choices"][0].get("delta", {})
+                buffer += delta.get("content") or ""
+                if self._early_reject(buffer):
+                    return _EARLY_REJECT_RESULT  # 退出with即关闭连接
+        return buffer
+    
+    # ========== 🔥 异步审核（一个事件循环线程并发多个审核）==========
+    
+    def _ensure_async(self) -> asyncio.AbstractEventLoop:
+        """首次使用时启动后台事件循环线程并创建异步客户端（连接池在该循环内复用）"""
+        with self._async_lock:
+            if self._async_loop is None:
+                limits = httpx.Limits(max_keepalive_connections=50, max_connections=200, keepalive_expiry=30.0)
+                self._async_anthropic = anthropic.AsyncAnthropic(
+                    api_key=self.claude_api_key,
+                    http_client=httpx.AsyncClient(limits=limits, timeout=120.0)
+                )
+                self._async_http = httpx.AsyncClient(limits=limits, timeout=self.deepseek_timeout)
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, daemon=True, name="AI-Async").start()
+                self._async_loop = loop
+        return self._async_loop
+    
+    def review_signals(self, payloads: List[Dict]) -> List[Dict]:
+        """
+        并发审核多个信号（同步接口）：全部AI请求在同一个事件循环线程上同时进行，总耗时≈最慢的一个
+        
+        Returns:
+            与payloads一一对应的审核结果
+        """
+        async def gather():
+            return await asyncio.gather(*(self._review_signal_async(payload) for payload in payloads))
+        return list(asyncio.run_coroutine_threadsafe(gather(), self._ensure_async()).result())
+    
+    async def review_signal_async(self, payload: Dict) -> Dict:
+        """review_signal的协程版本（可在任意事件循环中await，AI请求在审核器自己的循环上执行）"""
+        loop = self._ensure_async()
+        if asyncio.get_running_loop() is loop:
+            return await self._review_signal_async(payload)
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._review_signal_async(payload), loop))
+    
+    async def _review_signal_async(self, payload: Dict) -> Dict:
+        """与review_signal相同的流程（硬规则 -> AI），AI调用为异步"""
+        symbol = payload.get("symbol", "UNKNOWN")
+        
+        print(f"\n[REVIEW] 🔍 开始审核 {symbol}（异步）...")
+        passed, reason, code = self._hard_rules_filter(payload)
+        if not passed:
+            return self._hard_reject(payload, reason, code)
+        
+        print(f"[REVIEW] ✅ 硬规则通过")
+        return await self._ai_review_async(payload)
+    
+    async def _ai_review_async(self, payload: Dict) -> Dict:
+        """_ai_review的异步版本：DeepSeek初审超时未返回时才发起Claude备审任务，DeepSeek成功时直接取消备审"""
+        if self.deepseek_enabled and self.deepseek_api_key:
+            task_ds = asyncio.ensure_future(self._deepseek_review_async(payload))
+            task_cl = None
+            if self.parallel_fallback:
+                done, _ = await asyncio.wait({task_ds}, timeout=self.parallel_fallback_delay_sec)
+                if not done:
+                    print(f"[REVIEW] ⏱️ DeepSeek {self.parallel_fallback_delay_sec}s未返回，提前发起Claude备审")
+                    task_cl = asyncio.ensure_future(self._claude_review_async(payload))
+            ai_result = await task_ds
+            ai_name = "DEEPSEEK"
             
+            if self._is_connection_failure(ai_result):
+                print(f"[REVIEW] ⚠️ DeepSeek连接失败，回退到Claude")
+                ai_result = await task_cl if task_cl is not None else await self._claude_review_async(payload)
+                ai_name = "CLAUDE"
+            elif task_cl is not None:
+                task_cl.cancel()  # 协程任务可直接取消，进行中的请求随之关闭
+        else:
+            ai_result = await self._claude_review_async(payload)
+            ai_name = "CLAUDE"
+        
+        return self._finalize_review(ai_name, ai_result, payload)
+    
+    async def _complete_json_async(self, complete, messages: List[Dict]) -> Optional[Dict]:
+        """_complete_json的异步版本（complete为协程函数）"""
+        content = await complete(messages)
+        result = content if isinstance(content, dict) else self._parse_json_response(content)
+        for _ in range(_JSON_REPAIR_ATTEMPTS):
+            if result:
+                break
+            print(f"[AI_RETRY] 返回格式错误，要求重新输出JSON: {content[:50]!r}")
+            messages = messages + [
+                {"role": "assistant", "content": content},
+                {"role": "user", "content": _JSON_REPAIR_PROMPT}
+            ]
+            content = await complete(messages)
+            result = content if isinstance(content, dict) else self._parse_json_response(content)
+        return result
+    
+    async def _claude_review_async(self, payload: Dict) -> Dict:
+        """_claude_review的异步版本"""
+        try:
+            prompt = self._build_review_prompt(payload, "Claude")
+            result = await self._complete_json_async(self._claude_submit_review_async, [{"role": "user", "content": prompt}])
             if result:
                 result["_source"] = "claude"
                 return result
-            else:
-                return self._build_ai_error_result("Claude", "返回格式错误", payload)
-                
+            return self._build_ai_error_result("Claude", "返回格式错误", payload)
         except Exception as e:
             print(f"[CLAUDE_ERR] {e}")
             return self._build_ai_error_result("Claude", str(e), payload)
     
-    # ========== DeepSeek审核 ==========
-    
-    def _deepseek_review(self, payload: Dict) -> Optional[Dict]:
-        """DeepSeek深度审核"""
+    async def _deepseek_review_async(self, payload: Dict) -> Dict:
+        """_deepseek_review的异步版本"""
         try:
-            prompt = self._build_review_prompt(payload, "DeepSeek")
-            
-            headers = {
-                "Authorization": f"Bearer {self.deepseek_api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            data = {
-                "model": self.deepseek_model,
-                "messages": [
-                    {"role": "system", "content": """你是加密货币交易分析专家，负责审核交易信号。
-
-🎯 **审核原则**：
-- 趋势预判信号特点是"提前布局"，RSI在15-30做多、70-85做空是合理区间
-- 反转信号需要更极端的RSI（<15做多，>85做空）
-- 重点关注：趋势方向、支撑阻力、BTC配合
-
-⛔ **必须拒绝**：
-1. BTC明显下跌（1h跌>1.0%）时做多
-2. BTC明显上涨（1h涨>1.0%）时做空
-3. 完全没有支撑/阻力确认
-
-✅ **可以通过**：
-1. 预判信号：RSI 15-30做多或70-85做空 + 布林带收窄
-2. 反转信号：RSI <15做多或>85做空 + 成交量放大
-3. BTC稳定（变化<0.5%）或方向配合
-
-📊 审核通过率目标：40-50%"""},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.3,  # 🔥 v8.2: 更灵活
-                "max_tokens": 2500
-            }
-            
-            response = requests.post(
-                f"{self.deepseek_base_url}/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=self.deepseek_timeout
-            )
-            
-            response.raise_for_status()
-            result_data = response.json()
-            content = result_data["choices"][0]["message"]["content"]
-            
-            result = self._parse_json_response(content)
-            
+            result = await self._complete_json_async(self._deepseek_complete_async, self._deepseek_messages(payload))
             if result:
                 result["_source"] = "deepseek"
                 return result
-            else:
-                return self._build_ai_error_result("DeepSeek", "返回格式错误", payload)
-                
+            return self._build_ai_error_result("DeepSeek", "返回格式错误", payload)
         except Exception as e:
             print(f"[DEEPSEEK_ERR] {e}")
             return self._build_ai_error_result("DeepSeek", str(e), payload)
     
+    @_retry_api()
+    async def _claude_submit_review_async(self, messages: List[Dict]) -> Any:
+        """_claude_submit_review的异步版本（AsyncAnthropic）"""
+        response = await self._async_anthropic.messages.create(**self._claude_tool_request(messages))
+        return self._tool_result(response)
+    
+    @_retry_api()
+    async def _deepseek_complete_async(self, messages: List[Dict], max_tokens: int = _REVIEW_MAX_TOKENS) -> str:
+        """_deepseek_complete的异步版本（httpx.AsyncClient流式读取SSE）"""
+        headers, body = self._deepseek_request(messages, max_tokens)
+        
+        buffer = ""
+        async with self._async_http.stream(
+            "POST", f"{self.deepseek_base_url}/chat/completions", headers=headers, content=body
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                chunk = line[5:].strip()
+                if chunk == "[DONE]":
+                    break
+                delta = json_loads(chunk)["choices"][0].get("delta", {})
+                buffer += delta.get("content") or ""
+                if self._early_reject(buffer):
+                    return _EARLY_REJECT_RESULT  # 退出async with即关闭连接
+        return buffer
+    
     # ========== 提示词构建 ==========
     
     def _build_review_prompt(self, payload: Dict, ai_name: str) -> str:
-        """构建审核提示词 - 根据信号类型使用不同prompt"""
+        """构建审核提示词 - 根据信号类型使用不同prompt（模板见类常量 _PROMPT_*）"""
         
         m = payload.get("metrics", {}) or {}
-        subs = payload.get("subscores", {}) or {}
-        stops = payload.get("calculated_stops", {}) or {}
-        
-        symbol = payload.get("symbol", "UNKNOWN")
-        side = payload.get("bias", "long")
-        price = self._safe_float(payload.get("price"), 0.0)
-        score = self._safe_float(payload.get("score"), 0.0)
+        vals = _unpack(payload)
         
-        rsi = self._safe_float(m.get("rsi"), 50.0)
-        adx = self._safe_float(m.get("adx"), 0.0)
-        vol_ratio = self._safe_float(m.get("vol_spike_ratio"), 1.0)
-        bb_width = self._safe_float(m.get("bb_width"), 0.03)
-        
-        price_change_24h = self._safe_float(m.get("price_change_24h_pct"), 0.0)
-        
-        sl_pct = self._safe_float(stops.get("sl_pct"), 3.0)
-        tp_pct = self._safe_float(stops.get("tp_pct"), 6.0)
+        btc_status = payload.get("btc_status", {})
+        btc_change_1h = vals[IDX_BTC_CHANGE_1H]
         
-        sentiment = self._safe_float(m.get("sentiment"), 0.5)
-        orderbook = self._safe_float(subs.get("orderbook"), 0.5)
+        correlation = payload.get("correlation_analysis", {})
+        if correlation:
+            corr_level = correlation.get("correlation_level", "unknown")
+            corr_value = vals[IDX_CORR_VALUE]
+            btc_corr_text = f"{corr_level} (系数:{corr_value:.2f})"
+        else:
+            btc_corr_text = "未知"
         
-        bb_upper = self._safe_float(m.get("bb_upper"), 0.0)
-        bb_lower = self._safe_float(m.get("bb_lower"), 0.0)
+        # 各模板共用的字段
+        values = {
+            "symbol": payload.get("symbol", "UNKNOWN"),
+            "side_upper": payload.get("bias", "long").upper(),
+            "price": vals[IDX_PRICE],
+            "score": vals[IDX_SCORE],
+            "rsi": vals[IDX_RSI],
+            "adx": vals[IDX_ADX],
+            "vol_ratio": vals[IDX_VOL_SPIKE],
+            "macd_status": self._MACD_STATUS_MAP.get(m.get("macd_cross", "none"), "震荡无明确信号"),
+            "btc_trend": btc_status.get("trend", "unknown"),
+            "btc_change_1h": btc_change_1h,
+            "btc_corr_text": btc_corr_text,
+        }
         
-        if bb_upper > 0 and bb_lower > 0 and price > 0:
-            if price > bb_upper:
-                bb_position_desc = "突破上轨(超买)"
-            elif price < bb_lower:
-                bb_position_desc = "跌破下轨(超卖)"
-            else:
-                bb_position_desc = "中轨附近"
-        else:
-            bb_position_desc = "数据不足"
+        # 🔥🔥🔥 根据信号类型选择不同的prompt（未列出的类型按反转处理）
+        builder = self._prompt_dispatch.get(self._signal_type(payload), self._prompt_reversal)
+        return builder(payload, m, vals, values)
+    
+    def _prompt_trend_anticipation(self, payload: Dict, m: Dict, vals: List[float], values: Dict) -> str:
+        """🔥🔥🔥 趋势预判信号的专用prompt"""
+        # 获取趋势预判特有的信息
+        support_analysis = payload.get("support_analysis", {})
+        patterns = payload.get("pattern_analysis", {}).get("patterns", [])
+        
+        values["nearest_support"] = support_analysis.get("nearest_level", 0)
+        values["support_type"] = support_analysis.get("level_type", "unknown")
+        values["support_distance"] = support_analysis.get("distance_pct", 0) * 100
+        values["patterns_text"] = ', '.join(patterns) if patterns else '无明显形态'
+        values["volume_structure"] = payload.get("volume_analysis", {}).get("structure", "unknown")
+        values["mtf_confirm"] = payload.get("mtf_analysis", {}).get("confirm_count", 0)
+        
+        # 获取历史交易记录（用于AI学习）
+        values["history_text"] = self._build_history_text(payload.get("cfg", {}))
+        
+        return self._PROMPT_TREND_ANTICIPATION.format_map(values)
+    
+    def _prompt_trend_continuation(self, payload: Dict, m: Dict, vals: List[float], values: Dict) -> str:
+        """趋势延续信号的专用prompt"""
+        values["btc_change_1h_x100"] = values["btc_change_1h"] * 100
+        values["corr_value"] = vals[IDX_CORR_VALUE]
+        values["pullback_pct_x100"] = vals[IDX_PULLBACK_PCT] * 100
+        return self._PROMPT_TREND_CONTINUATION.format_map(values)
+    
+    def _prompt_reversal(self, payload: Dict, m: Dict, vals: List[float], values: Dict) -> str:
+        """反转信号prompt"""
+        rsi = values["rsi"]
+        vol_ratio = values["vol_ratio"]
         
-        macd_cross = m.get("macd_cross", "none")
-        if macd_cross == "golden":
-            macd_status = "✅ 金叉(看涨)"
-        elif macd_cross == "death":
-            macd_status = "⚠️ 死叉(看跌)"
-        else:
-            macd_status = "震荡无明确信号"
-
         bullish_div = m.get("bullish_divergence", False)
         bearish_div = m.get("bearish_divergence", False)
-        div_strength = self._safe_float(m.get("divergence_strength"), 0.0)
-
+        div_strength = vals[IDX_DIV_STRENGTH]
+        
         if bullish_div:
             divergence_desc = f"✅ 底背离(看涨) 强度:{div_strength:.2f}"
         elif bearish_div:
@@ -663,143 +1741,6 @@ class ClaudeReviewer:
         else:
             divergence_desc = "无背离"
         
-        btc_status = payload.get("btc_status", {})
-        btc_trend = btc_status.get("trend", "unknown")
-        btc_change_1h = self._safe_float(btc_status.get("price_change_1h"), 0.0)
-        
-        correlation = payload.get("correlation_analysis", {})
-        if correlation:
-            corr_level = correlation.get("correlation_level", "unknown")
-            corr_value = self._safe_float(correlation.get("correlation_value"), 0.0)
-            btc_corr_text = f"{corr_level} (系数:{corr_value:.2f})"
-        else:
-            btc_corr_text = "未知"
-        
-        # 🔥🔥🔥 根据信号类型选择不同的prompt
-        signal_type = payload.get("signal_type", "unknown")
-        if signal_type == "unknown":
-            signal_info = payload.get("signal_info", {})
-            signal_type = signal_info.get("signal_type", "unknown")
-        
-        # ========== 🔥🔥🔥 趋势预判信号的专用prompt ==========
-        if signal_type == "trend_anticipation":
-            # 获取趋势预判特有的信息
-            support_analysis = payload.get("support_analysis", {})
-            pattern_analysis = payload.get("pattern_analysis", {})
-            volume_analysis = payload.get("volume_analysis", {})
-            mtf_analysis = payload.get("mtf_analysis", {})
-            
-            nearest_support = support_analysis.get("nearest_level", 0)
-            support_type = support_analysis.get("level_type", "unknown")
-            support_distance = support_analysis.get("distance_pct", 0) * 100
-            
-            patterns = pattern_analysis.get("patterns", [])
-            volume_structure = volume_analysis.get("structure", "unknown")
-            mtf_confirm = mtf_analysis.get("confirm_count", 0)
-            
-            # 获取历史交易记录（用于AI学习）
-            history_text = self._build_history_text(payload.get("cfg", {}))
-            
-            prompt = f"""
-## 🔮 趋势预判信号审核 - 严格模式
-
-🚨🚨🚨 **极其重要的风控铁律** 🚨🚨🚨
-1. BTC下跌时（1h跌>0.5%）→ 必须拒绝做多
-2. BTC上涨时（1h涨>0.5%）→ 必须拒绝做空  
-3. 成交量<1.5x → 必须拒绝
-4. 没有明显支撑/阻力确认 → 必须拒绝
-5. 多时间框架确认<2个 → 必须拒绝
-6. 任何疑虑 → 拒绝（宁可错过，不可做错）
-
-### 基础信息
-- 币种: {symbol}
-- 方向: {side.upper()}
-- 当前价: ${price:.6f}
-- 综合评分: {score:.2f}
-
-### 🔥 预判信号核心指标
-- 最近支撑位: ${nearest_support:.6f} ({support_type})
-- 距支撑位: {support_distance:.2f}%
-- K线形态: {', '.join(patterns) if patterns else '无明显形态'}
-- 成交量结构: {volume_structure}
-- 多时间框架确认数: {mtf_confirm}个
-
-### 技术指标
-- RSI: {rsi:.1f} （预判区间，非极值）
-- ADX: {adx:.1f} （趋势强度）
-- 成交量: {vol_ratio:.2f}x均量
-- MACD: {macd_status}
-
-### BTC背景 ⚠️关键判断依据
-- BTC趋势: {btc_trend}
-- BTC 1h变化: {btc_change_1h:+.2f}%
-- 相关性: {btc_corr_text}
-{history_text}
-
-### 🚨 必须检查的拒绝条件
-1. ❓ BTC方向是否与信号方向冲突？（做多时BTC跌/做空时BTC涨）
-2. ❓ 成交量是否足够？（至少1.5x）
-3. ❓ 是否有有效支撑/阻力位确认？
-4. ❓ 动能是否真的在减弱？
-
-### 请返回JSON格式:
-```json
-{{
-    "approved": true/false,
-    "confidence": 0.0-1.0,
-    "side": "long"/"short",
-    "reasoning": "20字以内简短理由"
-}}
-```
-
-⚠️ 记住：你的任务是保护资金安全！有任何疑虑就拒绝。只返回JSON。
-"""
-            return prompt
-        
-        # ========== 趋势延续信号的专用prompt ==========
-        if signal_type == "trend_continuation":
-            correlation = payload.get("correlation_analysis", {})
-            corr_value = self._safe_float(correlation.get("correlation_value"), 0.0)
-            pullback_pct = self._safe_float(payload.get("pullback_pct"), 0.0)
-            
-            prompt = f"""
-## 📈 趋势延续信号审核
-
-⚠️ **这是趋势延续信号，跟随BTC方向！**
-- 不要求RSI极值
-- 重点看：BTC方向 + 相关性 + 回调入场
-
-### 基础信息
-- 币种: {symbol}
-- 方向: {side.upper()}
-- 当前价: ${price:.6f}
-- 综合评分: {score:.2f}
-
-### 趋势延续核心指标
-- BTC 1h变化: {btc_change_1h*100:+.2f}%
-- 与BTC相关性: {corr_value:.2f}
-- 回调幅度: {pullback_pct*100:+.2f}%
-
-### 技术指标
-- RSI: {rsi:.1f} | ADX: {adx:.1f}
-- 成交量: {vol_ratio:.2f}x均量
-
-### 请返回JSON格式:
-```json
-{{
-    "approved": true/false,
-    "confidence": 0.0-1.0,
-    "side": "long"/"short",
-    "reasoning": "20字以内简短理由"
-}}
-```
-
-⚠️ 只判断信号质量！只返回JSON。
-"""
-            return prompt
-        # 🔥 使用统一的RSI阈值
-        rsi_thresholds = self.rsi_thresholds
-        
         # 🔥🔥🔥 v7.9.3: 加入动能减弱信息
         momentum_weakening = m.get("momentum_weakening", False)
         momentum_weakening_count = m.get("momentum_weakening_count", 0)
@@ -834,69 +1775,16 @@ class ClaudeReviewer:
         elif funding_crowding == "short_crowded":
             funding_status = f"🟡空头拥挤(Z={funding_zscore:.1f})"
         
-        prompt = f"""
-## 🔄 反转信号审核 - 🔥v10.0 CVD+Funding增强版
-
-🚨🚨🚨 **核心风控铁律** 🚨🚨🚨
-1. RSI没到极值（做多>15，做空<85）→ 必须拒绝
-2. 价格还在创新高/新低（趋势进行中）→ 必须拒绝
-3. 动能没有明显减弱 → 必须拒绝
-4. 成交量<2x均量 → 必须拒绝
-5. BTC方向与信号冲突 → 必须拒绝
-6. 🆕 CVD背离不支持反转方向 → 谨慎
-7. 任何疑虑 → 拒绝（宁可错过，不可做错）
-
-### 🔥🔥🔥 v10.0新增：反转质量指标
-- **CVD背离**: {cvd_status}
-  - 做多时看涨背离(价格跌+CVD涨)= ✅支持
-  - 做空时看跌背离(价格涨+CVD跌)= ✅支持
-- **Funding拥挤**: {funding_status}
-  - 做多时空头拥挤 = ✅做多价值高
-  - 做空时多头拥挤 = ✅做空价值高
-
-### 基础信息
-- 币种: {symbol}
-- 方向: {side.upper()}
-- 当前价: ${price:.6f}
-- 综合评分: {score:.2f}
-
-### 技术指标
-- RSI: {rsi:.1f} {'🔥极端超卖' if rsi <= 15 else '🔥超卖' if rsi <= 20 else '❄️极端超买' if rsi >= 85 else '❄️超买' if rsi >= 80 else '⚠️中性区'}
-- ADX: {adx:.1f}
-- 成交量: {vol_ratio:.2f}x均量 {'✅放量' if vol_ratio >= 2.0 else '⚠️量能不足'}
-- MACD: {macd_status}
-- 背离: {divergence_desc}
-
-### 🚨 关键判断 - 动能状态
-- 动能减弱: {momentum_status}
-- 趋势状态: {trending_status}
-
-### BTC背景 ⚠️关键判断依据
-- BTC趋势: {btc_trend}
-- BTC 1h变化: {btc_change_1h:+.2f}%
-- 相关性: {btc_corr_text}
-
-### 🚨 必须检查的拒绝条件
-1. ❓ RSI是否真的到了极值区域？（做多≤15/做空≥85）
-2. ❓ 价格是否还在创新高/新低？（还在趋势中=危险）
-3. ❓ 动能是否真的在减弱？（至少4根K线确认）
-4. ❓ BTC方向是否支持？（做多时BTC不能跌/做空时BTC不能涨）
-5. ❓ 成交量是否足够？（至少2x）
-6. 🆕 CVD是否支持反转？（做多要看涨背离/做空要看跌背离）
-
-### 请返回JSON格式:
-```json
-{{
-    "approved": true/false,
-    "confidence": 0.0-1.0,
-    "side": "long"/"short",
-    "reasoning": "20字以内简短理由，需提及CVD/Funding"
-}}
-```
-
-⚠️ 记住：反转交易是逆势交易，风险极高！有任何疑虑就拒绝。只返回JSON。
-"""
-        return prompt
+        values["rsi_label"] = ('🔥极端超卖' if rsi <= 15 else '🔥超卖' if rsi <= 20 else
+                               '❄️极端超买' if rsi >= 85 else '❄️超买' if rsi >= 80 else '⚠️中性区')
+        values["vol_label"] = '✅放量' if vol_ratio >= 2.0 else '⚠️量能不足'
+        values["divergence_desc"] = divergence_desc
+        values["momentum_status"] = momentum_status
+        values["trending_status"] = trending_status
+        values["cvd_status"] = cvd_status
+        values["funding_status"] = funding_status
+        
+        return self._PROMPT_REVERSAL.format_map(values)
     
     # ========== 结果整合 ==========
     
@@ -950,7 +1838,7 @@ class ClaudeReviewer:
     def _parse_json_response(content: str) -> Optional[Dict]:
         """从AI响应中提取JSON"""
         try:
-            return json.loads(content)
+            return json_loads(content)
         except:
             pass
         
@@ -959,51 +1847,59 @@ class ClaudeReviewer:
             end = content.rfind('}')
             if start != -1 and end != -1:
                 json_str = content[start:end+1]
-                return json.loads(json_str)
+                return json_loads(json_str)
         except:
             pass
         
         return None
     
-    @staticmethod
-    def _safe_float(x, default: float = 0.0) -> float:
-        """安全转换为浮点数"""
+    @classmethod
+    def _parse_batch_response(cls, content: str) -> Optional[List]:
+        """从批量审核响应中提取结果列表（{"reviews": [...]}，也接受直接返回的数组）"""
+        parsed = cls._parse_json_response(content)
+        if isinstance(parsed, dict):
+            parsed = parsed.get("reviews")
+        if isinstance(parsed, list):
+            return parsed
+        
         try:
-            v = float(x)
-            if math.isnan(v) or math.isinf(v):
-                return default
-            return v
-        except Exception:
-            return default
+            start = content.find('[')
+            end = content.rfind(']')
+            if start != -1 and end != -1:
+                items = json_loads(content[start:end+1])
+                if isinstance(items, list):
+                    return items
+        except:
+            pass
+        
+        return None
     
     # ========== 🔥v10.0新增: CVD和Funding检测 ==========
     
-    def _quick_cvd_check(self, df, lookback: int = 20) -> Dict:
+    def _quick_cvd_check(self, klines, lookback: int = 20) -> Dict:
         """
         🔥 v10.0新增: 快速CVD检测
         
         检测价格与成交量的背离，识别假突破
+        
+        Args:
+            klines: DataFrame / 列字典 / 字典列表 / ccxt OHLCV行（见_kline_columns）
         """
         try:
-            if len(df) < lookback + 5:
+            open_, close, volume = _kline_columns(klines)
+            if len(close) < lookback + 5:
                 return {"divergence": "none", "divergence_strength": 0, 
                         "is_fake_breakout": False, "signal_quality": 50}
             
-            # 计算CVD
-            direction = np.sign(df['close'].values - df['open'].values)
-            volume_delta = direction * df['volume'].values
-            cvd = np.cumsum(volume_delta)
-            
-            # 计算变化
-            cvd_now = cvd[-1]
-            cvd_past = cvd[-lookback]
-            price_now = float(df['close'].iloc[-1])
-            price_past = float(df['close'].iloc[-lookback])
+            # 窗口内CVD变化
+            cvd_change, cvd_span = _cvd_window(open_, close, volume, lookback)
+            price_now = float(close[-1])
+            price_past = float(close[-lookback])
             
-            cvd_range = max(abs(cvd[-lookback:].max() - cvd[-lookback:].min()), 1)
+            cvd_range = max(cvd_span, 1)
             price_past_safe = max(price_past, 1e-10)
             
-            cvd_delta = (cvd_now - cvd_past) / cvd_range * 100
+            cvd_delta = cvd_change / cvd_range * 100
             price_delta = (price_now - price_past) / price_past_safe * 100
             
             divergence = "none"
@@ -1048,81 +1944,64 @@ class ClaudeReviewer:
         
         识别拥挤交易，提高反转信号价值
         """
-        global _FUNDING_HISTORY
+        now = time.monotonic()
         
         try:
-            # 更新历史
-            if symbol not in _FUNDING_HISTORY:
-                _FUNDING_HISTORY[symbol] = []
-            
-            _FUNDING_HISTORY[symbol].append(current_rate)
-            
-            # 只保留最近90个数据点
-            if len(_FUNDING_HISTORY[symbol]) > 90:
-                _FUNDING_HISTORY[symbol] = _FUNDING_HISTORY[symbol][-90:]
-            
-            history = _FUNDING_HISTORY[symbol]
-            
-            if len(history) < 10:
-                return {"zscore": 0, "crowding": "neutral", "reversal_value": 50}
-            
-            mean_rate = np.mean(history)
-            std_rate = np.std(history)
-            
-            if std_rate < 1e-10:
-                zscore = 0
-            else:
-                zscore = (current_rate - mean_rate) / std_rate
-            
-            # 判断拥挤程度
-            if zscore > 2.5:
-                crowding = "extreme_long"
-                reversal_value = min(100, 50 + zscore * 15)
-            elif zscore > 1.5:
-                crowding = "long_crowded"
-                reversal_value = min(100, 50 + zscore * 10)
-            elif zscore < -2.5:
-                crowding = "extreme_short"
-                reversal_value = min(100, 50 + abs(zscore) * 15)
-            elif zscore < -1.5:
-                crowding = "short_crowded"
-                reversal_value = min(100, 50 + abs(zscore) * 10)
-            else:
-                crowding = "neutral"
-                reversal_value = 50
-            
-            return {
-                "zscore": round(zscore, 2),
-                "crowding": crowding,
-                "reversal_value": round(reversal_value, 1)
-            }
+            with _FUNDING_LOCK:
+                updated_at = _FUNDING_UPDATED_AT.get(symbol)
+                if updated_at is not None and now - updated_at < _FUNDING_TTL_SEC:
+                    return _FUNDING_ZSCORE[symbol]
+                
+                # 更新历史
+                history = _FUNDING_HISTORY[symbol]
+                history.append(current_rate)
+                _FUNDING_UPDATED_AT[symbol] = now
+                _FUNDING_ZSCORE[symbol] = result = self._funding_zscore_from_history(history, current_rate)
+            return result
         except:
             return {"zscore": 0, "crowding": "neutral", "reversal_value": 50}
     
     @staticmethod
-    def _estimate_slippage(vol_spike: float, obk_score: float) -> float:
-        """估算预期滑点"""
-        if vol_spike < 0.5:
-            base_slip = 0.8
-        elif vol_spike < 1.0:
-            base_slip = 0.5
-        elif vol_spike < 2.0:
-            base_slip = 0.3
-        elif vol_spike < 5.0:
-            base_slip = 0.15
+    def _funding_zscore_from_history(history: deque, current_rate: float) -> Dict:
+        """由资金费率历史计算Z-Score和拥挤程度"""
+        if len(history) < 10:
+            return {"zscore": 0, "crowding": "neutral", "reversal_value": 50}
+        
+        mean_rate = np.mean(history)
+        std_rate = np.std(history)
+        
+        if std_rate < 1e-10:
+            zscore = 0
         else:
-            base_slip = 0.08
-        
-        if obk_score < 0.3:
-            multiplier = 2.0
-        elif obk_score < 0.5:
-            multiplier = 1.5
-        elif obk_score < 0.7:
-            multiplier = 1.2
+            zscore = (current_rate - mean_rate) / std_rate
+        
+        # 判断拥挤程度
+        if zscore > 2.5:
+            crowding = "extreme_long"
+            reversal_value = min(100, 50 + zscore * 15)
+        elif zscore > 1.5:
+            crowding = "long_crowded"
+            reversal_value = min(100, 50 + zscore * 10)
+        elif zscore < -2.5:
+            crowding = "extreme_short"
+            reversal_value = min(100, 50 + abs(zscore) * 15)
+        elif zscore < -1.5:
+            crowding = "short_crowded"
+            reversal_value = min(100, 50 + abs(zscore) * 10)
         else:
-            multiplier = 1.0
+            crowding = "neutral"
+            reversal_value = 50
         
-        return base_slip * multiplier
+        return {
+            "zscore": round(zscore, 2),
+            "crowding": crowding,
+            "reversal_value": round(reversal_value, 1)
+        }
+    
+    @staticmethod
+    def _estimate_slippage(vol_spike: float, obk_score: float) -> float:
+        """估算预期滑点"""
+        return _slippage_estimate(float(vol_spike), float(obk_score))
     
     def _build_history_text(self, cfg: Dict) -> str:
         """
@@ -1183,4 +2062,66 @@ class ClaudeReviewer:
             "deepseek_model": self.deepseek_model if self.deepseek_enabled else None,
             "rsi_thresholds": self.rsi_thresholds,
             "status": "ready"
-        }
\ No newline at end of file
+        }
+
+
+class BatchingReviewer:
+    """
+    🔥 批量审核包装器：短时间内到达的多个信号合并成一次AI调用（分摊每次请求的固定开销）
+    
+    调用方仍使用单信号接口 review_signal(payload) 阻塞等待；后台线程取到第一个信号后最多再等
+    max_wait_ms 凑够 max_batch_size 个，交给 ClaudeReviewer.review_batch，结果经各自的Future返回。
+    只有多个线程同时提交信号时才能合批；顺序调用时每个信号多等待 max_wait_ms。
+    """
+    
+    def __init__(self, reviewer: ClaudeReviewer, max_batch_size: int = 4, max_wait_ms: float = 200):
+        self.reviewer = reviewer
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_sec = max(0.0, float(max_wait_ms)) / 1000
+        self._queue: "queue.Queue[Tuple[Dict, Future]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="AI-Batch")
+        self._thread.start()
+        print(f"[BATCH_REVIEW] ✅ 批量审核已启用 | 每批≤{self.max_batch_size} | 等待≤{max_wait_ms:.0f}ms")
+    
+    def submit(self, payload: Dict) -> Future:
+        """提交信号，返回审核结果的Future"""
+        future = Future()
+        self._queue.put((payload, future))
+        return future
+    
+    def review_signal(self, payload: Dict) -> Dict:
+        """与 ClaudeReviewer.review_signal 相同的接口（入队并等待结果）"""
+        return self.submit(payload).result()
+    
+    def get_stats(self) -> Dict:
+        return self.reviewer.get_stats()
+    
+    def _next_batch(self) -> List[Tuple[Dict, Future]]:
+        """阻塞取第一个信号，再在max_wait_sec内尽量凑满一批"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_sec
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        while True:
+            batch = [(payload, future) for payload, future in self._next_batch()
+                     if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = self.reviewer.review_batch([payload for payload, _ in batch])
+            except Exception as e:
+                print(f"[BATCH_REVIEW] ❌ 批量审核异常: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -1,10 +1,11 @@
 # core/notifier.py
 import os, requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-def tg_send(cfg: Dict[str, Any], title: str, lines: List[str]) -> bool:
+def tg_send(cfg: Dict[str, Any], title: str, lines: List[str], chats: Optional[List[Any]] = None) -> bool:
     token = os.getenv("TELEGRAM_BOT_TOKEN") or ((cfg.get("telegram") or {}).get("bot_token") or "")
-    chats = (cfg.get("telegram") or {}).get("chat_id") or []
+    if chats is None:
+        chats = (cfg.get("telegram") or {}).get("chat_id") or []
     if not token or not chats:
         print(f"[NOTIFY:OFF] {title}\n" + "\n".join(lines))
         return False
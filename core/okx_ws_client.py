@@ -0,0 +1,227 @@
+"""
+OKX私有WebSocket客户端 v1.0
+
+功能：
+1. 单条已认证的长连接（ccxt.pro），下单/撤单走WS交易通道，省去每次REST的握手开销
+2. 后台线程运行独立的asyncio事件循环，同步代码通过阻塞等待结果调用
+3. 连接不可用或WS请求失败时抛出异常，由调用方回退REST
+4. 私有频道订阅（持仓/订单/账户），推送数据写入本地缓存或交给回调，断线自动重连
+5. 行情订阅（按symbol），缓存最新价格供限价平仓定价
+
+注意：OKX的WS交易通道只支持普通订单（order / cancel-order），
+止损止盈等algo订单仍需走REST（privatePostTradeOrderAlgo）。
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+# 🔥 ccxt.pro 随 ccxt 一起发布（需要aiohttp），不可用时WS功能关闭
+try:
+    import ccxt.pro as ccxtpro
+    CCXT_PRO_AVAILABLE = True
+except ImportError:
+    CCXT_PRO_AVAILABLE = False
+
+
+class OKXWebSocketClient:
+    """OKX私有WS客户端（后台事件循环 + 同步调用接口）"""
+
+    def __init__(self, okx_config: dict, request_timeout_sec: float = 5.0):
+        """
+        初始化WS客户端
+
+        Args:
+            okx_config: auto_trading.okx 配置
+            request_timeout_sec: 单次WS请求等待结果的超时时间
+        """
+        if not CCXT_PRO_AVAILABLE:
+            raise ImportError("ccxt.pro不可用")
+
+        self.request_timeout_sec = request_timeout_sec
+        self.exchange = ccxtpro.okx({
+            'apiKey': okx_config.get("api_key", ""),
+            'secret': okx_config.get("secret", ""),
+            'password': okx_config.get("passphrase", ""),
+            'enableRateLimit': True,
+            'hostname': okx_config.get("hostname", "www.okx.com"),
+            'options': {
+                'defaultType': 'swap',
+                'sandboxMode': okx_config.get("testnet", False)
+            }
+        })
+
+        self._loop = asyncio.new_event_loop()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # 🔥 持仓缓存（positions频道推送）：(symbol, side) -> position
+        self._positions: Dict[Tuple[str, str], Dict] = {}
+        self._positions_updated_at: Dict[str, float] = {}  # symbol -> 最近一次推送的monotonic秒
+
+        # 🔥 USDT可用余额（account频道推送），None表示尚未收到推送
+        self.usdt_free: Optional[float] = None
+
+        # 🔥 行情价格缓存：symbol -> (价格, monotonic秒)
+        self._prices: Dict[str, Tuple[float, float]] = {}
+        self._price_symbols = set()
+
+    # ==================== 生命周期 ====================
+
+    def start(self):
+        """启动后台事件循环线程"""
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run_loop, daemon=True, name="OKX-WS")
+        self._thread.start()
+        print("[OKX_WS] ✅ WebSocket客户端已启动")
+
+    def stop(self):
+        """关闭连接并停止事件循环"""
+        if not self._running:
+            return
+
+        self._running = False
+        try:
+            asyncio.run_coroutine_threadsafe(self.exchange.close(), self._loop).result(timeout=5)
+        except Exception as e:
+            print(f"[OKX_WS] ⚠️ 关闭连接异常: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(timeout=5)
+        print("[OKX_WS] WebSocket客户端已停止")
+
+    @property
+    def is_running(self) -> bool:
+        return self._running and self._thread is not None and self._thread.is_alive()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _call(self, coro):
+        """在后台事件循环上执行协程并阻塞等待结果（超时/异常原样抛出）"""
+        if not self.is_running:
+            coro.close()
+            raise ConnectionError("WebSocket客户端未运行")
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout=self.request_timeout_sec)
+        except Exception:
+            future.cancel()
+            raise
+
+    # ==================== 频道订阅 ====================
+
+    def subscribe(self, name: str, watch_fn: Callable, handler: Callable):
+        """
+        启动订阅循环
+
+        Args:
+            name: 订阅名称（日志用）
+            watch_fn: 无参函数，返回ccxt.pro的watch_*协程
+            handler: 处理推送数据（在事件循环线程中调用，必须快速返回）
+        """
+        if not self.is_running:
+            return
+        asyncio.run_coroutine_threadsafe(self._watch_loop(name, watch_fn, handler), self._loop)
+        print(f"[OKX_WS] 📡 已订阅: {name}")
+
+    async def _watch_loop(self, name: str, watch_fn: Callable, handler: Callable):
+        """订阅主循环：异常后指数退避重连（1秒起，最多30秒）"""
+        backoff = 1
+        while self._running:
+            try:
+                data = await watch_fn()
+                handler(data)
+                backoff = 1
+            except Exception as e:
+                if not self._running:
+                    break
+                print(f"[OKX_WS] ⚠️ {name}订阅异常，{backoff}秒后重连: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def start_positions_feed(self):
+        """订阅positions频道，维护持仓缓存"""
+        self.subscribe("positions", lambda: self.exchange.watch_positions(), self._on_positions)
+
+    def start_orders_feed(self, handler: Callable[[List[Dict]], None]):
+        """订阅orders频道，订单状态变化（成交/撤单）推送给handler"""
+        self.subscribe("orders", lambda: self.exchange.watch_orders(), handler)
+
+    def start_balance_feed(self):
+        """订阅account频道，维护USDT可用余额"""
+        self.subscribe("account", lambda: self.exchange.watch_balance(), self._on_balance)
+
+    def _on_balance(self, balance: Dict):
+        usdt = balance.get('USDT')
+        if usdt and usdt.get('free') is not None:
+            self.usdt_free = float(usdt['free'])
+
+    def track_price(self, symbol: str):
+        """订阅symbol的行情推送（重复调用只订阅一次）"""
+        if symbol in self._price_symbols or not self.is_running:
+            return
+        self._price_symbols.add(symbol)
+        self.subscribe(f"ticker:{symbol}", lambda: self.exchange.watch_ticker(symbol), self._on_ticker)
+
+    def _on_ticker(self, ticker: Dict):
+        # 优先标记价格（与持仓markPrice同口径），没有时用最新成交价
+        price = ticker.get('markPrice') or ticker.get('last')
+        if price:
+            self._prices[ticker['symbol']] = (float(price), time.monotonic())
+
+    def get_price(self, symbol: str, max_age_sec: float = 5.0) -> Optional[float]:
+        """读取行情缓存，未订阅或超过max_age_sec未更新返回None"""
+        cached = self._prices.get(symbol)
+        if cached is None or time.monotonic() - cached[1] > max_age_sec:
+            return None
+        return cached[0]
+
+    def _on_positions(self, positions: List[Dict]):
+        now = time.monotonic()
+        for pos in positions:
+            key = (pos.get('symbol'), pos.get('side'))
+            if float(pos.get('contracts') or 0) > 0:
+                self._positions[key] = pos
+                self._positions_updated_at[key[0]] = now
+            else:
+                # 平仓推送：同一步内删除缓存条目
+                self._positions.pop(key, None)
+
+    def get_position(self, symbol: str, max_age_sec: float = 10.0) -> Tuple[bool, Optional[Dict]]:
+        """
+        从持仓缓存读取
+
+        按symbol判断新鲜度（其他symbol的推送不代表本symbol的缓存是新的）；
+        缓存中没有该symbol时视为未命中，由调用方走REST确认是否真的无持仓。
+
+        Returns:
+            (缓存是否可用, 持仓或None)；缓存不可用时调用方应走REST
+        """
+        updated_at = self._positions_updated_at.get(symbol)
+        if updated_at is None or time.monotonic() - updated_at > max_age_sec:
+            return False, None
+        for (pos_symbol, _), pos in list(self._positions.items()):
+            if pos_symbol == symbol:
+                return True, pos
+        return False, None
+
+    # ==================== 交易接口 ====================
+
+    def create_order(self, symbol: str, type: str, side: str, amount: float,
+                     price: Optional[float] = None, params: Optional[Mapping] = None) -> Dict:
+        """WS下单（OKX op=order）"""
+        return self._call(self.exchange.create_order_ws(symbol, type, side, amount, price, params or {}))
+
+    def cancel_order(self, order_id: str, symbol: str, params: Optional[Dict] = None) -> Dict:
+        """WS撤单（OKX op=cancel-order）"""
+        return self._call(self.exchange.cancel_order_ws(order_id, symbol, params or {}))
+
+    def cancel_orders(self, order_ids: List[str], symbol: str, params: Optional[Dict] = None) -> List[Dict]:
+        """WS批量撤单（OKX op=batch-cancel-orders，同一symbol）"""
+        return self._call(self.exchange.cancel_orders_ws(order_ids, symbol, params or {}))
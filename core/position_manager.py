@@ -10,8 +10,10 @@
 
 import ccxt
 import time
+import threading
 from datetime import datetime
 from typing import Dict, Optional, List
+from core.utils import rsi_last
 
 
 class PositionManager:
@@ -80,6 +82,14 @@ class PositionManager:
         self.position_data = {}  # {symbol: {entry_price, highest_price, lowest_price, sl_price, tp_price, ...}}
         self.last_check_time = {}
 
+        # 🔥 指标近线预计算：后台线程定时拉K线，监控主循环直接读缓存
+        # 1m K线每15秒刷新，5m K线每75秒刷新（K线周期的1/4）
+        self.indicator_refresh_sec = max(15, config.get('indicator_refresh_sec', 15))
+        self.indicator_refresh_5m_sec = max(75, self.indicator_refresh_sec)
+        self._indicator_cache: Dict[str, Dict] = {}  # {symbol: {ohlcv_1m, ohlcv_5m, rsi, volume_ratio, ts_1m, ts_5m}}
+        self._indicator_running = False
+        self._indicator_thread: Optional[threading.Thread] = None
+
         print(f"[POSITION_MGR] 初始化完成")
         print(f"  阶梯止损: {self.tiered_trailing_stop}")  # 🔥 新增
         if self.tiered_trailing_stop:
@@ -361,8 +371,12 @@ class PositionManager:
             反转原因（如果有）
         """
         try:
-            # 获取K线数据
-            ohlcv = self.exchange.fetch_ohlcv(symbol, '5m', limit=50)
+            # 获取K线数据（优先读近线缓存）
+            cached = self.get_cached_indicators(symbol, timeframe='5m')
+            if cached:
+                ohlcv = cached['ohlcv_5m']
+            else:
+                ohlcv = self.exchange.fetch_ohlcv(symbol, '5m', limit=50)
 
             if len(ohlcv) < 26:
                 return None
@@ -524,7 +538,11 @@ class PositionManager:
             动能百分比，正数表示上涨，负数表示下跌
         """
         try:
-            ohlcv = self.exchange.fetch_ohlcv(symbol, '1m', limit=period + 1)
+            cached = self.get_cached_indicators(symbol)
+            if cached:
+                ohlcv = cached['ohlcv_1m'][-(period + 1):]
+            else:
+                ohlcv = self.exchange.fetch_ohlcv(symbol, '1m', limit=period + 1)
             if len(ohlcv) >= period + 1:
                 old_price = ohlcv[0][4]   # period分钟前的收盘价
                 new_price = ohlcv[-1][4]  # 最新收盘价
@@ -535,6 +553,94 @@ class PositionManager:
             print(f"[POSITION_MGR] 获取动能失败: {e}")
             return None
 
+    # ==================== 🔥 指标近线预计算 ====================
+
+    def start_indicator_refresher(self):
+        """启动后台指标刷新线程"""
+        if self._indicator_running:
+            return
+
+        self._indicator_running = True
+        self._indicator_thread = threading.Thread(
+            target=self._indicator_refresh_loop,
+            daemon=True,
+            name="PositionMgr-Indicators"
+        )
+        self._indicator_thread.start()
+        print(f"[POSITION_MGR] 指标预计算已启动（每{self.indicator_refresh_sec}秒刷新）")
+
+    def stop_indicator_refresher(self):
+        """停止后台指标刷新线程"""
+        self._indicator_running = False
+        if self._indicator_thread:
+            self._indicator_thread.join(timeout=5)
+            self._indicator_thread = None
+
+    def _indicator_refresh_loop(self):
+        """后台循环：刷新所有持仓的K线和指标，清理已移除持仓的缓存"""
+        while self._indicator_running:
+            symbols = list(self.position_data.keys())
+            for symbol in symbols:
+                self._refresh_indicators(symbol)
+
+            for symbol in list(self._indicator_cache.keys()):
+                if symbol not in self.position_data:
+                    self._indicator_cache.pop(symbol, None)
+
+            time.sleep(self.indicator_refresh_sec)
+
+    def _refresh_indicators(self, symbol: str):
+        """拉取K线并计算RSI/量比，整体替换缓存条目（读方无需加锁）"""
+        now = time.monotonic()
+        old = self._indicator_cache.get(symbol, {})
+        entry = dict(old)
+
+        try:
+            ohlcv_1m = self.exchange.fetch_ohlcv(symbol, '1m', limit=100)
+            if ohlcv_1m and len(ohlcv_1m) >= 60:
+                closes = [c[4] for c in ohlcv_1m]
+                volumes = [c[5] for c in ohlcv_1m]
+                vol_ma = sum(volumes[-20:]) / 20
+                entry['ohlcv_1m'] = ohlcv_1m
+                entry['current_price'] = float(closes[-1])
+                entry['rsi'] = rsi_last(closes, period=14)  # 与持仓审核的RSI口径一致
+                entry['volume_ratio'] = float(volumes[-1] / vol_ma) if vol_ma > 0 else 1.0
+                entry['ts_1m'] = now
+
+            if now - old.get('ts_5m', 0) >= self.indicator_refresh_5m_sec:
+                entry['ohlcv_5m'] = self.exchange.fetch_ohlcv(symbol, '5m', limit=50)
+                entry['ts_5m'] = now
+        except Exception as e:
+            print(f"[POSITION_MGR] ⚠️ {symbol} 指标预计算失败: {e}")
+
+        if entry:
+            self._indicator_cache[symbol] = entry
+
+    def get_cached_indicators(self, symbol: str, timeframe: str = '1m') -> Optional[Dict]:
+        """
+        读取近线预计算的指标
+
+        Args:
+            symbol: 交易对
+            timeframe: '1m'（动能/RSI/量比）或 '5m'（反转检测K线）
+
+        Returns:
+            缓存条目；缺失或超过2个刷新周期未更新时返回None（调用方现场获取）
+        """
+        entry = self._indicator_cache.get(symbol)
+        if not entry:
+            return None
+
+        if timeframe == '5m':
+            max_age = self.indicator_refresh_5m_sec * 2
+        else:
+            max_age = self.indicator_refresh_sec * 2
+
+        ts = entry.get(f'ts_{timeframe}')
+        if ts is None or time.monotonic() - ts > max_age:
+            return None
+        return entry
+
     def get_position_info(self, symbol: str) -> Optional[Dict]:
         """获取持仓信息"""
         return self.position_data.get(symbol)
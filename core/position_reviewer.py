@@ -24,12 +24,12 @@ AI输出决策类型：
 """
 
 import requests
-import json
-import math
 import pandas as pd
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
+from core.utils import json_loads, rsi_last
 
 
 class PositionAction(Enum):
@@ -41,6 +41,26 @@ class PositionAction(Enum):
     BREAKEVEN = "breakeven"
 
 
+@dataclass
+class PositionSnapshot:
+    """持仓审核快照（固定字段 + __slots__，每次审核只分配一个轻量对象）"""
+    __slots__ = (
+        "symbol", "side", "entry_price", "current_price", "sl_price", "tp_price",
+        "pnl_pct", "holding_minutes", "rsi", "volume_ratio", "entry_time",
+    )
+    symbol: str
+    side: str
+    entry_price: float
+    current_price: float
+    sl_price: float
+    tp_price: float
+    pnl_pct: float
+    holding_minutes: float
+    rsi: float
+    volume_ratio: float
+    entry_time: Optional[datetime]
+
+
 class PositionReviewer:
     """持仓AI审核器"""
     
@@ -88,15 +108,15 @@ class PositionReviewer:
         if self.enabled:
             print(f"[POSITION_REVIEWER] 审核间隔: {self.review_interval_sec}秒 | 最少持仓: {self.min_holding_time_min}分钟")
     
-    def should_review(self, position: Dict) -> Tuple[bool, str]:
+    def should_review(self, position: PositionSnapshot) -> Tuple[bool, str]:
         """判断是否应该审核此持仓"""
         if not self.enabled:
             return False, "审核器未启用"
         
-        symbol = position.get("symbol", "")
-        pnl_pct = position.get("pnl_pct", 0)
-        holding_minutes = position.get("holding_minutes", 0)
-        volume_ratio = position.get("volume_ratio", 1.0)
+        symbol = position.symbol
+        pnl_pct = position.pnl_pct
+        holding_minutes = position.holding_minutes
+        volume_ratio = position.volume_ratio
         
         # 1. 检查最小审核间隔
         last_review = self._last_review_time.get(symbol)
@@ -132,9 +152,9 @@ class PositionReviewer:
         
         return False, "无触发条件"
     
-    def review_position(self, position: Dict) -> Dict:
+    def review_position(self, position: PositionSnapshot) -> Dict:
         """审核持仓"""
-        symbol = position.get("symbol", "UNKNOWN")
+        symbol = position.symbol or "UNKNOWN"
         
         print(f"\n[POSITION_REVIEW] 🔍 审核 {symbol}...")
         
@@ -161,7 +181,7 @@ class PositionReviewer:
         
         return result
     
-    def _deepseek_review(self, position: Dict) -> Optional[Dict]:
+    def _deepseek_review(self, position: PositionSnapshot) -> Optional[Dict]:
         """调用DeepSeek审核持仓"""
         if not self.deepseek_api_key:
             print(f"[POSITION_REVIEW] ⚠️ DeepSeek未配置")
@@ -193,7 +213,7 @@ class PositionReviewer:
             )
             
             response.raise_for_status()
-            result = response.json()
+            result = json_loads(response.content)
             content = result["choices"][0]["message"]["content"]
             
             return self._parse_json_response(content)
@@ -202,18 +222,18 @@ class PositionReviewer:
             print(f"[POSITION_REVIEW] ⚠️ DeepSeek调用失败: {e}")
             return None
     
-    def _build_review_prompt(self, position: Dict) -> str:
+    def _build_review_prompt(self, position: PositionSnapshot) -> str:
         """构建持仓审核prompt"""
-        symbol = position.get("symbol", "UNKNOWN")
-        side = position.get("side", "long")
-        entry_price = position.get("entry_price", 0)
-        current_price = position.get("current_price", 0)
-        sl_price = position.get("sl_price", 0)
-        tp_price = position.get("tp_price", 0)
-        pnl_pct = position.get("pnl_pct", 0)
-        rsi = position.get("rsi", 50)
-        volume_ratio = position.get("volume_ratio", 1.0)
-        holding_minutes = position.get("holding_minutes", 0)
+        symbol = position.symbol or "UNKNOWN"
+        side = position.side
+        entry_price = position.entry_price
+        current_price = position.current_price
+        sl_price = position.sl_price
+        tp_price = position.tp_price
+        pnl_pct = position.pnl_pct
+        rsi = position.rsi
+        volume_ratio = position.volume_ratio
+        holding_minutes = position.holding_minutes
         
         # 计算止损止盈距离
         if entry_price > 0:
@@ -279,10 +299,10 @@ class PositionReviewer:
 """
         return prompt
     
-    def _convert_close_to_tight_sl(self, position: Dict, result: Dict) -> Dict:
+    def _convert_close_to_tight_sl(self, position: PositionSnapshot, result: Dict) -> Dict:
         """将平仓决策转换为紧止损"""
-        current_price = position.get("current_price", 0)
-        side = position.get("side", "long")
+        current_price = position.current_price
+        side = position.side
         
         if side == "long":
             new_sl = current_price * (1 - self.tight_sl_pct)
@@ -334,13 +354,7 @@ class PositionReviewer:
             current_price = float(df["close"].iloc[-1])
             
             # RSI
-            delta = df["close"].diff()
-            gain = delta.where(delta > 0, 0).rolling(14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-            rs = gain / loss
-            rsi_val = float(100 - (100 / (1 + rs)).iloc[-1])
-            if math.isnan(rsi_val):
-                rsi_val = 50
+            rsi_val = rsi_last(df["close"].values, period=14)
             
             # 成交量
             vol_ma = df["volume"].rolling(20).mean().iloc[-1]
@@ -362,23 +376,23 @@ class PositionReviewer:
         """解析JSON响应"""
         import re
         try:
-            return json.loads(content)
-        except:
+            return json_loads(content)
+        except (ValueError, TypeError):
             pass
         
         json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', content)
         if json_match:
             try:
-                return json.loads(json_match.group(1))
-            except:
+                return json_loads(json_match.group(1))
+            except (ValueError, TypeError):
                 pass
         
         try:
             start = content.find('{')
             end = content.rfind('}')
             if start != -1 and end != -1:
-                return json.loads(content[start:end+1])
-        except:
+                return json_loads(content[start:end+1])
+        except (ValueError, TypeError):
             pass
         
         return None
@@ -14,6 +14,18 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timezone, timedelta
 
+# 🔥 orjson可选（C实现，解析/序列化更快），未安装时回退标准库json；各模块统一从这里导入
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj) -> bytes:
+        """序列化为UTF-8字节（与orjson.dumps的返回类型一致）"""
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
 # ========== 技术指标 ==========
 def ema(series: pd.Series, period: int) -> pd.Series:
     return series.ewm(span=int(period), adjust=False).mean()
@@ -471,6 +483,23 @@ def rsi(df: pd.DataFrame, period: int = 14) -> pd.Series:
     return rsi_val
 
 
+def rsi_last(closes, period: int = 14) -> float:
+    """
+    最新一根K线的RSI（最近period个涨跌幅的简单均值，持仓审核与持仓指标缓存共用）
+    
+    只涨不跌为100；无涨无跌（0/0）或数据不足、含NaN时返回50(中性)。
+    """
+    deltas = np.diff(np.asarray(closes, dtype=np.float64)[-(period + 1):])
+    if len(deltas) < period:
+        return 50.0
+    avg_gain = deltas[deltas > 0].sum() / period
+    avg_loss = -deltas[deltas < 0].sum() / period
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else 50.0
+    rsi_val = 100 - 100 / (1 + avg_gain / avg_loss)
+    return 50.0 if math.isnan(rsi_val) else float(rsi_val)
+
+
 # ========== 🆕 MACD (指数平滑异同移动平均线) ==========
 def macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[pd.Series, pd.Series, pd.Series]:
     """
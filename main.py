@@ -36,7 +36,7 @@ from core.signal_tracker import update_signal_tracking
 from core.btc_advanced_monitor import check_btc_market_advanced, format_btc_status_message
 from core.altcoin_correlation import get_cached_correlation, format_correlation_message
 
-from core.claude_reviewer import ClaudeReviewer
+from core.claude_reviewer import ClaudeReviewer, BatchingReviewer
 from core.free_fingpt import FreeFinGPT
 from core.xgboost_collector import XGBoostDataCollector
 from core.auto_trader import AutoTrader
@@ -1094,6 +1094,9 @@ def main():
     fingpt.start_background_update()
     
     reviewer = ClaudeReviewer(cfg)
+    batch_cfg = cfg.get("review", {}).get("batching", {})
+    if batch_cfg.get("enabled", False):
+        reviewer = BatchingReviewer(reviewer, batch_cfg.get("max_batch_size", 4), batch_cfg.get("max_wait_ms", 200))
     print("  ✅ AI审核器 (Claude/DeepSeek)")
     
     collector = None
@@ -0,0 +1,74 @@
+# tests/test_claude_reviewer.py - 硬规则拒绝冷却缓存
+import asyncio
+
+import pytest
+
+pytest.importorskip("anthropic")
+pytest.importorskip("httpx")
+
+from core.claude_reviewer import ClaudeReviewer
+
+
+def _payload(orderbook: float, symbol: str = "ETH/USDT:USDT") -> dict:
+    """趋势延续信号：除订单簿外其余硬规则都通过（订单簿<0.25拒绝）"""
+    return {
+        "symbol": symbol, "bias": "long", "score": 0.95, "price": 100.0,
+        "signal_type": "trend_continuation",
+        "metrics": {"rsi": 40, "adx": 40, "vol_spike_ratio": 3.0},
+        "subscores": {"orderbook": orderbook},
+        "funding": {"rate": 0.0},
+    }
+
+
+@pytest.fixture
+def reviewer(monkeypatch):
+    r = ClaudeReviewer({"claude": {"api_key": "test"}, "review": {"reject_cooldown_sec": 60}})
+    r.ai_calls = []
+
+    def fake_ai_review(payload):
+        r.ai_calls.append(payload["symbol"])
+        return {"approved": True, "stage": "ai", "reasoning": "ok"}
+
+    async def fake_ai_review_async(payload):
+        return fake_ai_review(payload)
+
+    monkeypatch.setattr(r, "_ai_review", fake_ai_review)
+    monkeypatch.setattr(r, "_ai_review_async", fake_ai_review_async)
+    return r
+
+
+def test_recovered_input_is_reevaluated(reviewer):
+    rejected = reviewer.review_signal(_payload(orderbook=0.10))
+    assert not rejected["approved"] and rejected["stage"] == "hard_rules"
+    
+    # 冷却期内订单簿恢复：必须重新跑硬规则并进入AI，而不是沿用上次拒绝
+    result = reviewer.review_signal(_payload(orderbook=0.90))
+    assert result["approved"]
+    assert reviewer.ai_calls == ["ETH/USDT:USDT"]
+
+
+def test_repeat_rejection_reports_current_values(reviewer):
+    reviewer.review_signal(_payload(orderbook=0.10))
+    again = reviewer.review_signal(_payload(orderbook=0.20))
+    assert not again["approved"]
+    assert "0.20" in again["reasoning"]
+
+
+def test_ai_verdicts_are_not_cached(reviewer):
+    reviewer.review_signal(_payload(orderbook=0.90))
+    reviewer.review_signal(_payload(orderbook=0.90))
+    assert len(reviewer.ai_calls) == 2
+
+
+def test_batch_reevaluates_recovered_input(reviewer):
+    reviewer.review_signal(_payload(orderbook=0.10))
+    results = reviewer.review_batch([_payload(orderbook=0.90)])
+    assert results[0]["approved"]
+
+
+def test_async_reevaluates_recovered_input(reviewer):
+    async def run():
+        await reviewer.review_signal_async(_payload(orderbook=0.10))
+        return await reviewer.review_signal_async(_payload(orderbook=0.90))
+    
+    assert asyncio.run(run())["approved"]
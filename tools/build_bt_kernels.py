@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+回测内核AOT编译脚本
+
+把 core/bt_kernels.py 中的numba内核预编译为扩展模块 core/_bt_kernels，
+回测进程直接导入，不再在每次启动时付出JIT编译耗时。
+
+用法（在项目根目录）：
+    python tools/build_bt_kernels.py
+
+未编译或编译产物与当前Python/numpy不兼容时，回测自动回退到JIT版本。
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def main():
+    try:
+        from numba.pycc import CC
+    except ImportError:
+        print("❌ 当前numba不支持AOT编译（numba.pycc不可用），回测将使用JIT内核")
+        return 1
+
+    from core import bt_kernels
+
+    cc = CC("_bt_kernels")
+    cc.output_dir = str(ROOT / "core")
+    cc.verbose = True
+
+    for name, signature in bt_kernels.AOT_SIGNATURES.items():
+        kernel = getattr(bt_kernels, name)
+        cc.export(name, signature)(getattr(kernel, "py_func", kernel))
+
+    cc.compile()
+    print(f"✅ 已生成: {cc.output_dir}/_bt_kernels")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())